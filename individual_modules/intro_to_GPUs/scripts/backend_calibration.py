@@ -0,0 +1,381 @@
+"""
+Backend Calibration and Automatic Backend Selection
+
+Which backend is fastest depends on the problem size and on the machine:
+NumPy wins on small grids, the tiled and multi-core engines on large ones,
+and the crossover moves between the RTX 3070, A100 and H100 hosts. Instead
+of choosing by hand, calibrate once per machine and let `--backend auto`
+choose:
+
+- calibrate() times every backend available on this host with
+  benchmark_harness over a range of grid sizes and records a throughput
+  curve (cells per second against grid size) plus a one-off start-up cost
+  (JIT compilation, CUDA context) per backend
+- the curves are cached as JSON per hardware fingerprint (CPU model, GPU
+  model and core count, from lscpu/nvidia-smi via hardware.py),
+  so results from one node are never used on another. Looking up the cache
+  never imports CuPy, so `--backend auto` starts as quickly as the CPU
+  backends
+- choose_backend() predicts the run time of each calibrated backend for a
+  given size and number of timesteps and returns the fastest
+
+GPU backends are only calibrated when CuPy can use a CUDA device
+(lazy_imports.cupy_available(), probed when calibration reaches the first
+GPU backend); otherwise they are omitted. choose_backend probes CuPy only
+when a GPU backend is the predicted winner, and falls back to the fastest
+CPU backend if it cannot run.
+
+Usage:
+    python backend_calibration.py                         # Game of Life backends
+    python backend_calibration.py --problem diffusion     # needs the NetCDF data
+    backend, predictions = choose_backend("gol", cells=2048 * 2048, timesteps=100)
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from .benchmark_harness import get_case, time_case
+    from .hardware import get_cpu_name, get_gpu_name
+    from .lazy_imports import cupy_available
+except ImportError:  # executed from within the scripts directory
+    from benchmark_harness import get_case, time_case
+    from hardware import get_cpu_name, get_gpu_name
+    from lazy_imports import cupy_available
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Cached calibrations, one JSON file per hardware fingerprint
+CALIBRATION_DIR = Path(os.environ.get("GOL_CALIBRATION_DIR",
+                                      Path(__file__).resolve().parent.parent / "output" / "calibration"))
+
+# Backend name -> (benchmark_harness case, init options, needs a GPU)
+GOL_BACKENDS = {
+    "numpy": ("NumPy (CPU)", {}, False),
+    "multicore": ("NumPy (CPU)", {"workers": os.cpu_count() or 1}, False),
+    "tiled": ("Tiled (CPU)", {}, False),
+    "bitpacked": ("Bit-packed (CPU)", {}, False),
+    "jit": ("JIT loop (CPU)", {}, False),
+    "naive": ("Naive (CPU)", {}, False),
+    "cupy": ("CuPy (GPU)", {}, True),
+}
+DIFFUSION_BACKENDS = {
+    "numpy": ("Diffusion NumPy (CPU)", {}, False),
+    "cupy": ("Diffusion CuPy (GPU)", {}, True),
+    "purepython": ("Diffusion Pure Python", {}, False),
+}
+PROBLEMS = {"gol": GOL_BACKENDS, "diffusion": DIFFUSION_BACKENDS}
+
+# Used by --backend auto when this host has not been calibrated
+DEFAULT_BACKEND = "numpy"
+
+DEFAULT_SIZES = (64, 128, 256, 512, 1024, 2048)
+
+# The pure-Python diffusion takes minutes per timestep on the full data set
+# and never wins, so it is only calibrated when asked for
+SLOW_BACKENDS = {"diffusion": ("purepython",)}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Hardware fingerprint and cache
+# ─────────────────────────────────────────────────────────────────────────────
+
+def hardware_fingerprint() -> dict:
+    """
+    Describe this host for the calibration cache.
+
+    Only lscpu and nvidia-smi are queried; CuPy is not imported, so the
+    cache lookup of `--backend auto` stays cheap.
+
+    Returns:
+        dict: "cpu" and "gpu" model names and "cpus" (logical cores).
+    """
+    return {
+        "cpu": get_cpu_name(),
+        "gpu": get_gpu_name(),
+        "cpus": os.cpu_count() or 1,
+    }
+
+
+def calibration_path(fingerprint: dict = None, cache_dir: Path = None) -> Path:
+    """Return the cache file for a fingerprint (default: this host)."""
+    fingerprint = fingerprint or hardware_fingerprint()
+    key = f"{fingerprint['cpu']}_{fingerprint['cpus']}cores_{fingerprint['gpu']}"
+    return Path(cache_dir or CALIBRATION_DIR) / (re.sub(r"[^A-Za-z0-9.-]+", "_", key) + ".json")
+
+
+def load_calibration(fingerprint: dict = None, cache_dir: Path = None) -> dict:
+    """
+    Read the cached calibration of a host.
+
+    Returns:
+        dict or None: None if this host has not been calibrated.
+    """
+    path = calibration_path(fingerprint, cache_dir)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_calibration(calibration: dict, cache_dir: Path = None) -> Path:
+    """
+    Merge a calibration into the cache of its host and return the file.
+
+    Problems already cached (e.g. "gol" when calibrating "diffusion") are
+    kept unless the new calibration replaces them.
+    """
+    path = calibration_path(calibration["fingerprint"], cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        cached = json.loads(path.read_text())
+        cached["problems"].update(calibration["problems"])
+        calibration = {**calibration, "problems": cached["problems"]}
+    path.write_text(json.dumps(calibration, indent=2))
+    return path
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Calibration
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _total_sec(record: dict) -> float:
+    return (record["init_ns"] + record["step_ns"] + record["teardown_ns"]) / 1e9
+
+
+def calibrate_backend(case_name: str, sizes, cells_of, options: dict = None, repeats: int = 3,
+                      target_sec: float = 0.5, max_step_sec: float = 2.0, max_timesteps: int = 10_000) -> dict:
+    """
+    Measure the throughput curve of one backend.
+
+    For each size a single-generation probe estimates the time per step;
+    the timed runs then use enough timesteps to last about target_sec, so
+    fast backends are not dominated by timer and init overhead. Larger sizes
+    are skipped once a single step takes longer than max_step_sec.
+
+    Args:
+        case_name (str): benchmark_harness case to time.
+        sizes (iterable[int]): Problem sizes, smallest first.
+        cells_of: Callable size -> cells updated per timestep.
+        options (dict): Extra init options for the case (e.g. workers).
+        repeats (int): Timed runs per size.
+        target_sec (float): Approximate length of each timed run.
+        max_step_sec (float): Stop growing the size beyond this step time.
+        max_timesteps (int): Upper bound on timesteps per run.
+
+    Returns:
+        dict: "startup_sec" (extra time of the very first run) and "points",
+        a list of {"size", "cells", "timesteps", "cells_per_sec",
+        "init_sec", "step_std_sec"} sorted by size.
+    """
+    options = options or {}
+    case = get_case(case_name)
+    curve = {"startup_sec": 0.0, "points": []}
+    for i, size in enumerate(sizes):
+        probe = time_case(case, size, 1, repeats=1, warmup=0, **options)[0]
+        warm = time_case(case, size, 1, repeats=1, warmup=0, **options)[0]
+        if i == 0:
+            # JIT compilation, CUDA context, file-system caches, ...
+            curve["startup_sec"] = max(0.0, _total_sec(probe) - _total_sec(warm))
+        step_sec = max(warm["step_ns"] / 1e9, 1e-9)
+        timesteps = int(min(max(target_sec / step_sec, 1), max_timesteps))
+        records = time_case(case, size, timesteps, repeats=repeats, warmup=0, **options)
+        step = [r["step_ns"] / 1e9 for r in records]
+        cells = cells_of(size)
+        curve["points"].append({
+            "size": size, "cells": cells, "timesteps": timesteps,
+            "cells_per_sec": cells * timesteps / float(np.mean(step)),
+            "init_sec": float(np.mean([r["init_ns"] / 1e9 for r in records])),
+            "step_std_sec": float(np.std(step)),
+        })
+        if step_sec > max_step_sec:
+            break
+    return curve
+
+
+def _diffusion_cells() -> int:
+    """Cells updated per diffusion timestep (depth × latitude × longitude of the data set)."""
+    try:
+        from .temperature_diffusion import load_data
+    except ImportError:
+        from temperature_diffusion import load_data
+    data = load_data()
+    try:
+        return int(np.prod(data["thetao"].shape[1:]))
+    finally:
+        data.close()
+
+
+def calibrate(problem: str = "gol", backends=None, sizes=DEFAULT_SIZES, repeats: int = 3,
+              target_sec: float = 0.5, max_step_sec: float = 2.0, log=print) -> dict:
+    """
+    Calibrate the backends of a problem on this host.
+
+    Args:
+        problem (str): "gol" or "diffusion".
+        backends (iterable[str]): Backends to calibrate; default all that can
+            run here (GPU backends need CuPy and a CUDA device, "multicore"
+            needs more than one core).
+        sizes (iterable[int]): Game of Life grid sizes. The diffusion size is
+            fixed by its data set.
+        repeats, target_sec, max_step_sec: See calibrate_backend.
+        log: Callable used for progress messages.
+
+    Returns:
+        dict: {"fingerprint", "created", "problems": {problem: {backend: curve}}}.
+    """
+    table = PROBLEMS[problem]
+    fingerprint = hardware_fingerprint()
+    if backends is None:
+        backends = [name for name in table if name not in SLOW_BACKENDS.get(problem, ())]
+    if problem == "diffusion":
+        cells = _diffusion_cells()
+        sizes, cells_of = [cells], lambda size: size
+    else:
+        # The entry point has imported these before it runs a backend, so
+        # keep their import time out of the first backend's startup_sec
+        try:
+            from . import game_of_life
+        except ImportError:
+            import game_of_life
+        sizes, cells_of = sorted(sizes), lambda size: size * size
+
+    curves = {}
+    cuda = None    # Probed (importing CuPy) only once a GPU backend is reached
+    for name in backends:
+        case_name, options, needs_gpu = table[name]
+        if needs_gpu and cuda is None:
+            cuda = cupy_available()
+        if needs_gpu and not cuda:
+            log(f"[Calibrate] {name}: skipped (no CUDA device)")
+            continue
+        if name == "multicore" and options["workers"] < 2:
+            log(f"[Calibrate] {name}: skipped (single core)")
+            continue
+        t0 = time.perf_counter()
+        curves[name] = calibrate_backend(case_name, sizes, cells_of, options, repeats, target_sec, max_step_sec)
+        best = max(point["cells_per_sec"] for point in curves[name]["points"])
+        log(f"[Calibrate] {name}: {len(curves[name]['points'])} sizes, up to {best / 1e6:.1f} Mcells/s "
+            f"({time.perf_counter() - t0:.1f} s)")
+    return {"fingerprint": fingerprint, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "problems": {problem: curves}}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3) Prediction and selection
+# ─────────────────────────────────────────────────────────────────────────────
+
+def predict_seconds(curve: dict, cells: int, timesteps: int) -> float:
+    """
+    Predict the run time of a backend from its calibrated curve.
+
+    Throughput and init time are interpolated linearly in log(cells)
+    between calibrated sizes and held constant beyond them.
+
+    Returns:
+        float: startup + init + cells * timesteps / throughput, in seconds.
+    """
+    points = curve["points"]
+    x = np.log([point["cells"] for point in points])
+    cells_per_sec = np.interp(np.log(cells), x, [point["cells_per_sec"] for point in points])
+    init_sec = np.interp(np.log(cells), x, [point["init_sec"] for point in points])
+    return float(curve["startup_sec"] + init_sec + cells * timesteps / cells_per_sec)
+
+
+def choose_backend(problem: str, cells: int, timesteps: int, candidates=None, calibration: dict = None):
+    """
+    Pick the backend with the shortest predicted run time on this host.
+
+    Args:
+        problem (str): "gol" or "diffusion".
+        cells (int): Cells updated per timestep (N * N for the Game of Life).
+        timesteps (int): Number of timesteps of the run.
+        candidates (iterable[str]): Backends allowed (default: all calibrated).
+        calibration (dict): Calibration to use (default: this host's cache).
+
+    Returns:
+        tuple: (backend, {backend: predicted seconds}). The backend is
+        DEFAULT_BACKEND with empty predictions if nothing is calibrated.
+        GPU backends are dropped from the predictions if they would win but
+        CuPy cannot use a CUDA device now.
+    """
+    calibration = calibration or load_calibration()
+    curves = (calibration or {}).get("problems", {}).get(problem, {})
+    if candidates is not None:
+        curves = {name: curve for name, curve in curves.items() if name in candidates}
+    if not curves:
+        return DEFAULT_BACKEND, {}
+    predictions = {name: predict_seconds(curve, cells, timesteps) for name, curve in curves.items()}
+    best = min(predictions, key=predictions.get)
+    table = PROBLEMS[problem]
+    if best in table and table[best][2] and not cupy_available():
+        # Calibrated with a GPU that this process cannot use (e.g. CuPy missing)
+        predictions = {name: sec for name, sec in predictions.items() if not (name in table and table[name][2])}
+        if not predictions:
+            return DEFAULT_BACKEND, {}
+        best = min(predictions, key=predictions.get)
+    return best, predictions
+
+
+def report_choice(label: str, backend: str, predictions: dict) -> None:
+    """Print the backend chosen by --backend auto and the predicted times."""
+    if not predictions:
+        print(f"{label} No calibration for this host (run backend_calibration.py); using {backend}")
+        return
+    others = ", ".join(f"{name} {sec:.3g} s" for name, sec in sorted(predictions.items(), key=lambda kv: kv[1]))
+    print(f"{label} Chose {backend} (predicted: {others})")
+
+
+def main():
+    """
+    CLI: calibrate this host, cache the curves and print them with the
+    fastest backend per size.
+    """
+    p = argparse.ArgumentParser(description="Calibrate backend throughput for --backend auto")
+    p.add_argument("--problem", choices=sorted(PROBLEMS), default="gol", help="Which simulation to calibrate")
+    p.add_argument("--backends", nargs="+", default=None, help="Backends to calibrate (default: all available)")
+    p.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                   help="Game of Life grid sizes")
+    p.add_argument("--repeats", type=int, default=3, help="Timed runs per size")
+    p.add_argument("--target-sec", type=float, default=0.5, help="Approximate length of each timed run")
+    p.add_argument("--max-step-sec", type=float, default=2.0,
+                   help="Skip larger sizes once one step takes longer than this")
+    p.add_argument("--timesteps", type=int, default=100, help="Run length used for the crossover table")
+    p.add_argument("--cache-dir", type=Path, default=None, help=f"Cache directory (default {CALIBRATION_DIR})")
+    args = p.parse_args()
+
+    unknown = set(args.backends or ()) - set(PROBLEMS[args.problem])
+    if unknown:
+        p.error(f"unknown {args.problem} backends: {', '.join(sorted(unknown))}")
+
+    calibration = calibrate(args.problem, args.backends, args.sizes, args.repeats,
+                            args.target_sec, args.max_step_sec)
+    path = save_calibration(calibration, args.cache_dir)
+    print(f"[Calibrate] Saved to {path}")
+
+    curves = calibration["problems"][args.problem]
+    sizes = sorted({point["size"] for curve in curves.values() for point in curve["points"]})
+    print(f"\n{'size':>8}  " + "  ".join(f"{name:>10}" for name in curves) + "  fastest")
+    for size in sizes:
+        cells = size * size if args.problem == "gol" else size
+        row = []
+        for curve in curves.values():
+            point = next((pt for pt in curve["points"] if pt["size"] == size), None)
+            row.append(f"{point['cells_per_sec'] / 1e6:>10.1f}" if point else f"{'-':>10}")
+        fastest, _ = choose_backend(args.problem, cells, args.timesteps, calibration=calibration)
+        print(f"{size:>8}  " + "  ".join(row) + f"  {fastest}")
+    print(f"(Mcells/s; fastest includes start-up and init for {args.timesteps} timesteps)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+"""
+In-process Benchmark Harness
+
+The experiment scripts used to time `poetry run <entry point>` end to end,
+so small problems mostly measured Poetry, interpreter start-up and imports.
+This harness imports the backends once and times them in-process:
+
+- each backend is a BenchmarkCase split into init (allocate and seed the
+  grid or load the data), step (all timesteps, synchronised for GPUs) and
+  teardown (release buffers and device memory)
+- every configuration runs `warmup` untimed iterations first (JIT
+  compilation, caches, CUDA context), then `repeats` timed ones, each phase
+  timed with time.perf_counter_ns()
+- with ci_target set the repeat count is adaptive: after `repeats` timed
+  runs it keeps going until the 95% confidence interval of the median run
+  time is narrower than ci_target (relative to the median), max_repeats is
+  reached or budget_sec is spent; fast configurations get many samples,
+  slow ones (the naive backend) stop at the budget
+- leading timed runs that are still warming up (slower than the Tukey fence
+  Q3 + 1.5 IQR of all runs) are marked "discarded" and left out of the
+  statistics
+- with isolate=True each configuration runs in a fresh spawned worker
+  process, so allocator and JIT state do not leak between configurations
+- results are written as JSON (every repeat) and as a summary CSV with the
+  gol_timings columns that game_of_life_create_plots.py reads, plus the
+  median, IQR, minimum, throughput (cell updates per second of stepping)
+  and the number of samples kept and discarded
+
+Cases are looked up by name (see CASES), so they can be rebuilt inside a
+worker process. Backend modules are only imported when a case is used.
+
+Usage:
+    records = run_case("NumPy (CPU)", size=500, timesteps=100, repeats=5,
+                       ci_target=0.05, budget_sec=30)
+    write_csv("timings.csv", summarise(records, gpu_name, cpu_name))
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import csv
+import importlib
+import json
+import multiprocessing
+import math
+import statistics
+import time
+from pathlib import Path
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Columns of the summary CSV; the first nine match game_of_life_experiment.py
+SUMMARY_COLUMNS = [
+    "gpu", "cpu", "method", "grid_size", "timesteps",
+    "mean_time_sec", "std_dev_sec", "compile_time_sec", "step_time_sec",
+    "init_time_sec", "teardown_time_sec", "step_std_sec", "repeats", "warmup", "isolated",
+    "median_time_sec", "iqr_sec", "min_time_sec", "cell_updates_per_sec", "n_samples", "n_discarded",
+    "median_ci_rel",
+]
+
+# Two-sided confidence level of the median interval used by ci_target
+CI_LEVEL = 0.95
+
+
+class BenchmarkCase:
+    """
+    One backend, split into the three timed phases.
+
+    Args:
+        name (str): Method label written to the results, e.g. "NumPy (CPU)".
+        init: Callable (size, timesteps, seed, **options) -> state.
+        step: Callable (state, timesteps) -> None; runs every generation and
+            returns only once the work is complete (GPU work synchronised).
+        teardown: Callable (state) -> None.
+        cells: Callable (size, state) -> cells updated per timestep, for the
+            throughput; defaults to size * size.
+    """
+
+    def __init__(self, name: str, init, step, teardown=None, cells=None):
+        self.name = name
+        self.init = init
+        self.step = step
+        self.teardown = teardown or (lambda state: None)
+        self.cells = cells or (lambda size, state: size * size)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Game of Life cases
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _import(module: str):
+    """Import a sibling module whether or not the scripts run as a package."""
+    if __package__:
+        return importlib.import_module(f".{module}", __package__)
+    return importlib.import_module(module)
+
+
+def _numpy_init(size, timesteps, seed, workers=1, **_):
+    life_stepper = _import("life_stepper")
+    grid = _import("initial_conditions").random_grid(size, seed=seed)
+    if workers > 1:
+        return life_stepper.BandedLifeStepper(grid, workers=workers)
+    return life_stepper.LifeStepper(grid)
+
+
+def _numpy_step(stepper, timesteps):
+    stepper.step(timesteps)
+
+
+def _numpy_teardown(stepper):
+    if hasattr(stepper, "close"):
+        stepper.close()
+
+
+def _tiled_init(size, timesteps, seed, tile_size=128, **_):
+    grid = _import("initial_conditions").random_grid(size, seed=seed)
+    return _import("life_stepper").TiledLifeStepper(grid, tile_size=tile_size)
+
+
+def _naive_init(size, timesteps, seed, **_):
+    return {"grid": _import("initial_conditions").random_grid(size, seed=seed),
+            "step": _import("game_of_life").life_step_naive}
+
+
+def _naive_step(state, timesteps):
+    for _ in range(timesteps):
+        state["grid"] = state["step"](state["grid"])
+
+
+def _bitpacked_init(size, timesteps, seed, **_):
+    return {"grid": _import("initial_conditions").random_grid(size, seed=seed, packed=True),
+            "n_cols": size, "step": _import("game_of_life").life_step_bitpacked}
+
+
+def _bitpacked_step(state, timesteps):
+    for _ in range(timesteps):
+        state["grid"] = state["step"](state["grid"], state["n_cols"])
+
+
+def _jit_init(size, timesteps, seed, **_):
+    import numpy as np
+    game_of_life_jit = _import("game_of_life_jit")
+    grid = _import("initial_conditions").random_grid(size, seed=seed)
+    return {"grid": grid, "out": np.empty_like(grid), "step": game_of_life_jit.life_step_jit}
+
+
+def _jit_step(state, timesteps):
+    grid, out = state["grid"], state["out"]
+    for _ in range(timesteps):
+        state["step"](grid, out)
+        grid, out = out, grid
+    state["grid"], state["out"] = grid, out
+
+
+def _cupy_init(size, timesteps, seed, **_):
+    cp = _import("lazy_imports").require_cupy()
+    grid = _import("initial_conditions").random_grid(size, seed=seed)
+    state = {"grid": cp.asarray(grid).astype(cp.int32), "step": _import("game_of_life").life_step_gpu}
+    cp.cuda.Stream.null.synchronize()
+    return state
+
+
+def _cupy_step(state, timesteps):
+    import cupy as cp
+    for _ in range(timesteps):
+        state["grid"] = state["step"](state["grid"])
+    cp.cuda.Stream.null.synchronize()
+
+
+def _cupy_teardown(state):
+    import cupy as cp
+    state.clear()
+    cp.get_default_memory_pool().free_all_blocks()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Temperature diffusion cases (timesteps = diffusion timesteps; size unused)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _diffusion_case(name: str, backend: str) -> BenchmarkCase:
+    # Loading and preparing the fields is init; step runs only the
+    # diffuse_<backend> kernel, which neither copies the input nor saves
+    def init(size, timesteps, seed, **_):
+        module = _import("temperature_diffusion")
+        data = module.load_data()
+        try:
+            # One time slice of the (depth, lat, lon) grid is updated per timestep
+            cells = int(data["thetao"][0].size)
+            fields = getattr(module, f"prepare_{backend}")(data, timesteps)
+        finally:
+            data.close()
+        return {"fields": fields, "cells": cells, "diffuse": getattr(module, f"diffuse_{backend}")}
+
+    def step(state, timesteps):
+        state["diffuse"](*state["fields"], timesteps)
+
+    teardown = _cupy_teardown if backend == "cupy" else (lambda state: state.clear())
+    return BenchmarkCase(name, init, step, teardown, cells=lambda size, state: state["cells"])
+
+
+CASES = {
+    "NumPy (CPU)": lambda: BenchmarkCase("NumPy (CPU)", _numpy_init, _numpy_step, _numpy_teardown),
+    "CuPy (GPU)": lambda: BenchmarkCase("CuPy (GPU)", _cupy_init, _cupy_step, _cupy_teardown),
+    "Tiled (CPU)": lambda: BenchmarkCase("Tiled (CPU)", _tiled_init, _numpy_step),
+    "Naive (CPU)": lambda: BenchmarkCase("Naive (CPU)", _naive_init, _naive_step),
+    "Bit-packed (CPU)": lambda: BenchmarkCase("Bit-packed (CPU)", _bitpacked_init, _bitpacked_step),
+    "JIT loop (CPU)": lambda: BenchmarkCase("JIT loop (CPU)", _jit_init, _jit_step),
+    "Diffusion Pure Python": lambda: _diffusion_case("Pure Python", "purepython"),
+    "Diffusion NumPy (CPU)": lambda: _diffusion_case("NumPy (CPU)", "numpy"),
+    "Diffusion CuPy (GPU)": lambda: _diffusion_case("CuPy (GPU)", "cupy"),
+}
+
+
+def get_case(name: str) -> BenchmarkCase:
+    """Build the BenchmarkCase registered under `name` in CASES."""
+    try:
+        return CASES[name]()
+    except KeyError:
+        raise ValueError(f"unknown benchmark case {name!r}; choose from {sorted(CASES)}") from None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3) Timing
+# ─────────────────────────────────────────────────────────────────────────────
+
+def median_ci(samples: list, level: float = CI_LEVEL) -> tuple:
+    """
+    Distribution-free confidence interval of the median.
+
+    Uses the order statistics whose ranks bound the median with probability
+    `level` (normal approximation of the binomial), so no assumption is
+    made about the shape of the timing distribution.
+
+    Returns:
+        tuple[float, float] or None: (low, high), or None when there are too
+        few samples for the level (fewer than 6 at 95%).
+    """
+    n = len(samples)
+    z = statistics.NormalDist().inv_cdf(0.5 + level / 2)
+    lower = round((n - z * math.sqrt(n)) / 2)
+    upper = round(1 + (n + z * math.sqrt(n)) / 2)
+    if lower < 1 or upper > n:
+        return None
+    ordered = sorted(samples)
+    return ordered[lower - 1], ordered[upper - 1]
+
+
+def median_ci_rel(samples: list, level: float = CI_LEVEL) -> float:
+    """Width of median_ci() relative to the median (inf if undefined)."""
+    ci = median_ci(samples, level)
+    median = statistics.median(samples) if samples else 0
+    if ci is None or median <= 0:
+        return math.inf
+    return (ci[1] - ci[0]) / median
+
+
+def warmup_outliers(samples: list) -> int:
+    """
+    Count the leading samples that are still warming up.
+
+    A sample is an outlier if it is slower than the Tukey fence
+    Q3 + 1.5 IQR of all samples; only the run of outliers at the start is
+    counted, later spikes are genuine variation and are kept.
+    """
+    if len(samples) < 4:
+        return 0
+    q1, _, q3 = statistics.quantiles(samples, n=4)
+    fence = q3 + 1.5 * (q3 - q1)
+    count = 0
+    while count < len(samples) - 1 and samples[count] > fence:
+        count += 1
+    return count
+
+
+def _total_sec(record: dict) -> float:
+    return (record["init_ns"] + record["step_ns"] + record["teardown_ns"]) / 1e9
+
+
+def time_case(case: BenchmarkCase, size: int, timesteps: int, repeats: int = 3, warmup: int = 1,
+              seed: int = 0, ci_target: float = None, budget_sec: float = None, max_repeats: int = 1000,
+              **options) -> list:
+    """
+    Time init, step and teardown of a case in this process.
+
+    Args:
+        case (BenchmarkCase): Backend to time.
+        size (int): Grid size passed to init.
+        timesteps (int): Generations per repeat.
+        repeats (int): Timed iterations; the minimum when ci_target is set.
+        warmup (int): Untimed iterations run first.
+        seed (int): Seed for the initial grid (the same for every repeat).
+        ci_target (float): Keep repeating until the 95% confidence interval
+            of the median run time is narrower than this fraction of the
+            median (e.g. 0.05); None runs exactly `repeats`.
+        budget_sec (float): Stop once this much time (warmup included) has
+            been spent, even below `repeats`; at least one run is timed.
+        max_repeats (int): Upper bound on timed iterations with ci_target.
+        **options: Extra keyword arguments for init (e.g. workers).
+
+    Returns:
+        list[dict]: One record per timed repeat with init_ns, step_ns,
+        teardown_ns, cells (per timestep), the configuration, "discarded"
+        (a warmup outlier) and "stop_reason" ("repeats", "ci", "budget" or
+        "max_repeats").
+    """
+    records = []
+    start = time.perf_counter()
+    i = 0
+    while True:
+        t0 = time.perf_counter_ns()
+        state = case.init(size, timesteps, seed, **options)
+        t1 = time.perf_counter_ns()
+        case.step(state, timesteps)
+        t2 = time.perf_counter_ns()
+        cells = case.cells(size, state)    # Between the timed regions, not part of teardown
+        t3 = time.perf_counter_ns()
+        case.teardown(state)
+        del state
+        t4 = time.perf_counter_ns()
+        if i >= warmup:
+            records.append({
+                "method": case.name, "grid_size": size, "timesteps": timesteps,
+                "repeat": i - warmup, "warmup": warmup, "options": options,
+                "init_ns": t1 - t0, "step_ns": t2 - t1, "teardown_ns": t4 - t3, "cells": cells,
+            })
+        i += 1
+
+        n = len(records)
+        if budget_sec is not None and n and time.perf_counter() - start >= budget_sec:
+            reason = "budget"
+        elif n < repeats:
+            continue
+        elif ci_target is None:
+            reason = "repeats"
+        elif n >= max_repeats:
+            reason = "max_repeats"
+        else:
+            times = [_total_sec(r) for r in records]
+            if median_ci_rel(times[warmup_outliers(times):]) > ci_target:
+                continue
+            reason = "ci"
+        break
+
+    discarded = warmup_outliers([_total_sec(r) for r in records])
+    for k, record in enumerate(records):
+        record["discarded"] = k < discarded
+        record["stop_reason"] = reason
+    return records
+
+
+def sample_stats(records: list) -> dict:
+    """
+    Robust statistics of the kept (not discarded) repeats of one configuration.
+
+    Returns:
+        dict: "n_samples", "n_discarded", "mean", "std" (population),
+        "median", "iqr", "min" and "median_ci_rel" of the total run time in
+        seconds, "step_median" and "cell_updates_per_sec" (cells x timesteps
+        per second of median stepping time).
+    """
+    kept = [r for r in records if not r.get("discarded")]
+    total = [_total_sec(r) for r in kept]
+    step = [r["step_ns"] / 1e9 for r in kept]
+    q1, _, q3 = statistics.quantiles(total, n=4) if len(total) > 1 else (total[0], 0, total[0])
+    step_median = statistics.median(step)
+    cells = kept[0].get("cells", kept[0]["grid_size"] ** 2)
+    return {
+        "n_samples": len(kept), "n_discarded": len(records) - len(kept),
+        "mean": statistics.mean(total), "std": statistics.pstdev(total),
+        "median": statistics.median(total), "iqr": q3 - q1, "min": min(total),
+        "median_ci_rel": median_ci_rel(total),
+        "step_median": step_median,
+        "cell_updates_per_sec": cells * kept[0]["timesteps"] / step_median if step_median > 0 else math.inf,
+    }
+
+
+def _time_case_by_name(name, size, timesteps, repeats, warmup, seed, ci_target, budget_sec, max_repeats, options):
+    return time_case(get_case(name), size, timesteps, repeats, warmup, seed, ci_target, budget_sec, max_repeats,
+                     **options)
+
+
+def run_case(name: str, size: int, timesteps: int, repeats: int = 3, warmup: int = 1, seed: int = 0,
+             isolate: bool = False, ci_target: float = None, budget_sec: float = None, max_repeats: int = 1000,
+             **options) -> list:
+    """
+    Time the case registered as `name`, optionally in a fresh worker process.
+
+    With isolate=True the case is imported, warmed up and timed in a newly
+    spawned process, which exits afterwards. ci_target, budget_sec and
+    max_repeats make the repeat count adaptive (see time_case).
+
+    Returns:
+        list[dict]: Records as from time_case, with "isolated" added.
+    """
+    args = (name, size, timesteps, repeats, warmup, seed, ci_target, budget_sec, max_repeats, options)
+    if isolate:
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            records = pool.apply(_time_case_by_name, args)
+    else:
+        records = _time_case_by_name(*args)
+    for record in records:
+        record["isolated"] = isolate
+    return records
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 4) Output
+# ─────────────────────────────────────────────────────────────────────────────
+
+def summarise(records: list, gpu: str, cpu: str, compile_time: dict = None) -> list:
+    """
+    Collapse per-repeat records into one summary row per configuration.
+
+    mean_time_sec is init + step + teardown, so the column keeps its old
+    meaning (one complete run) without process start-up. Discarded warmup
+    outliers are left out of every statistic; `repeats` counts all timed
+    runs and `n_samples` the ones kept.
+
+    Args:
+        records (list[dict]): Output of run_case/time_case.
+        gpu (str): GPU label for the rows.
+        cpu (str): CPU label for the rows.
+        compile_time (dict): Optional method -> compile seconds.
+
+    Returns:
+        list[dict]: Rows keyed by SUMMARY_COLUMNS.
+    """
+    groups = {}
+    for record in records:
+        key = (record["method"], record["grid_size"], record["timesteps"],
+               json.dumps(record["options"], sort_keys=True))
+        groups.setdefault(key, []).append(record)
+
+    rows = []
+    for (method, size, timesteps, _), group in groups.items():
+        kept = [r for r in group if not r.get("discarded")]
+        stats = sample_stats(group)
+        step = [r["step_ns"] / 1e9 for r in kept]
+        compile_sec = (compile_time or {}).get(method)
+        rows.append({
+            "gpu": gpu, "cpu": cpu, "method": method, "grid_size": size, "timesteps": timesteps,
+            "mean_time_sec": f"{stats['mean']:.6f}",
+            "std_dev_sec": f"{stats['std']:.6f}",
+            "compile_time_sec": "" if compile_sec is None else f"{compile_sec:.6f}",
+            "step_time_sec": f"{statistics.mean(step):.6f}",
+            "init_time_sec": f"{statistics.mean(r['init_ns'] for r in kept) / 1e9:.6f}",
+            "teardown_time_sec": f"{statistics.mean(r['teardown_ns'] for r in kept) / 1e9:.6f}",
+            "step_std_sec": f"{statistics.pstdev(step):.6f}",
+            "repeats": len(group), "warmup": group[0]["warmup"], "isolated": group[0].get("isolated", False),
+            "median_time_sec": f"{stats['median']:.6f}", "iqr_sec": f"{stats['iqr']:.6f}",
+            "min_time_sec": f"{stats['min']:.6f}", "cell_updates_per_sec": f"{stats['cell_updates_per_sec']:.4g}",
+            "n_samples": stats["n_samples"], "n_discarded": stats["n_discarded"],
+            "median_ci_rel": f"{stats['median_ci_rel']:.4f}",
+        })
+    return rows
+
+
+def write_csv(path: Path, rows: list, columns=SUMMARY_COLUMNS) -> None:
+    """Write summary rows (dicts) to CSV; extra keys are ignored."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(path: Path, records: list, **metadata) -> None:
+    """Write every timed repeat plus run metadata (e.g. gpu, cpu) as JSON."""
+    with open(path, "w") as f:
+        json.dump({"metadata": metadata, "records": records}, f, indent=2)
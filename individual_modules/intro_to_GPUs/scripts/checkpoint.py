@@ -0,0 +1,115 @@
+"""
+Checkpoint/Restart for Long Game of Life Runs
+
+Long simulate_and_animate runs (game_of_life_mem_opt.py) can be preempted by
+the batch system. A checkpoint holds everything needed to continue:
+
+- the current grid, bit-packed with np.packbits (one bit per cell)
+- the per-cell alive counts accumulated so far
+- the generation number the grid belongs to
+- the entropy of the SeedSequence the initial grid was drawn from, so a
+  resumed run reports (and can reproduce) the same starting soup
+- small extras such as the byte offset of the statistics CSV
+
+The checkpoint is a single .npz file. It is written to a temporary file in the
+same directory, fsync'ed and then renamed over the previous one, so a crash
+while writing leaves the last complete checkpoint untouched.
+
+Usage:
+    cost = save_checkpoint(checkpoint_dir, generation, grid, counts, entropy=...)
+    state = load_checkpoint(checkpoint_dir)   # None if there is none yet
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+CHECKPOINT_NAME = "checkpoint.npz"
+
+
+def _fsync_dir(path: Path) -> None:
+    """Persist a rename on file systems that need the directory synced (POSIX only)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def save_checkpoint(checkpoint_dir: Path, generation: int, grid: np.ndarray, counts: np.ndarray,
+                    entropy=None, **extra) -> dict:
+    """
+    Atomically write a checkpoint, replacing the previous one.
+
+    Args:
+        checkpoint_dir (Path): Directory holding the checkpoint (created if needed).
+        generation (int): Generation that `grid` holds; a resumed run starts here.
+        grid (np.ndarray): 2D array of 0s and 1s.
+        counts (np.ndarray): Alive counts of generations 0 .. generation-1.
+        entropy (int): Entropy of the initial-grid SeedSequence.
+        **extra: Additional integer state stored alongside (e.g. stats_offset).
+
+    Returns:
+        dict: {"bytes": checkpoint size, "seconds": time to write and rename}.
+    """
+    t0 = time.perf_counter()
+    checkpoint_dir = Path(checkpoint_dir)
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    path = checkpoint_dir / CHECKPOINT_NAME
+    tmp = checkpoint_dir / f".{CHECKPOINT_NAME}.tmp"
+
+    arrays = {
+        "generation": np.int64(generation),
+        "shape": np.array(grid.shape, dtype=np.int64),
+        "grid": np.packbits(grid.astype(bool, copy=False), axis=1, bitorder="little"),
+        "counts": counts,
+        # Entropy can exceed 64 bits, so it is kept as text
+        "entropy": np.array("" if entropy is None else str(entropy)),
+    }
+    arrays.update({key: np.int64(value) for key, value in extra.items()})
+
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(checkpoint_dir)
+    return {"bytes": path.stat().st_size, "seconds": time.perf_counter() - t0}
+
+
+def load_checkpoint(checkpoint_dir: Path) -> dict:
+    """
+    Read the checkpoint in checkpoint_dir.
+
+    Returns:
+        dict or None: None if there is no checkpoint, else a dict with
+        "generation" (int), "grid" (uint8 0/1 array), "counts", "entropy"
+        (int or None) and any extra integer state saved with it.
+    """
+    path = Path(checkpoint_dir) / CHECKPOINT_NAME
+    if not path.exists():
+        return None
+    with np.load(path) as data:
+        state = {key: data[key] for key in data.files}
+    _, n_cols = (int(v) for v in state.pop("shape"))
+    state["grid"] = np.unpackbits(state["grid"], axis=1, count=n_cols, bitorder="little")
+    entropy = str(state["entropy"])
+    state["entropy"] = int(entropy) if entropy else None
+    for key, value in state.items():
+        if isinstance(value, np.ndarray) and value.ndim == 0:
+            state[key] = int(value)
+    return state
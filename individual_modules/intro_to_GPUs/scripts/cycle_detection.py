@@ -0,0 +1,111 @@
+"""
+Cycle Detection for Game of Life Runs
+
+Random soups almost always settle into still lifes and oscillators, after
+which every further generation repeats an earlier one. CycleDetector hashes
+each generation (BLAKE2b of the bit-packed grid) into a bounded ring of
+recent hashes; when the current hash was seen p generations ago, the run has
+entered a cycle of period p and the remaining generations can be skipped:
+
+- "stop":         end the run at the first repeated generation
+- "fast-forward": skip the remaining generations analytically, using the
+                  fact that generation t + k equals generation t + (k mod p)
+
+Only periods up to `max_period` are detected (the ring holds that many
+hashes), which covers the oscillators that random soups leave behind. A
+glider on a torus is also periodic, but with a period proportional to the
+grid size, so it is only detected on small grids.
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import hashlib
+from collections import deque
+
+import numpy as np
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+ON_CYCLE_CHOICES = ("stop", "fast-forward")
+
+
+class CycleDetector:
+    """
+    Detect period-p repetition from a stream of generations.
+
+    Args:
+        max_period (int): Longest period detected; size of the hash ring.
+    """
+
+    def __init__(self, max_period: int = 64):
+        self.max_period = max_period
+        self._ring = deque()   # (hash, generation), oldest first
+        self._latest = {}      # hash -> most recent generation with that hash
+
+    @staticmethod
+    def digest(grid: np.ndarray) -> bytes:
+        """Hash of a 0/1 grid, taken over its bit-packed bytes."""
+        packed = np.packbits(np.asarray(grid) != 0, axis=-1)
+        return hashlib.blake2b(packed.tobytes(), digest_size=16).digest()
+
+    def observe(self, grid: np.ndarray, generation: int):
+        """
+        Record generation `generation` and check it against the ring.
+
+        Returns:
+            int or None: Period p if this generation equals generation
+            `generation - p`, otherwise None.
+        """
+        key = self.digest(grid)
+        seen = self._latest.get(key)
+        period = generation - seen if seen is not None else None
+
+        self._ring.append((key, generation))
+        self._latest[key] = generation
+        if len(self._ring) > self.max_period:
+            old_key, old_generation = self._ring.popleft()
+            if self._latest.get(old_key) == old_generation:
+                del self._latest[old_key]
+        return period
+
+
+def report_cycle(label: str, period: int, generation: int, timesteps: int, action: str) -> None:
+    """
+    Print where a cycle was found and how many generations were saved.
+    """
+    skipped = timesteps - generation
+    print(f"{label} Period-{period} cycle reached at generation {generation}; "
+          f"{action} skipped {skipped} of {timesteps} generations ({skipped / timesteps:.1%})")
+
+
+def extrapolate_counts(stepper, period: int, remaining: int, dtype=np.uint32) -> np.ndarray:
+    """
+    Per-cell alive counts over the `remaining` generations of a cycle.
+
+    The stepper must be at a generation that starts a cycle of length
+    `period`. One period is stepped to sum the alive cells; the total is that
+    sum times the number of whole periods, plus the partial sum over the
+    first `remaining mod period` generations. The stepper ends where it
+    started (one full period later).
+
+    Args:
+        stepper: Object with a .grid view and a .step() method (LifeStepper).
+        period (int): Cycle period.
+        remaining (int): Number of generations to account for.
+        dtype: Accumulator dtype.
+
+    Returns:
+        np.ndarray: Counts to add to the running total.
+    """
+    whole, rest = divmod(remaining, period)
+    cycle_sum = np.zeros(stepper.grid.shape, dtype=dtype)
+    partial = None
+    for k in range(period):
+        if k == rest:
+            partial = cycle_sum.copy()
+        cycle_sum += stepper.grid
+        stepper.step()
+    return cycle_sum * dtype(whole) + partial
@@ -0,0 +1,331 @@
+"""
+Direct Frame Encoder for Game of Life Animations
+
+The matplotlib path (FuncAnimation / PillowWriter.grab_frame) draws a whole
+figure for every generation and hands an RGBA raster to the encoder, which
+dominates wall time for large runs. DirectFrameWriter skips matplotlib:
+
+- the 0/1 uint8 grid is downsampled by striding (as in simulate_and_animate)
+  and, for small grids, upscaled by an integer factor (nearest neighbour)
+- the result becomes a two-colour palette ("P") or 1-bit ("1") image, with
+  the same black-on-white look as the 'binary' colormap
+- frames are encoded straight away, by output suffix:
+    .gif          streamed frame by frame with Pillow's GIF encoder
+                  (constant memory; only the header is written up front)
+    .png / .webp  animated PNG / WebP via Pillow (1-bit frames are kept
+                  until finish(), as those encoders need all frames)
+    .mp4 / .webm  raw grayscale frames piped into a local ffmpeg
+
+Usage:
+    with DirectFrameWriter("life.gif", fps=5, max_display=1080) as writer:
+        for grid in frames:
+            writer.write_frame(grid)
+
+FramePipeline runs a thread-safe frame encoder such as DirectFrameWriter on a
+background thread fed by a bounded queue, so the simulation keeps stepping
+while earlier frames are encoded.
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, GifImagePlugin
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+ENCODERS = ("matplotlib", "direct")
+
+# Palette index 0 (dead) is white, index 1 (alive) is black, as with cmap='binary'
+PALETTE = [255, 255, 255, 0, 0, 0]
+
+# 256 grey levels for block-mean frames: index k is the alive fraction k / 255
+GREY_PALETTE = [255 - k for k in range(256) for _ in range(3)]
+
+PILLOW_ANIMATED_SUFFIXES = (".png", ".apng", ".webp")
+FFMPEG_SUFFIXES = (".mp4", ".webm", ".mkv")
+
+# Sentinel that tells the encoder thread to finish
+_STOP = object()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Frame preparation
+# ─────────────────────────────────────────────────────────────────────────────
+
+def display_factors(n_rows: int, n_cols: int, max_display: int):
+    """
+    Stride and upscale factor that fit an (n_rows, n_cols) grid into max_display pixels.
+
+    Returns:
+        tuple[int, int]: (step, scale); frames are grid[::step, ::step]
+        repeated `scale` times along both axes.
+    """
+    side = max(n_rows, n_cols)
+    if max_display is None:
+        return 1, 1
+    if side > max_display:
+        return max(1, side // max_display), 1
+    return 1, max(1, max_display // side)
+
+
+def grid_to_image(grid: np.ndarray, step: int = 1, scale: int = 1, mode: str = "P") -> Image.Image:
+    """
+    Convert a 0/1 grid into a two-colour Pillow image.
+
+    Floating-point frames (alive fractions in [0, 1], e.g. block means) become
+    a 256-level grey palette image instead; mode "1" is not used for them.
+
+    Args:
+        grid (np.ndarray): 2D array of 0s and 1s, or of alive fractions.
+        step (int): Keep every step-th row and column.
+        scale (int): Integer upscaling factor (nearest neighbour).
+        mode (str): "P" (two-colour palette) or "1" (1-bit, black = alive).
+
+    Returns:
+        PIL.Image.Image: Image of shape (rows // step * scale, cols // step * scale).
+    """
+    small = grid[::step, ::step]
+    grey = np.issubdtype(small.dtype, np.floating)
+    if grey:
+        small = np.rint(small * 255)
+    small = np.ascontiguousarray(small, dtype=np.uint8)
+    if scale > 1:
+        small = small.repeat(scale, axis=0).repeat(scale, axis=1)
+    if grey:
+        im = Image.fromarray(small)
+        im.putpalette(GREY_PALETTE)
+        return im
+    if mode == "1":
+        # In mode "1" a set bit is white, so alive cells are the zero bits
+        return Image.fromarray(small == 0)
+    im = Image.fromarray(small)
+    im.putpalette(PALETTE)
+    return im
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Writer
+# ─────────────────────────────────────────────────────────────────────────────
+
+class DirectFrameWriter:
+    """
+    Encode Game of Life frames without matplotlib.
+
+    Args:
+        output_file (Path): Output path; the suffix selects the format.
+        fps (float): Frames per second.
+        max_display (int): Longest side of the output image in pixels.
+        loop (int): GIF/APNG loop count (0 = forever).
+    """
+
+    def __init__(self, output_file: Path, fps: float, max_display: int = 1080, loop: int = 0):
+        self.output_file = Path(output_file)
+        self.fps = fps
+        self.duration_ms = int(round(1000 / fps))
+        self.max_display = max_display
+        self.loop = loop
+        self.n_frames = 0
+
+        suffix = self.output_file.suffix.lower()
+        if suffix == ".gif":
+            self._kind = "gif"
+        elif suffix in PILLOW_ANIMATED_SUFFIXES:
+            self._kind = "pillow"
+        elif suffix in FFMPEG_SUFFIXES:
+            if shutil.which("ffmpeg") is None:
+                raise RuntimeError(f"{suffix} output needs ffmpeg on the PATH")
+            self._kind = "ffmpeg"
+        else:
+            raise ValueError(f"unsupported animation format {suffix!r}")
+
+        self._factors = None
+        self._fp = None
+        self._frames = []
+        self._proc = None
+
+    def _open(self, im: Image.Image) -> None:
+        if self._kind == "gif":
+            self._fp = open(self.output_file, "wb")
+            header, _ = GifImagePlugin.getheader(im, info={"loop": self.loop, "duration": self.duration_ms})
+            for block in header:
+                self._fp.write(block)
+        elif self._kind == "ffmpeg":
+            width, height = im.size
+            cmd = [
+                "ffmpeg", "-loglevel", "error", "-y",
+                "-f", "rawvideo", "-pix_fmt", "gray", "-s", f"{width}x{height}",
+                "-r", str(self.fps), "-i", "-",
+                "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                "-pix_fmt", "yuv420p", str(self.output_file),
+            ]
+            self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def write_frame(self, grid: np.ndarray) -> None:
+        """
+        Downsample, convert and encode one generation.
+
+        Args:
+            grid (np.ndarray): 2D array of 0s and 1s (full resolution).
+        """
+        if self._factors is None:
+            self._factors = display_factors(grid.shape[0], grid.shape[1], self.max_display)
+        step, scale = self._factors
+        mode = "1" if self._kind == "pillow" else "P"
+        im = grid_to_image(grid, step, scale, mode)
+        if self.n_frames == 0:
+            self._open(im)
+
+        if self._kind == "gif":
+            for block in GifImagePlugin.getdata(im, duration=self.duration_ms):
+                self._fp.write(block)
+        elif self._kind == "pillow":
+            self._frames.append(im)
+        else:
+            # Grayscale bytes through the palette (alive is black)
+            self._proc.stdin.write(im.convert("L").tobytes())
+        self.n_frames += 1
+
+    def finish(self) -> None:
+        """
+        Flush and close the output file.
+        """
+        if self._kind == "gif" and self._fp is not None:
+            self._fp.write(b";")  # GIF trailer
+            self._fp.close()
+            self._fp = None
+        elif self._kind == "pillow" and self._frames:
+            first, *rest = self._frames
+            first.save(self.output_file, save_all=True, append_images=rest,
+                       duration=self.duration_ms, loop=self.loop)
+            self._frames = []
+        elif self._kind == "ffmpeg" and self._proc is not None:
+            self._proc.stdin.close()
+            if self._proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg exited with status {self._proc.returncode}")
+            self._proc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.finish()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3) Background encoding pipeline
+# ─────────────────────────────────────────────────────────────────────────────
+
+class FramePipeline:
+    """
+    Encode frames on a background thread fed by a bounded queue.
+
+    submit() blocks while `maxsize` frames are waiting (backpressure), so
+    memory stays bounded by maxsize frames. An exception raised by the
+    encoder is re-raised in the caller by the next submit() or by close();
+    after a failure the thread discards queued frames, so the caller never
+    blocks on a dead consumer. With maxsize=0 frames are encoded inline.
+
+    encode_frame and finish run on the encoder thread, so they must not
+    touch matplotlib figures (matplotlib is not thread-safe); use maxsize=0
+    for a matplotlib writer.
+
+    Args:
+        encode_frame: Callable taking one frame.
+        finish: Optional callable run once after the last frame (on the
+            encoder thread), e.g. writer.finish.
+        maxsize (int): Queue capacity in frames; 0 encodes synchronously.
+
+    Attributes:
+        enqueue_wait (float): Seconds the caller spent blocked in submit().
+        encode_time (float): Seconds spent in encode_frame and finish.
+    """
+
+    def __init__(self, encode_frame, finish=None, maxsize: int = 8):
+        self._encode_frame = encode_frame
+        self._finish = finish
+        self.maxsize = maxsize
+        self.enqueue_wait = 0.0
+        self.encode_time = 0.0
+        self.error = None
+        self._closed = False
+        self._queue = None
+        self._thread = None
+        if maxsize > 0:
+            self._queue = queue.Queue(maxsize=maxsize)
+            self._thread = threading.Thread(target=self._run, name="frame-encoder", daemon=True)
+            self._thread.start()
+
+    def _encode(self, func, *args) -> None:
+        t0 = time.perf_counter()
+        try:
+            func(*args)
+        except BaseException as exc:
+            self.error = exc
+        self.encode_time += time.perf_counter() - t0
+
+    def _run(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is _STOP:
+                break
+            if self.error is None:
+                self._encode(self._encode_frame, frame)
+        if self.error is None and self._finish is not None:
+            self._encode(self._finish)
+
+    def _raise_if_failed(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+    def submit(self, frame) -> None:
+        """
+        Queue one frame for encoding (the caller must not modify it afterwards).
+        """
+        self._raise_if_failed()
+        if self._thread is None:
+            self._encode(self._encode_frame, frame)
+            self._raise_if_failed()
+            return
+        t0 = time.perf_counter()
+        self._queue.put(frame)
+        self.enqueue_wait += time.perf_counter() - t0
+
+    def close(self) -> None:
+        """
+        Encode the remaining frames, run finish() and re-raise any encoder error.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is None:
+            if self._finish is not None:
+                self._encode(self._finish)
+        else:
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._raise_if_failed()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif not self._closed:
+            # The caller already failed: finalise the writer without masking the error
+            self._closed = True
+            if self._thread is not None:
+                self._queue.put(_STOP)
+                self._thread.join()       # Runs finish() unless the encoder failed
+            elif self.error is None and self._finish is not None:
+                self._encode(self._finish)
@@ -2,32 +2,76 @@
 Conway’s Game of Life Simulation
 
 This module implements core update rules and simulation drivers for Conway’s
-Game of Life on 2D grids, with three backends:
+Game of Life on 2D grids, with four backends:
 - NumPy vectorized updates
 - CuPy GPU-accelerated updates
 - Naive Python nested loops
+- Bit-packed NumPy updates (64 cells per uint64 word)
+
+The NumPy entry point can also select a HashLife engine for very long
+horizons (`--engine hashlife`, see hashlife.py) or an active-tile engine that
+only recomputes tiles near recent changes (`--engine tiled`, see life_stepper.py).
+
+With `history_dir`, recorded generations are streamed to a chunked on-disk
+store (see history_store.py) instead of a list, so large runs can be recorded
+and, with the direct encoder, replayed by animate_life with constant memory.
+
+CuPy and matplotlib are imported on first use (see lazy_imports.py), so the
+CPU backends start quickly and run on machines without CUDA.
+
+simulate_life_ensemble steps a (B, N, N) stack of independent grids with
+per-member seeds and alive probabilities, returning population time series.
 
 It also provides an animation exporter (GIF via matplotlib) and CLI entry points:
 - run_life_numpy()
 - run_life_cupy()
 - run_life_naive()
+- run_life_bitpacked()
+- run_life() (any backend; --backend auto picks one from backend_calibration.py)
+- run_life_ensemble()
 """
 
 # -------------------------------------------------------------------
 # Library imports
 # -------------------------------------------------------------------
 import argparse
+import csv
 from pathlib import Path
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import numpy as np
-import cupy as cp
+
+try:
+    from .life_stepper import LifeStepper, BandedLifeStepper, TiledLifeStepper, report_active_fractions
+    from .hashlife import HashLife
+    from .history_store import open_history, finish_history
+    from .cycle_detection import CycleDetector, ON_CYCLE_CHOICES, report_cycle
+    from .frame_encoder import DirectFrameWriter, ENCODERS
+    from .initial_conditions import random_grid
+    from .memory_planner import (parse_memory, plan_life_run, report_plan, report_actual,
+                                  remove_temporary_history)
+    from .lazy_imports import require_cupy
+    from .span_timer import traced
+except ImportError:  # executed from within the scripts directory
+    from life_stepper import LifeStepper, BandedLifeStepper, TiledLifeStepper, report_active_fractions
+    from hashlife import HashLife
+    from history_store import open_history, finish_history
+    from cycle_detection import CycleDetector, ON_CYCLE_CHOICES, report_cycle
+    from frame_encoder import DirectFrameWriter, ENCODERS
+    from initial_conditions import random_grid
+    from memory_planner import (parse_memory, plan_life_run, report_plan, report_actual,
+                                 remove_temporary_history)
+    from lazy_imports import require_cupy
+    from span_timer import traced
+
+
+# Rows packed per band by pack_grid, bounding its temporary to a band of bytes
+PACK_BAND_ROWS = 1024
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 1) Core update functions (no plotting/animation)
 # ─────────────────────────────────────────────────────────────────────────────
 
+@traced()
 def life_step_numpy(grid: np.ndarray) -> np.ndarray:
     """
     Compute the next generation of the Game of Life using NumPy.
@@ -56,7 +100,8 @@ def life_step_numpy(grid: np.ndarray) -> np.ndarray:
     return np.where((neighbours == 3) | ((grid == 1) & (neighbours == 2)), 1, 0)
 
 
-def life_step_gpu(grid: cp.ndarray) -> cp.ndarray:
+@traced()
+def life_step_gpu(grid: "cp.ndarray") -> "cp.ndarray":
     """
     Compute the next generation of the Game of Life using CuPy on GPU.
 
@@ -68,6 +113,7 @@ def life_step_gpu(grid: cp.ndarray) -> cp.ndarray:
     Returns:
         cp.ndarray: Next-generation 2D CuPy array.
     """
+    cp = require_cupy()
     neighbours = (
         cp.roll(cp.roll(grid, 1, axis=0), 1, axis=1) +
         cp.roll(cp.roll(grid, 1, axis=0), -1, axis=1) +
@@ -81,6 +127,7 @@ def life_step_gpu(grid: cp.ndarray) -> cp.ndarray:
     return cp.where((neighbours == 3) | ((grid == 1) & (neighbours == 2)), 1, 0)
 
 
+@traced()
 def life_step_naive(grid: np.ndarray) -> np.ndarray:
     """
     Compute the next generation with a naive Python loop implementation.
@@ -111,36 +158,190 @@ def life_step_naive(grid: np.ndarray) -> np.ndarray:
     return new
 
 
+def pack_grid(grid: np.ndarray) -> np.ndarray:
+    """
+    Pack a 2D grid of 0s and 1s into rows of uint64 words.
+
+    Column j of a row is stored in bit (j % 64) of word (j // 64), so each
+    word holds 64 cells. Unused bits in the last word of a row are zero.
+    Rows are packed in bands straight into the output words, so no
+    full-size temporary is allocated besides the result.
+
+    Args:
+        grid (np.ndarray): 2D array of 0s and 1s with shape (N, M).
+
+    Returns:
+        np.ndarray: 2D uint64 array of shape (N, ceil(M / 64)).
+    """
+    n_rows, n_cols = grid.shape
+    n_bytes = -(-n_cols // 8)
+    packed = np.zeros((n_rows, -(-n_cols // 64)), dtype="<u8")
+    # Little-endian uint64 words: byte k of a row holds columns 8k .. 8k+7
+    packed_bytes = packed.view(np.uint8)
+    for r0 in range(0, n_rows, PACK_BAND_ROWS):
+        packed_bytes[r0:r0 + PACK_BAND_ROWS, :n_bytes] = np.packbits(
+            grid[r0:r0 + PACK_BAND_ROWS], axis=1, bitorder="little")
+    return packed.astype(np.uint64, copy=False)
+
+
+def unpack_grid(packed: np.ndarray, n_cols: int) -> np.ndarray:
+    """
+    Unpack rows of uint64 words back into a 2D uint8 grid of 0s and 1s.
+
+    Args:
+        packed (np.ndarray): 2D uint64 array produced by pack_grid.
+        n_cols (int): Number of columns in the original grid.
+
+    Returns:
+        np.ndarray: 2D uint8 array of shape (N, n_cols).
+    """
+    as_bytes = np.ascontiguousarray(packed.astype("<u8")).view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1, count=n_cols, bitorder="little")
+
+
+@traced()
+def life_step_bitpacked(packed: np.ndarray, n_cols: int) -> np.ndarray:
+    """
+    Compute the next generation on a bit-packed toroidal grid.
+
+    Each row is a sequence of uint64 words (see pack_grid). The left and right
+    neighbours of every cell are obtained by shifting whole words by one bit
+    and carrying the edge bit across word boundaries (wrapping at n_cols).
+    The eight neighbour bits are then summed with bitwise full adders, 64
+    cells at a time, keeping only the low three bits of the count:
+      - count == 3            -> alive
+      - count == 2 and alive  -> alive
+    A count of 8 wraps to 0 and correctly yields a dead cell.
+
+    Produces the same generations as life_step_numpy.
+
+    Args:
+        packed (np.ndarray): 2D uint64 array of packed rows.
+        n_cols (int): Number of valid columns (cells) per row.
+
+    Returns:
+        np.ndarray: 2D uint64 array of packed rows for the next generation.
+    """
+    one = np.uint64(1)
+    top = np.uint64(63)
+    last_bit = np.uint64((n_cols - 1) % 64)
+    tail_mask = np.uint64((1 << ((n_cols - 1) % 64 + 1)) - 1)
+
+    # Value of column j-1 at column j (wrapping column N-1 into column 0)
+    left = packed << one
+    left[:, 1:] |= packed[:, :-1] >> top
+    left[:, 0] |= (packed[:, -1] >> last_bit) & one
+    left[:, -1] &= tail_mask
+
+    # Value of column j+1 at column j (wrapping column 0 into column N-1)
+    right = packed >> one
+    right[:, :-1] |= packed[:, 1:] << top
+    right[:, -1] &= tail_mask >> one
+    right[:, -1] |= (packed[:, 0] & one) << last_bit
+
+    # Horizontal sums: three cells per row for the rows above/below (2 bits),
+    # and the two side cells for the row itself (2 bits)
+    ab = left ^ right
+    row_lo = ab ^ packed
+    row_hi = (left & right) | (packed & ab)
+    mid_lo = ab
+    mid_hi = left & right
+
+    up_lo = np.roll(row_lo, 1, axis=0)
+    up_hi = np.roll(row_hi, 1, axis=0)
+    down_lo = np.roll(row_lo, -1, axis=0)
+    down_hi = np.roll(row_hi, -1, axis=0)
+
+    # Add the three 2-bit numbers, keeping bits s0, s1, s2 of the total
+    t = up_lo ^ down_lo
+    s0 = t ^ mid_lo
+    carry0 = (up_lo & down_lo) | (mid_lo & t)
+    u = up_hi ^ down_hi
+    t1 = u ^ mid_hi
+    carry1 = (up_hi & down_hi) | (mid_hi & u)
+    s1 = t1 ^ carry0
+    s2 = carry1 ^ (t1 & carry0)
+
+    return s1 & ~s2 & (s0 | packed)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # 2) Simulation functions (no animation)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def simulate_life_numpy(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False):
+@traced()
+def simulate_life_numpy(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False,
+                        history_dir: Path = None,
+                        workers: int = 1, executor: str = "thread",
+                        on_cycle: str = None, max_period: int = 64, seed: int = None):
     """
     Run a Game of Life simulation using the NumPy backend.
 
-    Initializes a random NxN grid with alive probability p_alive,
-    then iterates the specified number of timesteps.
+    Initializes a random NxN grid with alive probability p_alive (seeded,
+    see initial_conditions.py),
+    then iterates the specified number of timesteps with a LifeStepper,
+    which applies the same rules as life_step_numpy but reuses two
+    preallocated uint8 buffers instead of allocating every generation.
+    With workers > 1 the grid is split into row bands stepped in parallel
+    (BandedLifeStepper); the generations are bit-identical.
+
+    With on_cycle set, each generation is hashed (see cycle_detection.py)
+    and the run ends once it repeats with a period up to max_period.
+    "stop" truncates the recorded history at that point; "fast-forward"
+    fills the rest of the history by replaying the cycle instead of stepping.
 
     Args:
         N (int): Grid dimension (N × N).
         timesteps (int): Number of generations to simulate.
         p_alive (float): Probability that a cell starts alive.
         record_history (bool): If True, collect each generation in a list.
+        history_dir (Path): If given, stream recorded generations to this
+            on-disk store instead of a list.
+        workers (int): Number of row bands / cores to use.
+        executor (str): "thread" or "process" pool when workers > 1.
+        on_cycle (str): None (no detection), "stop" or "fast-forward".
+        max_period (int): Longest cycle period detected.
+        seed (int): Seed for the initial grid (see initial_conditions.py).
 
     Returns:
-        list[np.ndarray] or None: History of grids if record_history else None.
+        list[np.ndarray], HistoryStore or None: History of grids if record_history else None.
     """
-    grid = np.random.choice([0, 1], size=(N, N), p=[1 - p_alive, p_alive])
-    history = [] if record_history else None
-    for _ in range(timesteps):
-        if record_history:
-            history.append(grid.copy())
-        grid = life_step_numpy(grid)
-    return history
-
-
-def simulate_life_cupy(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False):
+    history = open_history(record_history, (N, N), history_dir)
+    detector = CycleDetector(max_period) if on_cycle else None
+    grid = random_grid(N, p_alive=p_alive, seed=seed)
+    if workers > 1:
+        stepper = BandedLifeStepper(grid, workers=workers, executor=executor)
+    else:
+        stepper = LifeStepper(grid)
+    del grid
+    try:
+        for t in range(timesteps):
+            if detector is not None:
+                period = detector.observe(stepper.grid, t)
+                if period is not None:
+                    report_cycle("[NumPy]", period, t, timesteps, on_cycle)
+                    if on_cycle == "fast-forward" and record_history:
+                        # Generation t + k equals generation t + (k mod period)
+                        cycle = []
+                        for _ in range(period):
+                            cycle.append(stepper.grid.copy())
+                            stepper.step()
+                        for k in range(timesteps - t):
+                            history.append(cycle[k % period])
+                    break
+            if record_history:
+                history.append(stepper.grid.copy())
+            stepper.step()
+    finally:
+        # Release the band workers and shared buffers even if a step fails
+        if workers > 1:
+            stepper.close()
+    return finish_history(history)
+
+
+@traced()
+def simulate_life_cupy(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False,
+                       history_dir: Path = None, seed: int = None):
     """
     Run a Game of Life simulation on GPU using CuPy.
 
@@ -149,20 +350,27 @@ def simulate_life_cupy(N: int, timesteps: int, p_alive: float = 0.2, record_hist
         timesteps (int): Number of generations.
         p_alive (float): Initial alive probability.
         record_history (bool): If True, collect grids (converted to NumPy).
+        history_dir (Path): If given, stream recorded generations to this
+            on-disk store instead of a list.
+        seed (int): Seed for the initial grid (see initial_conditions.py).
 
     Returns:
-        list[np.ndarray] or None: History of grids as NumPy arrays if recorded.
+        list[np.ndarray], HistoryStore or None: History of grids as NumPy arrays if recorded.
     """
-    grid_gpu = (cp.random.random((N, N)) < p_alive).astype(cp.int32)
-    history = [] if record_history else None
+    cp = require_cupy()
+    # Drawn on the host so a seed gives the same soup as the CPU backends
+    grid_gpu = cp.asarray(random_grid(N, p_alive=p_alive, seed=seed)).astype(cp.int32)
+    history = open_history(record_history, (N, N), history_dir)
     for _ in range(timesteps):
         if record_history:
             history.append(cp.asnumpy(grid_gpu))
         grid_gpu = life_step_gpu(grid_gpu)
-    return history
+    return finish_history(history)
 
 
-def simulate_life_naive(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False):
+@traced()
+def simulate_life_naive(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False,
+                        history_dir: Path = None, seed: int = None):
     """
     Run a Game of Life simulation with the naive Python implementation.
 
@@ -171,84 +379,326 @@ def simulate_life_naive(N: int, timesteps: int, p_alive: float = 0.2, record_his
         timesteps (int): Number of generations.
         p_alive (float): Starting alive probability.
         record_history (bool): Whether to collect each generation.
+        history_dir (Path): If given, stream recorded generations to this
+            on-disk store instead of a list.
+        seed (int): Seed for the initial grid (see initial_conditions.py).
 
     Returns:
-        list[np.ndarray] or None: Recorded history if requested.
+        list[np.ndarray], HistoryStore or None: Recorded history if requested.
     """
-    grid = np.random.choice([0, 1], size=(N, N), p=[1 - p_alive, p_alive])
-    history = [] if record_history else None
+    grid = random_grid(N, p_alive=p_alive, seed=seed)
+    history = open_history(record_history, (N, N), history_dir)
     for _ in range(timesteps):
         if record_history:
             history.append(grid.copy())
         grid = life_step_naive(grid)
-    return history
+    return finish_history(history)
+
+
+@traced()
+def simulate_life_bitpacked(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False,
+                            history_dir: Path = None, seed: int = None):
+    """
+    Run a Game of Life simulation using the bit-packed NumPy backend.
+
+    The grid is generated directly as packed uint64 words (64 cells per
+    word, see random_grid(packed=True)), so the unpacked grid is never
+    allocated and the state needs 1/8 of the memory of the uint8 grid used
+    by simulate_life_numpy. Frames are only unpacked when recording history.
+
+    Args:
+        N (int): Grid dimension (N × N).
+        timesteps (int): Number of generations to simulate.
+        p_alive (float): Probability that a cell starts alive.
+        record_history (bool): If True, collect each generation in a list.
+        history_dir (Path): If given, stream recorded generations to this
+            on-disk store instead of a list.
+        seed (int): Seed for the initial grid (see initial_conditions.py).
+
+    Returns:
+        list[np.ndarray], HistoryStore or None: History of grids if record_history else None.
+    """
+    packed = random_grid(N, p_alive=p_alive, seed=seed, packed=True)
+    history = open_history(record_history, (N, N), history_dir)
+    for _ in range(timesteps):
+        if record_history:
+            history.append(unpack_grid(packed, N))
+        packed = life_step_bitpacked(packed, N)
+    return finish_history(history)
+
+
+@traced()
+def simulate_life_hashlife(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False,
+                           history_dir: Path = None,
+                           max_nodes: int = 2_000_000, seed: int = None):
+    """
+    Run a Game of Life simulation with the memoised quadtree (HashLife) engine.
+
+    Without history, the whole run is done in power-of-two jumps, so settled
+    or periodic soups advance millions of generations in seconds. Recording
+    history forces single-generation steps and a dense frame per generation.
+
+    Args:
+        N (int): Grid dimension (N × N). Power-of-two sizes are fastest.
+        timesteps (int): Number of generations to simulate.
+        p_alive (float): Probability that a cell starts alive.
+        record_history (bool): If True, collect each generation in a list.
+        history_dir (Path): If given, stream recorded generations to this
+            on-disk store instead of a list.
+        max_nodes (int): Cap on the canonical-node cache (see hashlife.HashLife).
+        seed (int): Seed for the initial grid (see initial_conditions.py).
+
+    Returns:
+        list[np.ndarray], HistoryStore or None: History of grids if record_history else None.
+    """
+    grid = random_grid(N, p_alive=p_alive, seed=seed)
+    engine = HashLife(max_nodes=max_nodes)
+    if not record_history:
+        engine.advance(grid, timesteps)
+        return None
+    history = open_history(record_history, (N, N), history_dir)
+    for _ in range(timesteps):
+        history.append(grid.copy())
+        grid = engine.advance(grid, 1)
+    return finish_history(history)
+
+
+@traced()
+def simulate_life_tiled(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False,
+                        history_dir: Path = None,
+                        tile_size: int = 128, active_log: Path = None, seed: int = None):
+    """
+    Run a Game of Life simulation that only recomputes active tiles.
+
+    Uses a TiledLifeStepper: tiles that did not change in the previous
+    generation, and whose neighbours did not either, are skipped. The
+    fraction of active tiles per generation is summarised at the end.
+
+    Args:
+        N (int): Grid dimension (N × N).
+        timesteps (int): Number of generations to simulate.
+        p_alive (float): Probability that a cell starts alive.
+        record_history (bool): If True, collect each generation in a list.
+        history_dir (Path): If given, stream recorded generations to this
+            on-disk store instead of a list.
+        tile_size (int): Side length of the square tiles, in cells.
+        active_log (Path): Optional CSV file for the per-generation active fractions.
+        seed (int): Seed for the initial grid (see initial_conditions.py).
+
+    Returns:
+        list[np.ndarray], HistoryStore or None: History of grids if record_history else None.
+    """
+    grid = random_grid(N, p_alive=p_alive, seed=seed)
+    stepper = TiledLifeStepper(grid, tile_size=tile_size)
+    del grid
+    history = open_history(record_history, (N, N), history_dir)
+    for _ in range(timesteps):
+        if record_history:
+            history.append(stepper.grid.copy())
+        stepper.step()
+    report_active_fractions(stepper.active_fractions, "[Tiled]", active_log)
+    return finish_history(history)
+
+
+@traced()
+def simulate_life_ensemble(B: int, N: int, timesteps: int, p_alive=0.2, seeds=None) -> np.ndarray:
+    """
+    Run B independent Game of Life simulations as one (B, N, N) stack.
+
+    All members are stepped together by a single LifeStepper, so every
+    generation is one vectorised pass over the whole stack instead of B
+    separate Python-level loops. Only the population of each member is kept
+    per generation, not the grids.
+
+    Args:
+        B (int): Number of ensemble members.
+        N (int): Grid dimension of every member (N × N).
+        timesteps (int): Number of generations to simulate.
+        p_alive (float or sequence of float): Alive probability, either one
+            value for all members or one value per member.
+        seeds (None, int or sequence of int): Per-member seeds, each used as
+            in random_grid. An int is used as the root of a SeedSequence
+            spawned into B member seeds; None draws fresh entropy.
+
+    Returns:
+        np.ndarray: int64 array of shape (B, timesteps + 1) with the
+        population of each member at generations 0 .. timesteps.
+    """
+    p_alive = np.broadcast_to(np.asarray(p_alive, dtype=float), (B,))
+    if seeds is None or np.isscalar(seeds):
+        seeds = np.random.SeedSequence(seeds).spawn(B)
+    elif len(seeds) != B:
+        raise ValueError(f"expected {B} seeds, got {len(seeds)}")
+
+    grids = np.empty((B, N, N), dtype=np.uint8)
+    for b in range(B):
+        random_grid(N, p_alive=p_alive[b], seed=seeds[b], out=grids[b])
+    stepper = LifeStepper(grids)
+    del grids
+
+    population = np.empty((B, timesteps + 1), dtype=np.int64)
+    for t in range(timesteps):
+        population[:, t] = np.count_nonzero(stepper.grid, axis=(1, 2))
+        stepper.step()
+    population[:, timesteps] = np.count_nonzero(stepper.grid, axis=(1, 2))
+    return population
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 3) Animation/export
 # ─────────────────────────────────────────────────────────────────────────────
 
-def animate_life(history, output_file: Path, interval: int = 200, dpi: int = 80):
+def animate_life(history, output_file: Path, interval: int = 200, dpi: int = 80,
+                 encoder: str = "matplotlib"):
     """
     Create and save a GIF animation of the Game of Life history.
 
-    Uses matplotlib’s FuncAnimation and the pillow writer.
+    Draws each grid into a matplotlib figure and grabs it with the pillow
+    writer, or with encoder="direct" uses a DirectFrameWriter
+    (frame_encoder.py) that encodes the grids as two-colour images without
+    drawing a figure. Grids are read one at a time by index, so a
+    HistoryStore is never loaded as a whole. Only the direct encoder writes
+    GIF frames as they arrive, though: the pillow writer keeps every rendered
+    frame until finish(), so the matplotlib path grows with the run length.
 
     Args:
-        history (list[np.ndarray]): List of 2D grids to animate.
+        history (list[np.ndarray] or HistoryStore): Sequence of 2D grids to animate.
         output_file (Path): Path for the output GIF file.
         interval (int): Delay between frames in ms.
         dpi (int): Resolution of the saved animation.
+        encoder (str): "matplotlib" or "direct".
     """
-    
+    if encoder == "direct":
+        # Same 6-inch frame as the figure below
+        with DirectFrameWriter(output_file, fps=1000 / interval, max_display=6 * dpi) as writer:
+            for idx in range(len(history)):
+                writer.write_frame(history[idx])
+        return
+
+    import matplotlib.pyplot as plt
+    import matplotlib.animation as animation
 
     fig, ax = plt.subplots(figsize=(6, 6))
     im = ax.imshow(history[0], cmap='binary')
     ax.set_axis_off()
 
-    def _update(idx):
-        im.set_data(history[idx])
-        return [im]
-
-    anim = animation.FuncAnimation(
-        fig, _update,
-        frames=len(history),
-        interval=interval,
-        blit=True
-    )
-    anim.save(str(output_file), writer='pillow', dpi=dpi)
-    plt.close(fig)
+    # Grab frames ourselves rather than through FuncAnimation, reading one grid at a time
+    writer = animation.PillowWriter(fps=1000 / interval)
+    writer.setup(fig, str(output_file), dpi=dpi)
+    try:
+        for idx in range(len(history)):
+            im.set_data(history[idx])
+            writer.grab_frame()
+        writer.finish()
+    finally:
+        plt.close(fig)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 4) CLI entry-points (only --size, --timesteps, --save-gif)
 # ─────────────────────────────────────────────────────────────────────────────
 
+def run_planned(label: str, backend: str, args, simulate, output: Path, name: str):
+    """
+    Run a simulation within the --max-memory plan and save the GIF if asked.
+
+    Shared by the run_life_* entry points: plans where the history goes,
+    runs the simulation, animates the history when --save-gif is set and
+    removes a temporary history store afterwards.
+
+    Args:
+        label (str): Prefix of the printed messages, e.g. "[NumPy]".
+        backend (str): Backend key passed to plan_life_run.
+        args (argparse.Namespace): Parsed arguments with size, timesteps,
+            save_gif, encoder, history_dir and max_memory.
+        simulate (callable): simulate(record_history, history_dir) runs the
+            simulation and returns its history.
+        output (Path): Path of the GIF.
+        name (str): Backend name in the "Saved ... GIF" message.
+    """
+    plan = plan_life_run(backend, args.size, args.timesteps,
+                         args.max_memory, args.save_gif, args.encoder, args.history_dir)
+    if args.max_memory is not None:
+        report_plan(label, plan)
+    record = plan["record"]
+    try:
+        history = simulate(record, plan["history_dir"])
+
+        if args.save_gif:
+            if record:
+                animate_life(history, output, encoder=plan["encoder"])
+                print(f"Saved {name} GIF to {output}")
+            else:
+                reason = "does not fit --max-memory" if args.max_memory is not None else "size > 100 (use --history-dir)"
+                print(f"{label} History {reason}: cannot save history or create GIF.")
+        else:
+            print(f"{label} GIF creation skipped; history not saved.")
+
+        if args.max_memory is not None:
+            report_actual(label, plan)
+    finally:
+        remove_temporary_history(plan)
+
+
 def run_life_numpy():
     """
     Command‐line entry for NumPy-based Game of Life.
 
-    Parses --size, --timesteps, and --save-gif; runs simulation and optionally saves GIF.
+    Parses --size, --timesteps, --save-gif, --seed and --engine; runs simulation and
+    optionally saves GIF. `--engine hashlife` uses the memoised quadtree engine,
+    `--engine tiled` only recomputes active tiles (see --tile-size, --active-log).
+    `--on-cycle` ends the run early once the grid enters a cycle. `--workers`
+    and `--on-cycle` need `--engine numpy` and `--active-log` needs `--engine
+    tiled`; combining them with another engine is an error.
     """
     p = argparse.ArgumentParser("Game of Life (NumPy)")
     p.add_argument("--size",      type=int, default=100, help="Grid dimension (N×N)")
     p.add_argument("--timesteps", type=int, default=50,  help="Number of generations")
     p.add_argument("--save-gif",  action="store_true",   help="Save GIF animation")
+    p.add_argument("--history-dir", type=Path, default=None,
+                   help="Stream the history to this on-disk store (allows GIFs above size 100)")
+    p.add_argument("--encoder",   choices=ENCODERS, default="matplotlib",
+                   help="GIF encoder: matplotlib figures or direct palette frames")
+    p.add_argument("--seed",      type=int, default=None, help="Seed for the initial grid")
+    p.add_argument("--max-memory", type=parse_memory, default=None,
+                   help="Memory budget (e.g. 4G): record history in memory, on disk or not at all to fit")
+    p.add_argument("--engine",    choices=["numpy", "hashlife", "tiled"], default="numpy",
+                   help="Stepping engine")
+    p.add_argument("--tile-size", type=int, default=128,  help="Tile side for --engine tiled")
+    p.add_argument("--active-log", type=Path, default=None,
+                   help="CSV of per-generation active-tile fractions (--engine tiled)")
+    p.add_argument("--workers",   type=int, default=1,   help="Row bands stepped in parallel (--engine numpy)")
+    p.add_argument("--executor",  choices=["thread", "process"], default="thread",
+                   help="Pool type used when --workers > 1")
+    p.add_argument("--on-cycle",  choices=ON_CYCLE_CHOICES, default=None,
+                   help="Stop or fast-forward once the grid repeats (--engine numpy)")
+    p.add_argument("--max-period", type=int, default=64, help="Longest cycle period detected")
     args = p.parse_args()
+    if args.engine != "numpy":
+        if args.workers != 1:
+            p.error(f"--workers is only supported with --engine numpy, not {args.engine}")
+        if args.on_cycle is not None:
+            p.error(f"--on-cycle is only supported with --engine numpy, not {args.engine}")
+    if args.engine != "tiled" and args.active_log is not None:
+        p.error(f"--active-log is only supported with --engine tiled, not {args.engine}")
 
     print(f"[NumPy] Args received: {args}")
-    record = args.save_gif and args.size <= 100
-    history = simulate_life_numpy(args.size, args.timesteps, record_history=record)
-
-    if args.save_gif:
-        if record:
-            output = Path("game_of_life_cpu.gif")
-            animate_life(history, output)
-            print(f"Saved CPU GIF to {output}")
-        else:
-            print("[NumPy] Problem size > 100: cannot save history or create GIF.")
-    else:
-        print("[NumPy] GIF creation skipped; history not saved.")
+    def simulate(record_history, history_dir):
+        if args.engine == "hashlife":
+            return simulate_life_hashlife(args.size, args.timesteps, record_history=record_history,
+                                          history_dir=history_dir, seed=args.seed)
+        if args.engine == "tiled":
+            return simulate_life_tiled(args.size, args.timesteps, record_history=record_history,
+                                       history_dir=history_dir,
+                                       tile_size=args.tile_size, active_log=args.active_log,
+                                       seed=args.seed)
+        return simulate_life_numpy(args.size, args.timesteps, record_history=record_history,
+                                   history_dir=history_dir,
+                                   workers=args.workers, executor=args.executor,
+                                   on_cycle=args.on_cycle, max_period=args.max_period,
+                                   seed=args.seed)
+
+    run_planned("[NumPy]", args.engine, args, simulate, Path("game_of_life_cpu.gif"), "CPU")
 
 
 def run_life_cupy():
@@ -261,21 +711,25 @@ def run_life_cupy():
     p.add_argument("--size",      type=int, default=100, help="Grid dimension (N×N)")
     p.add_argument("--timesteps", type=int, default=50,  help="Number of generations")
     p.add_argument("--save-gif",  action="store_true",   help="Save GIF animation")
+    p.add_argument("--history-dir", type=Path, default=None,
+                   help="Stream the history to this on-disk store (allows GIFs above size 100)")
+    p.add_argument("--encoder",   choices=ENCODERS, default="matplotlib",
+                   help="GIF encoder: matplotlib figures or direct palette frames")
+    p.add_argument("--seed",      type=int, default=None, help="Seed for the initial grid")
+    p.add_argument("--max-memory", type=parse_memory, default=None,
+                   help="Memory budget (e.g. 4G): record history in memory, on disk or not at all to fit")
     args = p.parse_args()
+    try:
+        require_cupy()
+    except (ImportError, RuntimeError) as exc:
+        p.error(str(exc))
 
     print(f"[CuPy] Args received: {args}")
-    record = args.save_gif and args.size <= 100
-    history = simulate_life_cupy(args.size, args.timesteps, record_history=record)
-
-    if args.save_gif:
-        if record:
-            output = Path("game_of_life_gpu.gif")
-            animate_life(history, output)
-            print(f"Saved GPU GIF to {output}")
-        else:
-            print("[CuPy] Problem size > 100: cannot save history or create GIF.")
-    else:
-        print("[CuPy] GIF creation skipped; history not saved.")
+    run_planned("[CuPy]", "cupy", args,
+                lambda record_history, history_dir: simulate_life_cupy(
+                    args.size, args.timesteps, record_history=record_history,
+                    history_dir=history_dir, seed=args.seed),
+                Path("game_of_life_gpu.gif"), "GPU")
 
 
 def run_life_naive():
@@ -288,18 +742,146 @@ def run_life_naive():
     p.add_argument("--size",      type=int, default=100, help="Grid dimension (N×N)")
     p.add_argument("--timesteps", type=int, default=50,  help="Number of generations")
     p.add_argument("--save-gif",  action="store_true",   help="Save GIF animation")
+    p.add_argument("--history-dir", type=Path, default=None,
+                   help="Stream the history to this on-disk store (allows GIFs above size 100)")
+    p.add_argument("--encoder",   choices=ENCODERS, default="matplotlib",
+                   help="GIF encoder: matplotlib figures or direct palette frames")
+    p.add_argument("--seed",      type=int, default=None, help="Seed for the initial grid")
+    p.add_argument("--max-memory", type=parse_memory, default=None,
+                   help="Memory budget (e.g. 4G): record history in memory, on disk or not at all to fit")
     args = p.parse_args()
 
     print(f"[Naive] Args received: {args}")
-    record = args.save_gif and args.size <= 100
-    history = simulate_life_naive(args.size, args.timesteps, record_history=record)
-
-    if args.save_gif:
-        if record:
-            output = Path("game_of_life_naive.gif")
-            animate_life(history, output)
-            print(f"Saved Naive GIF to {output}")
-        else:
-            print("[Naive] Problem size > 100: cannot save history or create GIF.")
+    run_planned("[Naive]", "naive", args,
+                lambda record_history, history_dir: simulate_life_naive(
+                    args.size, args.timesteps, record_history=record_history,
+                    history_dir=history_dir, seed=args.seed),
+                Path("game_of_life_naive.gif"), "Naive")
+
+
+def run_life_bitpacked():
+    """
+    Command‐line entry for the bit-packed NumPy Game of Life.
+
+    Same CLI interface, stores 64 cells per uint64 word.
+    """
+    p = argparse.ArgumentParser("Game of Life (Bit-packed)")
+    p.add_argument("--size",      type=int, default=100, help="Grid dimension (N×N)")
+    p.add_argument("--timesteps", type=int, default=50,  help="Number of generations")
+    p.add_argument("--save-gif",  action="store_true",   help="Save GIF animation")
+    p.add_argument("--history-dir", type=Path, default=None,
+                   help="Stream the history to this on-disk store (allows GIFs above size 100)")
+    p.add_argument("--encoder",   choices=ENCODERS, default="matplotlib",
+                   help="GIF encoder: matplotlib figures or direct palette frames")
+    p.add_argument("--seed",      type=int, default=None, help="Seed for the initial grid")
+    p.add_argument("--max-memory", type=parse_memory, default=None,
+                   help="Memory budget (e.g. 4G): record history in memory, on disk or not at all to fit")
+    args = p.parse_args()
+
+    print(f"[Bit-packed] Args received: {args}")
+    run_planned("[Bit-packed]", "bitpacked", args,
+                lambda record_history, history_dir: simulate_life_bitpacked(
+                    args.size, args.timesteps, record_history=record_history,
+                    history_dir=history_dir, seed=args.seed),
+                Path("game_of_life_bitpacked.gif"), "Bit-packed")
+
+
+def run_life():
+    """
+    Command‐line entry that runs the backend chosen with --backend.
+
+    `--backend auto` (the default) runs the backend with the shortest
+    predicted time for this --size and --timesteps, from the throughput
+    curves cached for this host by backend_calibration.py; a host that has
+    not been calibrated uses NumPy. Otherwise the same CLI as run_life_numpy.
+    """
+    try:
+        from .backend_calibration import GOL_BACKENDS, choose_backend, report_choice
+    except ImportError:  # executed from within the scripts directory
+        from backend_calibration import GOL_BACKENDS, choose_backend, report_choice
+
+    p = argparse.ArgumentParser("Game of Life")
+    p.add_argument("--backend",   choices=["auto", *GOL_BACKENDS], default="auto",
+                   help="Backend, or auto to choose from this host's calibration")
+    p.add_argument("--size",      type=int, default=100, help="Grid dimension (N×N)")
+    p.add_argument("--timesteps", type=int, default=50,  help="Number of generations")
+    p.add_argument("--save-gif",  action="store_true",   help="Save GIF animation")
+    p.add_argument("--history-dir", type=Path, default=None,
+                   help="Stream the history to this on-disk store (allows GIFs above size 100)")
+    p.add_argument("--encoder",   choices=ENCODERS, default="matplotlib",
+                   help="GIF encoder: matplotlib figures or direct palette frames")
+    p.add_argument("--seed",      type=int, default=None, help="Seed for the initial grid")
+    p.add_argument("--max-memory", type=parse_memory, default=None,
+                   help="Memory budget (e.g. 4G): record history in memory, on disk or not at all to fit")
+    args = p.parse_args()
+
+    print(f"[Auto] Args received: {args}")
+    backend = args.backend
+    if backend == "auto":
+        backend, predictions = choose_backend("gol", args.size * args.size, args.timesteps)
+        report_choice("[Auto]", backend, predictions)
+    elif backend == "cupy":
+        try:
+            require_cupy()
+        except (ImportError, RuntimeError) as exc:
+            p.error(str(exc))
+
+    if backend == "jit":
+        try:
+            from .game_of_life_jit import simulate_life_jit
+        except ImportError:  # executed from within the scripts directory
+            from game_of_life_jit import simulate_life_jit
     else:
-        print("[Naive] GIF creation skipped; history not saved.")
+        simulate_life_jit = None
+    simulators = {
+        "numpy": simulate_life_numpy,
+        "multicore": simulate_life_numpy,
+        "tiled": simulate_life_tiled,
+        "bitpacked": simulate_life_bitpacked,
+        "jit": simulate_life_jit,
+        "naive": simulate_life_naive,
+        "cupy": simulate_life_cupy,
+    }
+    options = GOL_BACKENDS[backend][1]  # e.g. workers for multicore
+
+    run_planned("[Auto]", "numpy" if backend == "multicore" else backend, args,
+                lambda record_history, history_dir: simulators[backend](
+                    args.size, args.timesteps, record_history=record_history,
+                    history_dir=history_dir, seed=args.seed, **options),
+                Path(f"game_of_life_{backend}.gif"), backend)
+
+
+def run_life_ensemble():
+    """
+    Command‐line entry for a batched ensemble of NumPy Game of Life runs.
+
+    Runs --members grids for every --p-alive value in one (B, N, N) stack,
+    writes the population time series to a CSV (one row per member and
+    generation) and prints the mean final population per p_alive.
+    """
+    p = argparse.ArgumentParser("Game of Life (Ensemble)")
+    p.add_argument("--size",      type=int,   default=64,   help="Grid dimension of each member (N×N)")
+    p.add_argument("--timesteps", type=int,   default=500,  help="Number of generations")
+    p.add_argument("--p-alive",   type=float, nargs="+", default=[0.2], help="Alive probabilities to sweep")
+    p.add_argument("--members",   type=int,   default=100,  help="Members per p_alive value")
+    p.add_argument("--seed",      type=int,   default=None, help="Root seed for the member seeds")
+    p.add_argument("--output",    type=Path,  default=Path("gol_ensemble_population.csv"),
+                   help="CSV of per-member population time series")
+    args = p.parse_args()
+
+    print(f"[Ensemble] Args received: {args}")
+    p_alive = np.repeat(args.p_alive, args.members)
+    population = simulate_life_ensemble(len(p_alive), args.size, args.timesteps, p_alive, seeds=args.seed)
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["member", "p_alive", "generation", "population"])
+        for member, series in enumerate(population):
+            for generation, count in enumerate(series):
+                writer.writerow([member, p_alive[member], generation, count])
+    print(f"Saved population time series to {args.output}")
+
+    final = population[:, -1].reshape(len(args.p_alive), args.members)
+    print(f"{'p_alive':>8} {'mean final':>11} {'std':>9}")
+    for value, row in zip(args.p_alive, final):
+        print(f"{value:>8.3f} {row.mean():>11.1f} {row.std():>9.1f}")
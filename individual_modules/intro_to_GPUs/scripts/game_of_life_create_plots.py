@@ -1,14 +1,18 @@
 """
 Aggregate and Visualize Game of Life Benchmark Results
 
-This script loads all benchmarking CSV files matching '../output/gol_timings_*.csv',
-processes hardware and method metadata, and generates publication-quality plots:
+This script queries the benchmark results database (results_db.py) for the
+latest result of every hardware, method and grid size, optionally restricted
+to some methods, timesteps or a code revision, processes hardware and method
+metadata, and generates publication-quality plots:
   1. Performance of each method across different hardware.
   2. Performance of each hardware combination across methods.
   3. Combined overview of all methods and hardware.
 
 Key steps:
-- Load and concatenate CSV data into a pandas DataFrame.
+- Import any new '../output/gol_timings_*.csv' files into the database
+  (files already imported are skipped), then query the slice to plot into a
+  pandas DataFrame.
 - Map raw GPU/CPU strings to concise, human-readable labels.
 - Define marker, color, and linestyle mappings for clarity.
 - Plot with matplotlib, saving PNGs to '../output'.
@@ -18,15 +22,42 @@ Key steps:
 # Library imports
 # ─────────────────────────────────────────────────────────────────────────────
 
-import os, glob, re
+import argparse, os, glob, re
 import pandas as pd
 import matplotlib.pyplot as plt
 
+try:
+    from .results_db import DEFAULT_DB, connect, import_csv, query_results
+except ImportError:  # executed from within the scripts directory
+    from results_db import DEFAULT_DB, connect, import_csv, query_results
+
 # ─────────────────────────────────────────────────────────────────────────────
-# 1) Load all benchmark CSV files into one DataFrame
+# 1) Query the results to plot into one DataFrame
 # ─────────────────────────────────────────────────────────────────────────────
-files = glob.glob('../output/gol_timings_*.csv')
-df = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
+def load_results(db, methods=None, timesteps=None, revision=None):
+    """
+    Import new benchmark CSV files and query the slice to plot.
+
+    Every '../output/gol_timings_*.csv' file is offered to the database on
+    each run; files (and experiment runs) already stored are recognised by
+    their content hash and skipped, so new files and files copied from
+    other hosts are always included.
+
+    Args:
+        db: Path of the results database.
+        methods: Optional list of method names to plot.
+        timesteps: Optional list of timestep counts to plot.
+        revision: Optional code revision to restrict the runs to.
+
+    Returns:
+        The latest result per hardware, method, grid size and timesteps as a DataFrame.
+    """
+    connection = connect(db)
+    for f in sorted(glob.glob('../output/gol_timings_*.csv')):
+        import_csv(connection, f)
+    df = pd.DataFrame(query_results(connection, methods=methods, timesteps=timesteps, revision=revision))
+    connection.close()
+    return df
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 2) Define plotting markers for each method
@@ -35,6 +66,9 @@ marker_map = {
     'naive': 's',
     'numpy': 'o',
     'cupy': '^',
+    'jit loop': 'D',
+    'bit-packed': 'v',
+    'tiled': 'P',
 }
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -86,26 +120,37 @@ def base_method(method_str):
 # ─────────────────────────────────────────────────────────────────────────────
 # 4) Build style map for each unique (GPU, CPU) combination
 # ─────────────────────────────────────────────────────────────────────────────
-combos = df[['gpu','cpu']].drop_duplicates().values.tolist()
 
 # Color-blind safe palette (Paul Tol six):
 colors = ['#4477AA', '#EE6677', '#228833', '#CCBB44', '#66CCEE', '#AA3377']
 # Linestyles for up to 6 combos:
 linestyles = ['-', '--', '-.', ':', (0, (1,1)), (0, (5,1))]
 
-style_map = {}
-for idx, (gpu, cpu) in enumerate(combos):
-    style_map[(gpu, cpu)] = {
-        'color':     colors[idx % len(colors)],
-        'linestyle': linestyles[idx % len(linestyles)]
-    }
-
 legend_kwargs = dict(fontsize='small')
 
+def build_style_map(df):
+    """
+    Assign a color and linestyle to each (GPU, CPU) combination in the results.
+
+    Args:
+        df: DataFrame of results with 'gpu' and 'cpu' columns.
+
+    Returns:
+        Dict mapping (gpu, cpu) to matplotlib line style keyword arguments.
+    """
+    combos = df[['gpu','cpu']].drop_duplicates().values.tolist()
+    style_map = {}
+    for idx, (gpu, cpu) in enumerate(combos):
+        style_map[(gpu, cpu)] = {
+            'color':     colors[idx % len(colors)],
+            'linestyle': linestyles[idx % len(linestyles)]
+        }
+    return style_map
+
 # ─────────────────────────────────────────────────────────────────────────────
 # 5) Plotting helper function
 # ─────────────────────────────────────────────────────────────────────────────
-def make_plot(grouped, title, fname, legend_args):
+def make_plot(grouped, title, fname, legend_args, style_map):
     """
     Generate and save a line plot with error bars for grouped benchmark data.
 
@@ -114,6 +159,7 @@ def make_plot(grouped, title, fname, legend_args):
         title:   Title string for the plot.
         fname:   Filename (PNG) to save under '../output/'.
         legend_args: Extra arguments for ax.legend().
+        style_map: Output of build_style_map().
     """
     fig, ax = plt.subplots(figsize=(8,6))
 
@@ -144,46 +190,68 @@ def make_plot(grouped, title, fname, legend_args):
     plt.close(fig)
 
 # ─────────────────────────────────────────────────────────────────────────────
-# 6) Generate plots: method-specific across hardware
+# 6) Generate the plots
 # ─────────────────────────────────────────────────────────────────────────────
-for method in df['method'].unique():
-    sub = df[df['method']==method].sort_values('grid_size')
-    grp = sub.groupby(['gpu','cpu','method'])
-    make_plot(
-        grp,
-        title=f"{base_method(method)} Across Hardware",
-        fname=f"{base_method(method).lower()}_across_hardware.png",
-        legend_args={'loc':'best', 'ncol':1}
-    )
+def main():
+    """
+    Plot the queried results: each method across hardware, each hardware
+    combination across methods, and everything combined.
+    """
+    parser = argparse.ArgumentParser(description="Plot Game of Life benchmark results")
+    parser.add_argument('--db', default=str(DEFAULT_DB), help="Results database (SQLite)")
+    parser.add_argument('--methods', nargs='+', default=None, help="Only these methods, e.g. 'NumPy (CPU)'")
+    parser.add_argument('--timesteps', type=int, nargs='+', default=None, help="Only these timestep counts")
+    parser.add_argument('--revision', default=None, help="Only runs of this code revision")
+    args = parser.parse_args()
 
-# ─────────────────────────────────────────────────────────────────────────────
-# 7) Hardware-specific across methods
-# ─────────────────────────────────────────────────────────────────────────────
-for (gpu,cpu), sub in df.groupby(['gpu','cpu']):
-    grp = sub.sort_values('grid_size').groupby(['gpu','cpu','method'])
-    cpu_s = cpu.lower().replace(' ','_').replace('/','_')
-    gpu_s = short_gpu(gpu).replace(' ','_').lower()
+    df = load_results(args.db, args.methods, args.timesteps, args.revision)
+    if df.empty:
+        raise SystemExit(f"No results in {args.db} match the query; "
+                         "import CSV files with `python results_db.py import ...`")
+    style_map = build_style_map(df)
+
+    # Generate plots: method-specific across hardware
+    for method in df['method'].unique():
+        sub = df[df['method']==method].sort_values('grid_size')
+        grp = sub.groupby(['gpu','cpu','method'])
+        make_plot(
+            grp,
+            title=f"{base_method(method)} Across Hardware",
+            fname=f"{base_method(method).lower()}_across_hardware.png",
+            legend_args={'loc':'best', 'ncol':1},
+            style_map=style_map
+        )
+
+    # Hardware-specific across methods
+    for (gpu,cpu), sub in df.groupby(['gpu','cpu']):
+        grp = sub.sort_values('grid_size').groupby(['gpu','cpu','method'])
+        cpu_s = cpu.lower().replace(' ','_').replace('/','_')
+        gpu_s = short_gpu(gpu).replace(' ','_').lower()
+        make_plot(
+            grp,
+            title=f"{short_cpu(cpu)} + {short_gpu(gpu)}",
+            fname=f"perf_{cpu_s}_{gpu_s}.png",
+            legend_args={'loc':'best', 'ncol':1},
+            style_map=style_map
+        )
+
+    # Combined plot of all methods & hardware
+    grp_all = df.sort_values(['gpu','cpu','method','grid_size'])\
+                .groupby(['gpu','cpu','method'])
     make_plot(
-        grp,
-        title=f"{short_cpu(cpu)} + {short_gpu(gpu)}",
-        fname=f"perf_{cpu_s}_{gpu_s}.png",
-        legend_args={'loc':'best', 'ncol':1}
+        grp_all,
+        title="All Methods & Hardware",
+        fname="all_methods_hardware.png",
+        legend_args={
+            'loc':'center left',
+            'bbox_to_anchor':(1,0.5),
+            'ncol':1
+        },
+        style_map=style_map
     )
 
-# ─────────────────────────────────────────────────────────────────────────────
-# 8) Combined plot of all methods & hardware
-# ─────────────────────────────────────────────────────────────────────────────
-grp_all = df.sort_values(['gpu','cpu','method','grid_size'])\
-            .groupby(['gpu','cpu','method'])
-make_plot(
-    grp_all,
-    title="All Methods & Hardware",
-    fname="all_methods_hardware.png",
-    legend_args={
-        'loc':'center left',
-        'bbox_to_anchor':(1,0.5),
-        'ncol':1
-    }
-)
-
-print("All plots saved to ../output") 
+    print("All plots saved to ../output")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmarking GIF Frame Encoders for the Game of Life
+
+This script compares, for a range of grid sizes, the two ways
+simulate_and_animate (game_of_life_mem_opt.py) can write frames:
+  - matplotlib: imshow figure + PillowWriter.grab_frame per generation
+  - direct:     DirectFrameWriter, two-colour palette frames streamed
+                into a GIF without matplotlib
+
+For each grid size it:
+  1. Precomputes the generations with a LifeStepper, so only encoding is timed.
+  2. Encodes them with each writer at the same output size and measures
+     frames per second (including finalising the file).
+  3. Writes the results to a CSV in ../output and prints a summary table.
+"""
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Library imports
+# ─────────────────────────────────────────────────────────────────────────────
+import csv
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import matplotlib.animation as animation
+
+from frame_encoder import DirectFrameWriter
+from life_stepper import LifeStepper
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Ensure output directory exists
+out_dir = "../output"
+os.makedirs(out_dir, exist_ok=True)
+
+max_display = 1080
+dpi = 180
+interval_ms = 200
+
+
+def make_frames(size, n_frames):
+    """
+    Downsampled generations of a random soup, as simulate_and_animate shows them.
+    """
+    rng = np.random.default_rng(0)
+    stepper = LifeStepper(rng.random((size, size)) < 0.2)
+    step = 1 if max_display >= size else max(1, size // max_display)
+    frames = []
+    for _ in range(n_frames):
+        frames.append(stepper.grid[::step, ::step].copy())
+        stepper.step()
+    return frames
+
+
+def encode_matplotlib(frames, output_file):
+    """
+    Encode frames with the figure-based path of simulate_and_animate.
+    """
+    width_in = max_display / dpi
+    fig = plt.figure(figsize=(width_in, width_in), frameon=False)
+    fig.patch.set_visible(False)
+    ax = fig.add_axes([0, 0, 1, 1], frameon=False)
+    ax.set_axis_off()
+    im = ax.imshow(frames[0], cmap='binary', vmin=0, vmax=1, interpolation='nearest')
+    writer = animation.PillowWriter(fps=1000 / interval_ms)
+    writer.setup(fig, str(output_file), dpi=dpi)
+    for frame in frames:
+        im.set_data(frame)
+        writer.grab_frame()
+    writer.finish()
+    plt.close(fig)
+
+
+def encode_direct(frames, output_file):
+    """
+    Encode frames with DirectFrameWriter.
+    """
+    with DirectFrameWriter(output_file, fps=1000 / interval_ms, max_display=max_display) as writer:
+        for frame in frames:
+            writer.write_frame(frame)
+
+
+def run_experiment():
+    """
+    Measure frames per second of both encoders for every grid size.
+    """
+    grid_sizes = [100, 500, 1000, 4000]
+    n_frames = 50
+
+    csv_filename = os.path.join(out_dir, f"gol_encoder_fps_frames{n_frames}.csv")
+    with open(csv_filename, "w", newline="") as f, tempfile.TemporaryDirectory() as tmp:
+        writer = csv.writer(f)
+        writer.writerow(["encoder", "grid_size", "n_frames", "seconds", "fps", "file_bytes"])
+
+        print(f"{'encoder':<12} {'size':>6} {'fps':>10} {'file KiB':>10}")
+        for size in grid_sizes:
+            frames = make_frames(size, n_frames)
+            for name, encode in (("matplotlib", encode_matplotlib), ("direct", encode_direct)):
+                output = Path(tmp) / f"{name}_{size}.gif"
+                t0 = time.perf_counter()
+                encode(frames, output)
+                elapsed = time.perf_counter() - t0
+                fps = n_frames / elapsed
+                file_bytes = output.stat().st_size
+                writer.writerow([name, size, n_frames, f"{elapsed:.6f}", f"{fps:.2f}", file_bytes])
+                print(f"{name:<12} {size:>6} {fps:>10.1f} {file_bytes / 1024:>10.1f}")
+
+    print(f"Saved CSV: {csv_filename}")
+
+
+if __name__ == "__main__":
+    run_experiment()
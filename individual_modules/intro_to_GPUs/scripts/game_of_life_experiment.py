@@ -1,27 +1,50 @@
 """
 Benchmarking Game of Life Implementations Across Grid Sizes
 
-This script measures execution time for three versions of Conway’s Game
+This script measures execution time for four versions of Conway’s Game
 of Life:
   - NumPy (CPU vectorized)
   - CuPy (GPU-accelerated)
   - Naive Python (nested loops)
+  - JIT loop (Numba-compiled nested loops)
 
 For each combination of grid size and number of timesteps, it:
-  1. Runs each implementation multiple times.
-  2. Records mean and standard deviation of runtimes to a CSV.
+  1. Runs each implementation in-process with benchmark_harness: warmup
+     runs first, then timed runs with init, stepping and teardown measured
+     separately (--isolate runs each configuration in a fresh process).
+     The number of timed runs is adaptive: at least --repeats, then more
+     until the 95% confidence interval of the median is within --ci-target
+     of it or the --budget for the configuration is spent.
+  2. Records median, IQR, minimum, throughput (cell updates per second),
+     mean and standard deviation of runtimes, with the number of samples
+     kept and discarded as warmup outliers, to a CSV, and every timed run
+     to a JSON file next to it. For the JIT backend, the compilation time
+     is recorded in a separate column.
   3. Generates an error‐bar plot of time vs. grid size.
+  4. Records the run in the results database (results_db.py), keyed by the
+     hardware fingerprint and code revision.
+
+It then measures multi-core scaling of the NumPy backend (`--workers`) from
+1 worker up to the number of CPU cores, and writes a scaling table
+(stepping time, speedup, parallel efficiency) to a second CSV.
 """
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Library imports
 # ─────────────────────────────────────────────────────────────────────────────
-import subprocess
-import time
+import argparse
 import numpy as np
 import os
 import csv
-import matplotlib.pyplot as plt
+
+try:
+    from .benchmark_harness import run_case, sample_stats, summarise, write_csv, write_json
+    from . import results_db
+    from .hardware import get_cpu_name, get_gpu_name
+except ImportError:  # executed from within the scripts directory
+    from benchmark_harness import run_case, sample_stats, summarise, write_csv, write_json
+    import results_db
+    from hardware import get_cpu_name, get_gpu_name
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Constants
@@ -31,39 +54,15 @@ import matplotlib.pyplot as plt
 out_dir = "../output"
 os.makedirs(out_dir, exist_ok=True)
 
-def get_gpu_name():
-    """
-    Query the system GPU name via nvidia-smi.
-
-    Returns:
-        The first GPU’s name with spaces replaced by underscores, or
-        'Unknown_GPU' if the command fails.
-    """
-    try:
-        out = subprocess.check_output(
-            ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
-            stderr=subprocess.DEVNULL
-        ).decode().strip().splitlines()
-        return out[0]
-    except Exception:
-        return "Unknown_GPU"
-
-def get_cpu_name():
-    """
-    Query the CPU model name via lscpu (Linux).
-
-    Returns:
-        The CPU model string with spaces replaced by underscores, or
-        'Unknown_CPU' if detection fails.
-    """
-    try:
-        out = subprocess.check_output(["lscpu"], stderr=subprocess.DEVNULL).decode().splitlines()
-        for line in out:
-            if line.startswith("Model name:"):
-                return line.split(":", 1)[1].strip()
-    except Exception:
-        pass
-    return "Unknown_CPU"
+# Short method names used in the CSV filenames (formerly the entry-point suffixes)
+METHOD_IDS = {
+    "NumPy (CPU)": "cpu",
+    "CuPy (GPU)": "gpu",
+    "Naive (CPU)": "naive",
+    "JIT loop (CPU)": "jit",
+    "Bit-packed (CPU)": "bitpacked",
+    "Tiled (CPU)": "tiled",
+}
 
 def plot_timings(csv_filename):
     """
@@ -75,6 +74,9 @@ def plot_timings(csv_filename):
     Args:
         csv_filename: Path to the CSV file containing benchmark results.
     """
+    # Imported here so get_cpu_name/get_gpu_name can be used without matplotlib
+    import matplotlib.pyplot as plt
+
     data = {}
     timesteps = None
     with open(csv_filename, newline="") as f:
@@ -119,66 +121,153 @@ def plot_timings(csv_filename):
 # Main benchmarking loop
 # ─────────────────────────────────────────────────────────────────────────────
 
-gpu_name = get_gpu_name().replace(" ", "_")
-cpu_name = get_cpu_name().replace(" ", "_")
+def main():
+    """
+    Run the timing and scaling benchmarks in-process (see benchmark_harness.py).
 
-methods = {
-    "NumPy (CPU)": "game_of_life_cpu",
-    "CuPy (GPU)":  "game_of_life_gpu",
-    "Naive (CPU)": "game_of_life_naive",
-}
+    Flags:
+      --repeats:   Minimum timed repetitions per configuration
+      --ci-target: Relative width of the median's confidence interval to reach (0: exactly --repeats)
+      --budget:    Seconds per configuration after which sampling stops
+      --max-repeats: Upper bound on timed repetitions
+      --warmup:    Untimed repetitions run first (JIT compile, caches, CUDA context)
+      --isolate:   Run each configuration in a fresh worker process
+      --methods:   Subset of methods to benchmark
+      --no-scaling: Skip the multi-core scaling table
+      --db:        Results database the runs are recorded in
+      --no-db:     Do not record the runs in the database
+    """
+    p = argparse.ArgumentParser("Game of Life benchmarks")
+    p.add_argument("--repeats",   type=int, default=5, help="Minimum timed repetitions per configuration")
+    p.add_argument("--ci-target", type=float, default=0.05,
+                   help="Stop once the 95%% CI of the median is this fraction of it wide (0: fixed --repeats)")
+    p.add_argument("--budget",    type=float, default=60.0, help="Time budget per configuration in seconds")
+    p.add_argument("--max-repeats", type=int, default=200, help="Upper bound on timed repetitions")
+    p.add_argument("--warmup",    type=int, default=1, help="Untimed warmup repetitions")
+    p.add_argument("--isolate",   action="store_true", help="Fresh worker process per configuration")
+    p.add_argument("--methods",   nargs="+", default=["NumPy (CPU)", "CuPy (GPU)", "Naive (CPU)", "JIT loop (CPU)"],
+                   help="Methods to benchmark (names as in benchmark_harness.CASES)")
+    p.add_argument("--no-scaling", action="store_true", help="Skip the multi-core scaling benchmark")
+    p.add_argument("--db",        type=str, default=str(results_db.DEFAULT_DB), help="Results database (SQLite)")
+    p.add_argument("--no-db",     action="store_true", help="Do not record the runs in the results database")
+    args = p.parse_args()
+    sampling = dict(repeats=args.repeats, warmup=args.warmup, isolate=args.isolate,
+                    ci_target=args.ci_target or None, budget_sec=args.budget, max_repeats=args.max_repeats)
+
+    gpu_name = get_gpu_name().replace(" ", "_")
+    cpu_name = get_cpu_name().replace(" ", "_")
+
+    # Build an underscore-joined string of all method names, sorted for consistency
+    method_ids = "_".join(sorted(METHOD_IDS.get(name, name) for name in args.methods))
 
-# Build an underscore-joined string of all entry-point names, sorted for consistency
-clean_names = [v.replace("game_of_life_", "") for v in methods.values()]
-method_ids  = "_".join(sorted(clean_names))
+    #grid_sizes     = [50, 100, 250, 500, 1000]
+    grid_sizes     = [10, 25]
+    timesteps_list = [100]   # you can expand this list
 
-#grid_sizes     = [50, 100, 250, 500, 1000]
-grid_sizes     = [10, 25]
-timesteps_list = [100]   # you can expand this list
-repeats         = 3
+    # Compile once up front so the JIT row can report compilation separately
+    compile_time = {}
+    if "JIT loop (CPU)" in args.methods:
+        try:
+            from .game_of_life_jit import compile_life_step_jit
+        except ImportError:  # executed from within the scripts directory
+            from game_of_life_jit import compile_life_step_jit
+        compile_time["JIT loop (CPU)"] = compile_life_step_jit()
 
-for timesteps in timesteps_list:
-    # Filename now includes GPU, CPU, all methods, and timesteps
-    csv_filename = os.path.join(
+    for timesteps in timesteps_list:
+        # Filename now includes GPU, CPU, all methods, and timesteps
+        csv_filename = os.path.join(
+            out_dir,
+            f"gol_timings_{gpu_name}_{cpu_name}_{method_ids}_ts{timesteps}.csv"
+        )
+
+        print(f"\n==== Running benchmarks for {timesteps} timesteps ====")
+        records = []
+        for size in grid_sizes:
+            for method_name in args.methods:
+                runs = run_case(method_name, size, timesteps, **sampling)
+                records.extend(runs)
+                stats = sample_stats(runs)
+                print(f"  {method_name:<14} | {size:6}×{size:<6} | median {stats['median']:.6f} s, "
+                      f"IQR {stats['iqr']:.6f} s, min {stats['min']:.6f} s, "
+                      f"{stats['cell_updates_per_sec']:.3g} cells/s")
+                print(f"  {'':<14} | {stats['n_samples']} samples kept, {stats['n_discarded']} discarded "
+                      f"(stopped on {runs[0]['stop_reason']}, CI ±{50 * stats['median_ci_rel']:.1f}%)")
+
+        rows = summarise(records, gpu_name, cpu_name, compile_time)
+        write_csv(csv_filename, rows)
+        json_filename = os.path.splitext(csv_filename)[0] + ".json"
+        write_json(json_filename, records, gpu=gpu_name, cpu=cpu_name, compile_time_sec=compile_time)
+        print(f"Saved CSV: {csv_filename}")
+        print(f"Saved JSON: {json_filename}")
+
+        if not args.no_db:
+            connection = results_db.connect(args.db)
+            hardware = results_db.host_fingerprint()
+            revision = results_db.code_revision()
+            # Same source hash as an import of this CSV, so the plots do not import it twice
+            run_id = results_db.record_run(connection, rows, hardware, revision, records,
+                                           source=os.path.basename(csv_filename),
+                                           source_hash=results_db.csv_source_hash(csv_filename, cpu_name, gpu_name))
+            connection.close()
+            print(f"Recorded run {run_id} ({revision}, hardware {hardware['fingerprint']}) in {args.db}")
+
+        # Generate the plot from that CSV
+        plot_timings(csv_filename)
+
+    if not args.no_scaling:
+        run_scaling(cpu_name, sampling)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Multi-core scaling of the banded NumPy backend
+# ─────────────────────────────────────────────────────────────────────────────
+
+def run_scaling(cpu_name, sampling):
+    """
+    Time the NumPy backend with 1 .. cpu_count workers and write a scaling table.
+
+    The table uses the median stepping time of the kept samples.
+    """
+    max_workers      = os.cpu_count() or 1
+    worker_counts    = sorted({1, max_workers} | {2 ** k for k in range(max_workers.bit_length()) if 2 ** k <= max_workers})
+    scaling_size     = 2000
+    scaling_steps    = 100
+
+    scaling_csv = os.path.join(
         out_dir,
-        f"gol_timings_{gpu_name}_{cpu_name}_{method_ids}_ts{timesteps}.csv"
+        f"gol_scaling_{cpu_name}_size{scaling_size}_ts{scaling_steps}.csv"
     )
 
-    with open(csv_filename, "w", newline="") as f:
+    print(f"\n==== Scaling: {scaling_size}×{scaling_size}, {scaling_steps} timesteps ====")
+    scaling_rows = []
+    for workers in worker_counts:
+        runs = run_case("NumPy (CPU)", scaling_size, scaling_steps, workers=workers, **sampling)
+        # Scaling concerns the stepping only; init and teardown are serial
+        step_times = [r["step_ns"] / 1e9 for r in runs if not r["discarded"]]
+        q1, median, q3 = np.percentile(step_times, [25, 50, 75])
+        scaling_rows.append((workers, median, q3 - q1, len(step_times)))
+        print(f"  workers={workers:<4} | median {median:.4f} s over {len(step_times)} samples")
+
+    base_time = scaling_rows[0][1]
+    with open(scaling_csv, "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow([
-            "gpu", "cpu", "method",
-            "grid_size", "timesteps",
-            "mean_time_sec", "std_dev_sec"
+            "cpu", "workers", "grid_size", "timesteps",
+            "median_time_sec", "iqr_sec", "n_samples", "speedup", "efficiency"
         ])
+        print(f"\n{'workers':>8} {'time (s)':>10} {'speedup':>8} {'efficiency':>10}")
+        for workers, median_t, iqr_t, n_samples in scaling_rows:
+            speedup = base_time / median_t
+            efficiency = speedup / workers
+            writer.writerow([
+                cpu_name, workers, scaling_size, scaling_steps,
+                f"{median_t:.6f}", f"{iqr_t:.6f}", n_samples,
+                f"{speedup:.3f}", f"{efficiency:.3f}"
+            ])
+            print(f"{workers:>8} {median_t:>10.3f} {speedup:>8.2f} {efficiency:>10.1%}")
 
-        print(f"\n==== Running benchmarks for {timesteps} timesteps ====")
-        for size in grid_sizes:
-            for method_name, entry_point in methods.items():
-                run_times = []
-                for i in range(repeats):
-                    cmd = [
-                        "poetry", "run", entry_point,
-                        "--size", str(size),
-                        "--timesteps", str(timesteps)
-                    ]
-                    print(f"  {method_name:<12} | {size:6}×{size:<6} | run {i+1}/{repeats}")
-                    t0 = time.perf_counter()
-                    subprocess.run(cmd, check=True)
-                    t1 = time.perf_counter()
-                    run_times.append(t1 - t0)
-
-                mean_t = np.mean(run_times)
-                std_t  = np.std(run_times)
-                writer.writerow([
-                    gpu_name, cpu_name,
-                    method_name,
-                    size, timesteps,
-                    f"{mean_t:.6f}",
-                    f"{std_t:.6f}"
-                ])
-
-    print(f"Saved CSV: {csv_filename}")
-
-    # Generate the plot from that CSV
-    plot_timings(csv_filename)
+    print(f"Saved CSV: {scaling_csv}")
+
+
+if __name__ == "__main__":
+    main()
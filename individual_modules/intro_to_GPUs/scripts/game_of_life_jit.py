@@ -0,0 +1,163 @@
+"""
+JIT-compiled Loop Backend for Conway’s Game of Life
+
+This module keeps the explicit per-cell loop structure of life_step_naive,
+but compiles it to machine code with Numba:
+- @njit(parallel=True) with prange over rows, so rows run on all cores
+- in-place output into a preallocated buffer (two buffers are swapped)
+
+The first call triggers compilation, which is timed and reported separately
+from the stepping time.
+
+Entry point (via CLI):
+- run_life_jit()
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+from numba import njit, prange
+
+try:
+    from .game_of_life import run_planned
+    from .frame_encoder import ENCODERS
+    from .history_store import open_history, finish_history
+    from .initial_conditions import random_grid
+    from .memory_planner import parse_memory
+    from .span_timer import traced
+except ImportError:  # executed from within the scripts directory
+    from game_of_life import run_planned
+    from frame_encoder import ENCODERS
+    from history_store import open_history, finish_history
+    from initial_conditions import random_grid
+    from memory_planner import parse_memory
+    from span_timer import traced
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Core update function (compiled)
+# ─────────────────────────────────────────────────────────────────────────────
+
+@traced()
+@njit(parallel=True)
+def life_step_jit(grid, out):
+    """
+    Compute the next generation with a compiled nested-loop implementation.
+
+    Same loop structure and wrap-around as life_step_naive; rows are
+    distributed across threads with prange.
+
+    Args:
+        grid (np.ndarray): 2D uint8 array of 0s and 1s (current generation).
+        out (np.ndarray): 2D uint8 array of the same shape, overwritten with
+            the next generation.
+    """
+    N, M = grid.shape
+    for i in prange(N):
+        for j in range(M):
+            cnt = 0
+            for di in (-1, 0, 1):
+                for dj in (-1, 0, 1):
+                    if di == 0 and dj == 0:
+                        continue
+                    ni, nj = (i + di) % N, (j + dj) % M
+                    cnt += grid[ni, nj]
+            if grid[i, j] == 1:
+                out[i, j] = 1 if (cnt == 2 or cnt == 3) else 0
+            else:
+                out[i, j] = 1 if (cnt == 3) else 0
+
+
+def compile_life_step_jit() -> float:
+    """
+    Trigger compilation of life_step_jit on a tiny grid.
+
+    Returns:
+        float: Compilation time in seconds (close to zero if already compiled).
+    """
+    tiny = np.zeros((3, 3), dtype=np.uint8)
+    t0 = time.perf_counter()
+    life_step_jit(tiny, np.empty_like(tiny))
+    return time.perf_counter() - t0
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Simulation function (no animation)
+# ─────────────────────────────────────────────────────────────────────────────
+
+@traced()
+def simulate_life_jit(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False,
+                      history_dir: Path = None, seed: int = None):
+    """
+    Run a Game of Life simulation with the JIT-compiled loop backend.
+
+    Call compile_life_step_jit() first to keep compilation out of the timing.
+
+    Args:
+        N (int): Grid size.
+        timesteps (int): Number of generations.
+        p_alive (float): Starting alive probability.
+        record_history (bool): Whether to collect each generation.
+        history_dir (Path): If given, stream recorded generations to this
+            on-disk store instead of a list.
+        seed (int): Seed for the initial grid (see initial_conditions.py).
+
+    Returns:
+        list[np.ndarray], HistoryStore or None: Recorded history if requested.
+    """
+    grid = random_grid(N, p_alive=p_alive, seed=seed)
+    out = np.empty_like(grid)
+    history = open_history(record_history, (N, N), history_dir)
+    for _ in range(timesteps):
+        if record_history:
+            history.append(grid.copy())
+        life_step_jit(grid, out)
+        grid, out = out, grid
+    return finish_history(history)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3) CLI entry-point (only --size, --timesteps, --save-gif)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def run_life_jit():
+    """
+    Command‐line entry for the JIT-compiled loop Game of Life.
+
+    Same CLI interface as run_life_naive. Prints the compilation time and the
+    stepping time separately as `compile_time_sec=...` and `step_time_sec=...`.
+    """
+    p = argparse.ArgumentParser("Game of Life (JIT loop)")
+    p.add_argument("--size",      type=int, default=100, help="Grid dimension (N×N)")
+    p.add_argument("--timesteps", type=int, default=50,  help="Number of generations")
+    p.add_argument("--save-gif",  action="store_true",   help="Save GIF animation")
+    p.add_argument("--history-dir", type=Path, default=None,
+                   help="Stream the history to this on-disk store (allows GIFs above size 100)")
+    p.add_argument("--encoder",   choices=ENCODERS, default="matplotlib",
+                   help="GIF encoder: matplotlib figures or direct palette frames")
+    p.add_argument("--seed",      type=int, default=None, help="Seed for the initial grid")
+    p.add_argument("--max-memory", type=parse_memory, default=None,
+                   help="Memory budget (e.g. 4G): record history in memory, on disk or not at all to fit")
+    args = p.parse_args()
+
+    print(f"[JIT] Args received: {args}")
+    compile_time = compile_life_step_jit()
+
+    def simulate(record_history, history_dir):
+        t0 = time.perf_counter()
+        history = simulate_life_jit(args.size, args.timesteps, record_history=record_history,
+                                    history_dir=history_dir, seed=args.seed)
+        step_time = time.perf_counter() - t0
+        print(f"[JIT] compile_time_sec={compile_time:.6f} step_time_sec={step_time:.6f}")
+        return history
+
+    run_planned("[JIT]", "jit", args, simulate, Path("game_of_life_jit.gif"), "JIT")
+
+
+if __name__ == "__main__":
+    run_life_jit()
@@ -6,10 +6,23 @@ import resource      # For measuring CPU and memory usage
 from pathlib import Path  # For convenient file path handling
 
 import numpy as np                           # Numerical operations on arrays
-import matplotlib.pyplot as plt              # Plotting figures and images
-import matplotlib.animation as animation     # Creating animated GIFs
 from tqdm import tqdm                        # Progress bar for loops
 
+try:
+    from .life_stepper import LifeStepper, TiledLifeStepper, report_active_fractions
+    from .cycle_detection import CycleDetector, ON_CYCLE_CHOICES, extrapolate_counts, report_cycle
+    from .frame_encoder import DirectFrameWriter, FramePipeline, ENCODERS
+    from .initial_conditions import random_grid
+    from .checkpoint import save_checkpoint, load_checkpoint
+    from .memory_planner import parse_memory, plan_mem_opt_run, report_plan
+except ImportError:  # executed from within the scripts directory
+    from life_stepper import LifeStepper, TiledLifeStepper, report_active_fractions
+    from cycle_detection import CycleDetector, ON_CYCLE_CHOICES, extrapolate_counts, report_cycle
+    from frame_encoder import DirectFrameWriter, FramePipeline, ENCODERS
+    from initial_conditions import random_grid
+    from checkpoint import save_checkpoint, load_checkpoint
+    from memory_planner import parse_memory, plan_mem_opt_run, report_plan
+
 
 def life_step_int(grid: np.ndarray, neighbours: np.ndarray) -> np.ndarray:
     """
@@ -48,7 +61,20 @@ def simulate_and_animate(
     output_file: Path,
     interval_ms: int = 200,
     max_display: int = 1080,
-    dpi: int = 180
+    dpi: int = 180,
+    engine: str = "dense",
+    tile_size: int = 128,
+    active_log: Path = None,
+    on_cycle: str = None,
+    max_period: int = 64,
+    encoder: str = "matplotlib",
+    queue_size: int = 8,
+    stage_times: dict = None,
+    stats_file: Path = None,
+    seed: int = None,
+    checkpoint_every: int = None,
+    checkpoint_dir: Path = None,
+    resume: bool = False
 ) -> np.ndarray:
     """
     Initialize the Game of Life grid randomly, run simulation, create a GIF,
@@ -62,56 +88,231 @@ def simulate_and_animate(
     - interval_ms: Frame interval in milliseconds
     - max_display: Maximum pixel dimension for display (downsample if larger)
     - dpi: Output resolution
+    - engine: "dense" steps every cell; "tiled" only recomputes active tiles;
+      "fused" steps, counts and averages the display tile in one compiled
+      pass per generation (see life_stats.py). With "fused" the frames are
+      block means of the grid rather than strided samples.
+    - tile_size: Tile side length in cells for the tiled engine
+    - active_log: Optional CSV path for per-generation active-tile fractions
+    - on_cycle: None, "stop" or "fast-forward" once the grid repeats. With
+      "stop" the counts cover only the generations simulated; with
+      "fast-forward" the counts of the skipped generations are extrapolated
+      from one period of the cycle. The GIF ends at the first repeat either way.
+    - max_period: Longest cycle period detected
+    - encoder: "matplotlib" draws each frame in a figure and grabs it;
+      "direct" encodes the downsampled grid as a two-colour image without
+      matplotlib (see frame_encoder.py)
+    - queue_size: Frames buffered for the background encoder thread; the
+      loop keeps stepping while earlier frames are encoded and blocks when
+      the queue is full. 0 encodes every frame inline. Only used with
+      encoder="direct": matplotlib is not thread-safe, so matplotlib frames
+      are always drawn and grabbed inline on the calling thread.
+    - stage_times: Optional dict that receives the seconds spent in each
+      stage ("step", "downsample", "enqueue_wait", "encode")
+    - stats_file: Optional .csv or .parquet path for per-generation
+      population, births and deaths (requires engine="fused")
+    - seed: Seed for the initial grid (see initial_conditions.py)
+    - checkpoint_every: Write a checkpoint (see checkpoint.py) to
+      checkpoint_dir every this many generations. The animation is then
+      written in segments, one file per checkpoint interval, named
+      <stem>.<first generation>.<suffix> next to output_file; each segment
+      is finalised before its checkpoint is written. Checkpoint and segment
+      costs are added to stage_times["checkpoint"].
+    - checkpoint_dir: Directory holding the checkpoint
+    - resume: Continue from the checkpoint in checkpoint_dir, if there is
+      one. The grid, the counts and the statistics CSV are restored; the
+      cycle detector starts empty again.
 
     Returns:
     - counts: 2D uint32 array of shape (N, N) with number of times each cell was alive
     """
-    rng = np.random.default_rng()  # Random number generator
-
-    # Create initial grid: randomly set cells alive based on threshold
-    grid = np.empty((N, N), dtype=np.uint8)
-    threshold = int(p_alive * 1_000_000)
-    for i in range(N):
-        # Generate random integers and compare to threshold for alive/dead
-        random_row = rng.integers(0, 1_000_000, size=N, dtype=np.int32)
-        grid[i, :] = (random_row < threshold).astype(np.uint8)
-
-    neighbours = np.zeros((N, N), dtype=np.uint8)  # Buffer for neighbour counts
-    counts = np.zeros((N, N), dtype=np.uint32)    # Alive counts accumulator
+    state = load_checkpoint(checkpoint_dir) if resume else None
+    if state is not None:
+        # Continue from the last checkpoint instead of a fresh soup
+        if state["grid"].shape != (N, N):
+            raise ValueError(f"checkpoint in {checkpoint_dir} is for a {state['grid'].shape} grid, not {(N, N)}")
+        grid = state["grid"]
+        start = state["generation"]
+        entropy = state["entropy"]
+        print(f"[Checkpoint] Resuming from generation {start} (seed entropy {entropy})")
+    else:
+        # Create initial grid: row bands drawn in parallel, written straight into uint8
+        seed_seq = np.random.SeedSequence(seed)
+        grid = random_grid(N, p_alive=p_alive, seed=seed_seq)
+        start = 0
+        entropy = seed_seq.entropy
 
     # Determine downsampling step to fit within max_display
     step = 1 if max_display is None or max_display >= N else max(1, N // max_display)
 
-    # Set up Matplotlib figure without axes for clean frames
-    width_in = max_display / dpi
-    fig = plt.figure(figsize=(width_in, width_in), frameon=False)
-    fig.patch.set_visible(False)
-    ax = fig.add_axes([0, 0, 1, 1], frameon=False)
-    ax.set_axis_off()
-
-    # Display initial frame (possibly downsampled)
-    small = grid[::step, ::step]
-    im = ax.imshow(
-        small,
-        cmap='binary',  # black-white colormap
-        vmin=0, vmax=1,
-        interpolation='nearest'
-    )
-
-    # Configure GIF writer: frames per second = 1000 / interval_ms
-    writer = animation.PillowWriter(fps=1000 / interval_ms)
-    writer.setup(fig, str(output_file), dpi=dpi)
-
-    # Main simulation loop with progress bar
-    for _ in tqdm(range(timesteps), desc="Simulating & writing GIF"):
-        counts += grid            # Update alive counts
-        small = grid[::step, ::step]
-        im.set_data(small)        # Update image data for frame
-        writer.grab_frame()       # Write frame to GIF
-        grid = life_step_int(grid, neighbours)  # Compute next generation
+    # Stepper owns the two grid buffers and all scratch buffers
+    fused = engine == "fused"
+    stats = None
+    if fused:
+        # Needs Numba, so only imported when selected
+        try:
+            from .life_stats import FusedLifeStepper, StatsWriter
+        except ImportError:
+            from life_stats import FusedLifeStepper, StatsWriter
+        stepper = FusedLifeStepper(grid, block=step)
+        if stats_file is not None:
+            stats = StatsWriter(stats_file, offset=state.get("stats_offset") if state is not None else None)
+    elif engine == "tiled":
+        stepper = TiledLifeStepper(grid, tile_size=tile_size)
+    else:
+        stepper = LifeStepper(grid)
+    del grid
+    if state is not None:
+        counts = state["counts"]                  # Alive counts of generations 0 .. start-1
+    else:
+        counts = np.zeros((N, N), dtype=np.uint32)    # Alive counts accumulator
+    del state
 
-    writer.finish()  # Finalize GIF file
-    plt.close(fig)   # Close figure to free memory
+    if encoder == "direct":
+        fig = None
+    else:
+        # Imported here so --encoder direct runs never load matplotlib
+        import matplotlib.pyplot as plt              # Plotting figures and images
+        import matplotlib.animation as animation     # Creating animated GIFs
+
+        # Set up Matplotlib figure without axes for clean frames
+        width_in = max_display / dpi
+        fig = plt.figure(figsize=(width_in, width_in), frameon=False)
+        fig.patch.set_visible(False)
+        ax = fig.add_axes([0, 0, 1, 1], frameon=False)
+        ax.set_axis_off()
+
+        # Display initial frame (possibly downsampled)
+        small = stepper.grid[::step, ::step].astype(np.float32) if fused else stepper.grid[::step, ::step]
+        im = ax.imshow(
+            small,
+            cmap='binary',  # black-white colormap
+            vmin=0, vmax=1,
+            interpolation='nearest'
+        )
+
+    def open_pipeline(path):
+        """Start an encoder (and its background thread) writing to path."""
+        if encoder == "direct":
+            # Encode palette frames straight from the grid, no figure needed
+            writer = DirectFrameWriter(path, fps=1000 / interval_ms, max_display=max_display)
+            encode_frame = writer.write_frame
+        else:
+            # Configure GIF writer: frames per second = 1000 / interval_ms
+            writer = animation.PillowWriter(fps=1000 / interval_ms)
+            writer.setup(fig, str(path), dpi=dpi)
+
+            def encode_frame(small):
+                im.set_data(small)        # Update image data for frame
+                writer.grab_frame()       # Write frame to GIF
+
+            # matplotlib is not thread-safe: draw on this thread, never on the encoder thread
+            return FramePipeline(encode_frame, writer.finish, maxsize=0)
+
+        # Encoder thread drains a bounded queue of downsampled frames
+        return FramePipeline(encode_frame, writer.finish, maxsize=queue_size)
+
+    def segment_file(first):
+        """Animation file of the segment starting at generation `first`."""
+        if not checkpoint_every:
+            return output_file
+        output = Path(output_file)
+        return output.with_name(f"{output.stem}.{first:08d}{output.suffix}")
+
+    step_time = 0.0
+    downsample_time = 0.0
+    enqueue_wait = 0.0
+    encode_time = 0.0
+    checkpoint_time = 0.0
+    n_checkpoints = 0
+
+    # Hash ring of recent generations (only when early termination is enabled)
+    detector = CycleDetector(max_period) if on_cycle else None
+
+    # Main simulation loop with progress bar, one pass per animation segment
+    progress = tqdm(total=timesteps, initial=start, desc="Simulating & writing GIF")
+    t = start
+    stopped = False
+    try:
+        while t < timesteps and not stopped:
+            segment_end = timesteps
+            if checkpoint_every:
+                segment_end = min(timesteps, (t // checkpoint_every + 1) * checkpoint_every)
+            pipeline = open_pipeline(segment_file(t))
+            with pipeline:
+                for t in range(t, segment_end):
+                    t0 = time.perf_counter()
+                    grid = stepper.grid       # View of the current generation
+                    if detector is not None:
+                        period = detector.observe(grid, t)
+                        if period is not None:
+                            report_cycle("[Cycle]", period, t, timesteps, on_cycle)
+                            if on_cycle == "fast-forward":
+                                # Add the counts of generations t .. timesteps-1 without simulating them
+                                counts += extrapolate_counts(stepper, period, timesteps - t)
+                            step_time += time.perf_counter() - t0
+                            stopped = True
+                            break
+                    if fused:
+                        # One pass: next generation, alive counts, display tile and statistics
+                        population, births, deaths = stepper.step_with_stats(counts)
+                        if stats is not None:
+                            stats.write(t, population, births, deaths)
+                        t1 = time.perf_counter()
+                        small = stepper.tile.copy()   # Block means of generation t
+                        t2 = time.perf_counter()
+                        pipeline.submit(small)
+                        t3 = t4 = time.perf_counter()
+                    else:
+                        counts += grid            # Update alive counts
+                        t1 = time.perf_counter()
+                        # Copy: the stepper overwrites this buffer while the frame waits in the queue
+                        small = np.ascontiguousarray(grid[::step, ::step])
+                        t2 = time.perf_counter()
+                        pipeline.submit(small)    # Blocks only while the queue is full
+                        t3 = time.perf_counter()
+                        stepper.step()            # Compute next generation in place (buffer swap)
+                        t4 = time.perf_counter()
+                    step_time += (t1 - t0) + (t4 - t3)
+                    downsample_time += t2 - t1
+                    progress.update()
+                else:
+                    t = segment_end
+                t_close = time.perf_counter()
+            # Leaving the block waits for the encoder, finalises the segment and re-raises its errors
+            enqueue_wait += pipeline.enqueue_wait
+            encode_time += pipeline.encode_time
+
+            if checkpoint_every and not stopped and t < timesteps:
+                # Segment is complete on disk, so the checkpoint never points past written frames
+                extra = {"stats_offset": stats.tell()} if stats is not None else {}
+                cost = save_checkpoint(checkpoint_dir, t, stepper.grid, counts, entropy=entropy, **extra)
+                flush = time.perf_counter() - t_close - cost["seconds"]
+                checkpoint_time += time.perf_counter() - t_close
+                n_checkpoints += 1
+                tqdm.write(f"[Checkpoint] generation {t}: {cost['bytes'] / 1024 ** 2:.1f} MiB "
+                           f"written in {cost['seconds']:.3f} s (+{flush:.3f} s finalising the segment)")
+    finally:
+        # Also on errors: stop the progress bar, free the figure and flush the statistics
+        progress.close()
+        if fig is not None:
+            plt.close(fig)   # Close figure to free memory
+        if stats is not None:
+            stats.close()
+    if stats is not None:
+        print(f"Saved per-generation statistics to {stats_file}")
+
+    if n_checkpoints:
+        print(f"[Checkpoint] {n_checkpoints} checkpoints in {checkpoint_dir}, "
+              f"{checkpoint_time:.2f} s in total ({checkpoint_time / n_checkpoints:.3f} s each)")
+
+    if stage_times is not None:
+        stage_times.update(step=step_time, downsample=downsample_time,
+                           enqueue_wait=enqueue_wait, encode=encode_time,
+                           checkpoint=checkpoint_time)
+
+    if engine == "tiled":
+        report_active_fractions(stepper.active_fractions, "[Tiled]", active_log)
 
     return counts
 
@@ -124,6 +325,8 @@ def plot_heatmap(counts: np.ndarray, output_file: Path = None):
     - counts: 2D array of alive counts per cell
     - output_file: Optional Path to save the heatmap image (PNG). Show interactively if None.
     """
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(4, 4))
     plt.imshow(counts, cmap='hot', interpolation='nearest')  # Use 'hot' colormap
     plt.colorbar(label='Alive Count')  # Show scale of counts
@@ -152,16 +355,64 @@ def main():
     parser.add_argument("--interval", type=int, default=200, help="Frame duration in ms")
     parser.add_argument("--max-display", type=int, default=1080, help="Max side length for display (pixels)")
     parser.add_argument("--dpi", type=int, default=180, help="Resolution (dots per inch) for outputs")
+    parser.add_argument("--engine", choices=["dense", "tiled", "fused"], default="dense",
+                        help="Stepping engine: every cell, active tiles only, or fused step + reductions")
+    parser.add_argument("--tile-size", type=int, default=128, help="Tile side length for --engine tiled")
+    parser.add_argument("--active-log", type=Path, default=None,
+                        help="CSV of per-generation active-tile fractions (--engine tiled)")
+    parser.add_argument("--on-cycle", choices=ON_CYCLE_CHOICES, default=None,
+                        help="Stop, or fast-forward the counts, once the grid repeats")
+    parser.add_argument("--max-period", type=int, default=64, help="Longest cycle period detected")
+    parser.add_argument("--encoder", choices=ENCODERS, default="matplotlib",
+                        help="Frame encoder: matplotlib figures or direct palette frames")
+    parser.add_argument("--queue-size", type=int, default=8,
+                        help="Frames buffered for the background encoder (0 = encode inline; "
+                             "--encoder matplotlib always draws inline)")
+    parser.add_argument("--stats", type=Path, default=None,
+                        help="CSV/Parquet of per-generation population, births and deaths (--engine fused)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the initial grid")
+    parser.add_argument("--max-memory", type=parse_memory, default=None,
+                        help="Memory budget (e.g. 8G): switch encoder, queue and display size to fit")
+    parser.add_argument("--heatmap-tiles", type=Path, default=None,
+                        help="Write a zoomable tile pyramid (with index.html) to this directory instead of --heatmap")
+    parser.add_argument("--tile-pooling", choices=["max", "mean"], default="max",
+                        help="Pooling between pyramid levels (--heatmap-tiles)")
+    parser.add_argument("--checkpoint-every", type=int, default=None,
+                        help="Checkpoint every N generations; the GIF is then written in N-frame segments")
+    parser.add_argument("--checkpoint-dir", type=Path, default=Path("checkpoints"),
+                        help="Directory for the checkpoint file")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the checkpoint in --checkpoint-dir, if present")
     args = parser.parse_args()
+    if args.stats is not None and args.engine != "fused":
+        parser.error("--stats requires --engine fused")
+    if args.checkpoint_every is not None and args.checkpoint_every <= 0:
+        parser.error("--checkpoint-every must be positive")
+    if args.stats is not None and args.checkpoint_every and args.stats.suffix.lower() == ".parquet":
+        parser.error("--checkpoint-every needs a .csv --stats file")
 
     # Log parameters for user reference
     print(f"[All-int Matplotlib HD + Heatmap] size={args.size}, timesteps={args.timesteps}, p_alive={args.p_alive}")
 
+    # Estimate peak memory up front and, with a budget, pick frame settings that fit
+    plan = plan_mem_opt_run(args.size, args.timesteps, args.max_memory, engine=args.engine,
+                            encoder=args.encoder, max_display=args.max_display,
+                            queue_size=args.queue_size, checkpoint_every=args.checkpoint_every,
+                            heatmap="png" if args.heatmap_tiles is None else "tiles")
+    if args.max_memory is not None:
+        args.encoder, args.queue_size, args.max_display = plan["encoder"], plan["queue_size"], plan["max_display"]
+        if plan["heatmap"] == "tiles" and args.heatmap_tiles is None:
+            args.heatmap_tiles = args.heatmap.with_name(args.heatmap.stem + "_tiles")
+    if args.encoder != "direct":
+        args.queue_size = 0    # matplotlib frames are drawn on the main thread
+    report_plan("[Plan]", plan)
+
     # Record start times for benchmarking
     start_wall = time.perf_counter()
     rstart = resource.getrusage(resource.RUSAGE_SELF)
 
     # Run simulation and animation
+    stage_times = {}
     counts = simulate_and_animate(
         N=args.size,
         timesteps=args.timesteps,
@@ -169,11 +420,34 @@ def main():
         output_file=args.output,
         interval_ms=args.interval,
         max_display=args.max_display,
-        dpi=args.dpi
+        dpi=args.dpi,
+        engine=args.engine,
+        tile_size=args.tile_size,
+        active_log=args.active_log,
+        on_cycle=args.on_cycle,
+        max_period=args.max_period,
+        encoder=args.encoder,
+        queue_size=args.queue_size,
+        stage_times=stage_times,
+        stats_file=args.stats,
+        seed=args.seed,
+        checkpoint_every=args.checkpoint_every,
+        checkpoint_dir=args.checkpoint_dir,
+        resume=args.resume
     )
 
     # Plot and save the heatmap of alive counts
-    plot_heatmap(counts, args.heatmap)
+    if args.heatmap_tiles is not None:
+        # Streams the counts in row bands; imported here as it is optional
+        try:
+            from .heatmap_tiles import export_tile_pyramid
+        except ImportError:
+            from heatmap_tiles import export_tile_pyramid
+        info = export_tile_pyramid(counts, args.heatmap_tiles, pooling=args.tile_pooling)
+        heatmap_location = f"{args.heatmap_tiles / 'index.html'} ({info['n_tiles']} tiles, {info['levels']} levels)"
+    else:
+        plot_heatmap(counts, args.heatmap)
+        heatmap_location = args.heatmap
 
     # Record end times for benchmarking
     end_wall = time.perf_counter()
@@ -185,12 +459,24 @@ def main():
     cpu_system = rend.ru_stime - rstart.ru_stime
     peak_rss = rend.ru_maxrss / (1024 ** 2)  # Convert KB to GB
 
-    print(f"Saved HD GIF to {args.output}")
-    print(f"Saved heatmap to {args.heatmap}\n")
+    if args.checkpoint_every:
+        print(f"Saved HD GIF segments to {args.output.with_name(args.output.stem + '.*' + args.output.suffix)}")
+    else:
+        print(f"Saved HD GIF to {args.output}")
+    print(f"Saved heatmap to {heatmap_location}\n")
     print("=== Resource usage ===")
     print(f"Wall-clock time : {elapsed:.2f} s")
     print(f"CPU time         : user {cpu_user:.2f} s, system {cpu_system:.2f} s")
-    print(f"Peak memory (RSS): {peak_rss:.2f} GB")
+    print(f"Peak memory (RSS): {peak_rss:.2f} GB (planned {plan['peak'] / 1024 ** 3:.2f} GB, "
+          f"{rend.ru_maxrss * 1024 / plan['peak']:.2f}x)")
+    print("=== Pipeline stages ===")
+    print(f"Step             : {stage_times['step']:.2f} s")
+    print(f"Downsample       : {stage_times['downsample']:.2f} s")
+    print(f"Enqueue wait     : {stage_times['enqueue_wait']:.2f} s")
+    encode_where = "encoder thread" if args.queue_size > 0 else "inline"
+    print(f"Encode           : {stage_times['encode']:.2f} s ({encode_where})")
+    if args.checkpoint_every:
+        print(f"Checkpoint       : {stage_times['checkpoint']:.2f} s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,301 @@
+"""
+MPI Domain-Decomposed Game of Life
+
+This module runs Conway’s Game of Life across several MPI ranks (and nodes).
+The toroidal N×N grid is split into rectangular blocks over a periodic 2D
+Cartesian communicator:
+
+- Rank 0 creates the initial grid and sends each rank its block.
+- Every generation, each rank posts non-blocking, buffer-based Irecv/Isend
+  calls for its eight halo pieces (four edges and four corners), updates
+  the interior of its block while the messages are in flight, then waits,
+  unpacks the halo and updates the one-cell border ring.
+- The global population is combined with Allreduce every generation.
+- Each rank records its compute and communication time, which rank 0
+  prints as a table at the end.
+
+With --verify, rank 0 gathers the final grid and checks it against the same
+initial grid stepped with life_step_numpy.
+
+Run locally with, for example:
+
+    mpirun -n 4 python game_of_life_mpi.py --size 512 --timesteps 100 --verify
+
+Entry point:
+- run_life_mpi()
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import argparse
+import time
+
+import numpy as np
+from mpi4py import MPI
+
+try:
+    from .life_stepper import life_rule_block
+    from .initial_conditions import random_grid
+except ImportError:  # executed from within the scripts directory
+    from life_stepper import life_rule_block
+    from initial_conditions import random_grid
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Halo directions (row offset, column offset); the message tag is the index
+# of the direction the message travels in
+DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1),
+              (0, -1),           (0, 1),
+              (1, -1),  (1, 0),  (1, 1)]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Domain decomposition helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+def block_bounds(n: int, parts: int, index: int):
+    """
+    Return the half-open range [start, stop) of block `index` when n cells
+    are split as evenly as possible into `parts` blocks.
+    """
+    return n * index // parts, n * (index + 1) // parts
+
+
+def edge_slices(h: int, w: int, dr: int, dc: int):
+    """
+    Slices of a padded (h + 2, w + 2) block for the halo exchange.
+
+    Args:
+        h, w (int): Height and width of the local block.
+        dr, dc (int): Direction of the neighbour.
+
+    Returns:
+        tuple: (send, recv) index tuples; `send` selects the cells this rank
+        sends towards (dr, dc), `recv` the halo cells it receives from there.
+    """
+    def axis(d, n):
+        if d == -1:
+            return slice(1, 2), slice(0, 1)
+        if d == 1:
+            return slice(n, n + 1), slice(n + 1, n + 2)
+        return slice(1, n + 1), slice(1, n + 1)
+
+    send_r, recv_r = axis(dr, h)
+    send_c, recv_c = axis(dc, w)
+    return (send_r, send_c), (recv_r, recv_c)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Distributed simulation
+# ─────────────────────────────────────────────────────────────────────────────
+
+def simulate_life_mpi(cart, N: int, timesteps: int, p_alive: float = 0.2, seed: int = None):
+    """
+    Run a distributed Game of Life simulation on a periodic Cartesian communicator.
+
+    Args:
+        cart (MPI.Cartcomm): 2D periodic Cartesian communicator.
+        N (int): Global grid dimension (N × N).
+        timesteps (int): Number of generations.
+        p_alive (float): Initial alive probability.
+        seed (int): Seed for the initial grid (created on rank 0).
+
+    Returns:
+        dict: Local results with keys "block" (final local block),
+        "bounds", "initial" (global initial grid, rank 0 only),
+        "population" (global population per generation, including the final one),
+        "compute_time" and "comm_time" (seconds).
+    """
+    rank = cart.Get_rank()
+    dims = cart.Get_topo()[0]
+    coords = cart.Get_coords(rank)
+    r0, r1 = block_bounds(N, dims[0], coords[0])
+    c0, c1 = block_bounds(N, dims[1], coords[1])
+    h, w = r1 - r0, c1 - c0
+
+    # ---- Distribute the initial grid -----------------------------------
+    buffers = (np.zeros((h + 2, w + 2), dtype=np.uint8),
+               np.zeros((h + 2, w + 2), dtype=np.uint8))
+    initial = None
+    if rank == 0:
+        initial = random_grid(N, p_alive=p_alive, seed=seed)
+        for other in range(cart.Get_size()):
+            oc = cart.Get_coords(other)
+            orow = block_bounds(N, dims[0], oc[0])
+            ocol = block_bounds(N, dims[1], oc[1])
+            block = np.ascontiguousarray(initial[orow[0]:orow[1], ocol[0]:ocol[1]])
+            if other == 0:
+                buffers[0][1:-1, 1:-1] = block
+            else:
+                cart.Send(block, dest=other, tag=100)
+    else:
+        block = np.empty((h, w), dtype=np.uint8)
+        cart.Recv(block, source=0, tag=100)
+        buffers[0][1:-1, 1:-1] = block
+
+    # ---- Neighbours and preallocated message buffers --------------------
+    neighbours = []
+    for dr, dc in DIRECTIONS:
+        nbr = cart.Get_cart_rank([(coords[0] + dr) % dims[0], (coords[1] + dc) % dims[1]])
+        send_idx, recv_idx = edge_slices(h, w, dr, dc)
+        shape = buffers[0][send_idx].shape
+        neighbours.append((nbr, send_idx, recv_idx,
+                           np.empty(shape, dtype=np.uint8), np.empty(shape, dtype=np.uint8)))
+    opposite = {d: DIRECTIONS.index((-d[0], -d[1])) for d in DIRECTIONS}
+
+    scratch = (np.empty((h, w), dtype=np.uint8), np.empty((h, w), dtype=bool), np.empty((h, w), dtype=bool))
+
+    def update(src, dst, a0, a1, b0, b1):
+        if a1 > a0 and b1 > b0:
+            life_rule_block(src, dst, a0, a1, b0, b1,
+                            *(s[:a1 - a0, :b1 - b0] for s in scratch))
+
+    local_pop = np.zeros(1, dtype=np.int64)
+    global_pop = np.zeros(1, dtype=np.int64)
+    population = []
+    compute_time = 0.0
+    comm_time = 0.0
+    current = 0
+
+    for _ in range(timesteps + 1):
+        src = buffers[current]
+        dst = buffers[1 - current]
+
+        # Global population of the current generation
+        t0 = time.perf_counter()
+        local_pop[0] = int(src[1:-1, 1:-1].sum())
+        cart.Allreduce(local_pop, global_pop, op=MPI.SUM)
+        population.append(int(global_pop[0]))
+        comm_time += time.perf_counter() - t0
+        if len(population) > timesteps:
+            break
+
+        # Post the halo exchange
+        t0 = time.perf_counter()
+        requests = []
+        for d, (nbr, send_idx, recv_idx, send_buf, recv_buf) in enumerate(neighbours):
+            requests.append(cart.Irecv(recv_buf, source=nbr, tag=opposite[DIRECTIONS[d]]))
+        for d, (nbr, send_idx, recv_idx, send_buf, recv_buf) in enumerate(neighbours):
+            np.copyto(send_buf, src[send_idx])
+            requests.append(cart.Isend(send_buf, dest=nbr, tag=d))
+        comm_time += time.perf_counter() - t0
+
+        # Interior cells need no halo: overlap them with communication
+        t0 = time.perf_counter()
+        update(src, dst, 1, h - 1, 1, w - 1)
+        compute_time += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        MPI.Request.Waitall(requests)
+        for nbr, send_idx, recv_idx, send_buf, recv_buf in neighbours:
+            src[recv_idx] = recv_buf
+        comm_time += time.perf_counter() - t0
+
+        # Border ring (top and bottom rows, then left and right columns)
+        t0 = time.perf_counter()
+        if h < 3 or w < 3:
+            update(src, dst, 0, h, 0, w)
+        else:
+            update(src, dst, 0, 1, 0, w)
+            update(src, dst, h - 1, h, 0, w)
+            update(src, dst, 1, h - 1, 0, 1)
+            update(src, dst, 1, h - 1, w - 1, w)
+        compute_time += time.perf_counter() - t0
+
+        current = 1 - current
+
+    return {
+        "block": buffers[current][1:-1, 1:-1].copy(),
+        "bounds": (r0, r1, c0, c1),
+        "initial": initial,
+        "population": population,
+        "compute_time": compute_time,
+        "comm_time": comm_time,
+    }
+
+
+def gather_grid(cart, N: int, result: dict):
+    """
+    Gather every rank's final block into a full N×N grid on rank 0.
+
+    Returns:
+        np.ndarray or None: Full grid on rank 0, None on other ranks.
+    """
+    blocks = cart.gather((result["bounds"], result["block"]), root=0)
+    if cart.Get_rank() != 0:
+        return None
+    grid = np.empty((N, N), dtype=np.uint8)
+    for (r0, r1, c0, c1), block in blocks:
+        grid[r0:r1, c0:c1] = block
+    return grid
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3) CLI entry-point
+# ─────────────────────────────────────────────────────────────────────────────
+
+def run_life_mpi():
+    """
+    Command‐line entry for the MPI domain-decomposed Game of Life.
+
+    Flags:
+      --size:      Global grid dimension (N×N)
+      --timesteps: Number of generations
+      --p-alive:   Initial alive probability
+      --seed:      Seed for the initial grid
+      --verify:    Check the result against life_step_numpy on rank 0
+    """
+    p = argparse.ArgumentParser("Game of Life (MPI)")
+    p.add_argument("--size",      type=int,   default=100, help="Grid dimension (N×N)")
+    p.add_argument("--timesteps", type=int,   default=50,  help="Number of generations")
+    p.add_argument("--p-alive",   type=float, default=0.2, help="Initial alive probability")
+    p.add_argument("--seed",      type=int,   default=None, help="Seed for the initial grid")
+    p.add_argument("--verify",    action="store_true",     help="Compare with life_step_numpy on rank 0")
+    args = p.parse_args()
+
+    comm = MPI.COMM_WORLD
+    dims = MPI.Compute_dims(comm.Get_size(), 2)
+    cart = comm.Create_cart(dims, periods=[True, True], reorder=True)
+    rank = cart.Get_rank()
+
+    if rank == 0:
+        print(f"[MPI] Args received: {args}")
+        print(f"[MPI] {cart.Get_size()} ranks on a {dims[0]}×{dims[1]} periodic process grid")
+
+    cart.Barrier()
+    t0 = time.perf_counter()
+    result = simulate_life_mpi(cart, args.size, args.timesteps, args.p_alive, args.seed)
+    cart.Barrier()
+    elapsed = time.perf_counter() - t0
+
+    timings = cart.gather((rank, cart.Get_coords(rank), result["compute_time"], result["comm_time"]), root=0)
+    if rank == 0:
+        print(f"[MPI] Population: initial {result['population'][0]}, final {result['population'][-1]}")
+        print(f"[MPI] Wall-clock time: {elapsed:.3f} s")
+        print(f"{'rank':>5} {'coords':>8} {'compute (s)':>12} {'comm (s)':>10} {'comm %':>7}")
+        for r, coords, comp, comm_t in sorted(timings):
+            share = comm_t / (comp + comm_t) if comp + comm_t else 0.0
+            print(f"{r:>5} {str(tuple(coords)):>8} {comp:>12.4f} {comm_t:>10.4f} {share:>7.1%}")
+
+    if args.verify:
+        grid = gather_grid(cart, args.size, result)
+        if rank == 0:
+            try:
+                from .game_of_life import life_step_numpy
+            except ImportError:
+                from game_of_life import life_step_numpy
+            reference = result["initial"]
+            for _ in range(args.timesteps):
+                reference = life_step_numpy(reference)
+            if np.array_equal(grid, reference):
+                print("[MPI] Verification passed: identical to life_step_numpy")
+            else:
+                print("[MPI] Verification FAILED: result differs from life_step_numpy")
+                cart.Abort(1)
+
+
+if __name__ == "__main__":
+    run_life_mpi()
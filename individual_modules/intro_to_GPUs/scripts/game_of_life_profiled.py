@@ -10,6 +10,16 @@ Entry points (via CLI):
 - run_life_numpy(): NumPy backend, optional --profile-cpu
 - run_life_cupy():  CuPy backend, optional --profile-cpu, --profile-gpu
 - run_life_naive(): Naive Python backend, optional --profile-cpu
+
+Each also takes --profile-sample HZ, a sampling profiler whose overhead is
+bounded by the sample rate (stack_sampler.py; profiler_overhead_experiment.py
+compares it with --profile-cpu).
+
+CuPy and matplotlib are imported on first use (see lazy_imports.py), so the
+CPU entry points run on machines without CUDA; the NVTX ranges are then
+skipped. For per-generation timings without cProfile's overhead or NVIDIA
+tooling, run the game_of_life.py entry points with GOL_TRACE set instead
+(see span_timer.py).
 """
 # -------------------------------------------------------------------
 # Library imports
@@ -19,11 +29,15 @@ import cProfile
 import pstats
 from pathlib import Path
 import numpy as np
-import cupy as cp
-from cupyx.profiler import time_range
-from cupy.cuda import profiler
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+
+try:
+    from .initial_conditions import random_grid
+    from .lazy_imports import require_cupy, time_range
+    from .stack_sampler import add_sampling_arguments, sampling_from_args
+except ImportError:
+    from initial_conditions import random_grid
+    from lazy_imports import require_cupy, time_range
+    from stack_sampler import add_sampling_arguments, sampling_from_args
 
 # ─────────────────────────────────────────────────────────────────────────────
 # 1) Core update functions (decorated with NVTX ranges via cupyx.profiler)
@@ -54,7 +68,7 @@ def life_step_numpy(grid: np.ndarray) -> np.ndarray:
     return np.where((neighbours == 3) | ((grid == 1) & (neighbours == 2)), 1, 0)
 
 @time_range()
-def life_step_gpu(grid: cp.ndarray) -> cp.ndarray:
+def life_step_gpu(grid: "cp.ndarray") -> "cp.ndarray":
     """
     Next-generation update using CuPy with NVTX profiling.
 
@@ -66,6 +80,7 @@ def life_step_gpu(grid: cp.ndarray) -> cp.ndarray:
     Returns:
         cp.ndarray: Updated 2D CuPy array.
     """
+    cp = require_cupy()
     neighbours = (
         cp.roll(cp.roll(grid, 1, axis=0), 1, axis=1) +
         cp.roll(cp.roll(grid, 1, axis=0), -1, axis=1) +
@@ -112,7 +127,7 @@ def life_step_naive(grid: np.ndarray) -> np.ndarray:
 # 2) Simulation loops (also bracketed with NVTX ranges)
 # -------------------------------------------------------------------
 @time_range()
-def simulate_life_numpy(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False):
+def simulate_life_numpy(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False, seed: int = None):
     """
     Run Game of Life for NumPy with NVTX profiling of the loop.
 
@@ -121,11 +136,12 @@ def simulate_life_numpy(N: int, timesteps: int, p_alive: float = 0.2, record_his
         timesteps (int): Number of generations.
         p_alive (float): Initial probability of being alive.
         record_history (bool): If True, collect each generation in a list.
+        seed (int): Seed for the initial grid (see initial_conditions.py).
 
     Returns:
         list[np.ndarray] or None: Generation history if recorded, else None.
     """
-    grid = np.random.choice([0, 1], size=(N, N), p=[1 - p_alive, p_alive])
+    grid = random_grid(N, p_alive=p_alive, seed=seed)
     history = [] if record_history else None
     for _ in range(timesteps):
         if record_history:
@@ -134,7 +150,7 @@ def simulate_life_numpy(N: int, timesteps: int, p_alive: float = 0.2, record_his
     return history
 
 @time_range()
-def simulate_life_cupy(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False):
+def simulate_life_cupy(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False, seed: int = None):
     """
     Run Game of Life on GPU with NVTX profiling of the loop.
 
@@ -143,11 +159,13 @@ def simulate_life_cupy(N: int, timesteps: int, p_alive: float = 0.2, record_hist
         timesteps (int): Number of generations.
         p_alive (float): Initial alive probability.
         record_history (bool): If True, store each generation as NumPy array.
+        seed (int): Seed for the initial grid (see initial_conditions.py).
 
     Returns:
         list[np.ndarray] or None: Recorded history if requested.
     """
-    grid_gpu = (cp.random.random((N, N)) < p_alive).astype(cp.int32)
+    cp = require_cupy()
+    grid_gpu = cp.asarray(random_grid(N, p_alive=p_alive, seed=seed)).astype(cp.int32)
     history = [] if record_history else None
     for _ in range(timesteps):
         if record_history:
@@ -156,7 +174,7 @@ def simulate_life_cupy(N: int, timesteps: int, p_alive: float = 0.2, record_hist
     return history
 
 @time_range()
-def simulate_life_naive(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False):
+def simulate_life_naive(N: int, timesteps: int, p_alive: float = 0.2, record_history: bool = False, seed: int = None):
     """
     Run naive Python Game of Life with NVTX profiling of the loop.
 
@@ -165,11 +183,12 @@ def simulate_life_naive(N: int, timesteps: int, p_alive: float = 0.2, record_his
         timesteps (int): Number of generations.
         p_alive (float): Initial alive probability.
         record_history (bool): If True, collect each generation.
+        seed (int): Seed for the initial grid (see initial_conditions.py).
 
     Returns:
         list[np.ndarray] or None: History of grids if recorded.
     """
-    grid = np.random.choice([0, 1], size=(N, N), p=[1 - p_alive, p_alive])
+    grid = random_grid(N, p_alive=p_alive, seed=seed)
     history = [] if record_history else None
     for _ in range(timesteps):
         if record_history:
@@ -190,7 +209,8 @@ def animate_life(history, output_file: Path, interval: int = 200, dpi: int = 80)
         interval (int): Delay between frames in milliseconds.
         dpi (int): Dots per inch resolution for the saved GIF.
     """
-    
+    import matplotlib.pyplot as plt
+    import matplotlib.animation as animation
 
     fig, ax = plt.subplots(figsize=(6, 6))
     im = ax.imshow(history[0], cmap='binary')
@@ -220,13 +240,18 @@ def run_life_numpy():
       --size:        Grid dimension (N×N)
       --timesteps:   Number of generations
       --save-gif:    Save a GIF if size ≤ 100
+      --seed:        Seed for the initial grid
       --profile-cpu: Enable cProfile CPU profiling
+      --profile-sample HZ: Sample the stacks HZ times per second instead
+                     (folded stacks + self-time table, see stack_sampler.py)
     """
     p = argparse.ArgumentParser("Game of Life (NumPy)")
     p.add_argument("--size",      type=int, default=100)
     p.add_argument("--timesteps", type=int, default=50)
     p.add_argument("--save-gif",  action="store_true")
+    p.add_argument("--seed",      type=int, default=None)
     p.add_argument("--profile-cpu", action="store_true")
+    add_sampling_arguments(p)
     args = p.parse_args()
 
     # CPU profiling
@@ -234,7 +259,9 @@ def run_life_numpy():
         pr = cProfile.Profile()
         pr.enable()
 
-    history = simulate_life_numpy(args.size, args.timesteps, record_history=args.save_gif)
+    with sampling_from_args(args, "game_of_life_cpu.folded"):
+        history = simulate_life_numpy(args.size, args.timesteps, record_history=args.save_gif,
+                                      seed=args.seed)
 
     if args.save_gif and args.size <= 100:
         out = Path("game_of_life_cpu.gif")
@@ -254,16 +281,26 @@ def run_life_cupy():
       --size:        Grid dimension (N×N)
       --timesteps:   Number of generations
       --save-gif:    Save a GIF if size ≤ 100
+      --seed:        Seed for the initial grid
       --profile-cpu: Enable cProfile CPU profiling
       --profile-gpu: Enable NVIDIA CUPTI GPU profiling
+      --profile-sample HZ: Sample the stacks HZ times per second
+                     (folded stacks + self-time table, see stack_sampler.py)
     """
     p = argparse.ArgumentParser("Game of Life (CuPy)")
     p.add_argument("--size",      type=int, default=100)
     p.add_argument("--timesteps", type=int, default=50)
     p.add_argument("--save-gif",  action="store_true")
+    p.add_argument("--seed",      type=int, default=None)
     p.add_argument("--profile-cpu", action="store_true")
     p.add_argument("--profile-gpu", action="store_true")
+    add_sampling_arguments(p)
     args = p.parse_args()
+    try:
+        require_cupy()
+    except (ImportError, RuntimeError) as exc:
+        p.error(str(exc))
+    from cupy.cuda import profiler
 
     # CPU profiling
     if args.profile_cpu:
@@ -274,7 +311,9 @@ def run_life_cupy():
     if args.profile_gpu:
         profiler.start()
 
-    history = simulate_life_cupy(args.size, args.timesteps, record_history=args.save_gif)
+    with sampling_from_args(args, "game_of_life_gpu.folded"):
+        history = simulate_life_cupy(args.size, args.timesteps, record_history=args.save_gif,
+                                     seed=args.seed)
 
     if args.save_gif and args.size <= 100:
         out = Path("game_of_life_gpu.gif")
@@ -297,20 +336,27 @@ def run_life_naive():
       --size:        Grid dimension (N×N)
       --timesteps:   Number of generations
       --save-gif:    Save a GIF if size ≤ 100
+      --seed:        Seed for the initial grid
       --profile-cpu: Enable cProfile CPU profiling
+      --profile-sample HZ: Sample the stacks HZ times per second instead
+                     (folded stacks + self-time table, see stack_sampler.py)
     """
     p = argparse.ArgumentParser("Game of Life (Naive)")
     p.add_argument("--size",      type=int, default=100)
     p.add_argument("--timesteps", type=int, default=50)
     p.add_argument("--save-gif",  action="store_true")
+    p.add_argument("--seed",      type=int, default=None)
     p.add_argument("--profile-cpu", action="store_true")
+    add_sampling_arguments(p)
     args = p.parse_args()
 
     if args.profile_cpu:
         pr = cProfile.Profile()
         pr.enable()
 
-    history = simulate_life_naive(args.size, args.timesteps, record_history=args.save_gif)
+    with sampling_from_args(args, "game_of_life_naive.folded"):
+        history = simulate_life_naive(args.size, args.timesteps, record_history=args.save_gif,
+                                      seed=args.seed)
 
     if args.save_gif and args.size <= 100:
         out = Path("game_of_life_naive.gif")
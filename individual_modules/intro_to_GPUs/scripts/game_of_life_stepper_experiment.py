@@ -0,0 +1,132 @@
+"""
+Benchmarking the Allocation-free LifeStepper Against life_step_numpy
+
+This script compares, for a range of grid sizes:
+  - life_step_numpy: allocates new temporaries on every generation
+  - LifeStepper:     preallocated halo-padded double buffers
+
+For each grid size it:
+  1. Measures the mean wall time per generation (time.perf_counter).
+  2. Measures the peak memory allocated within each generation with
+     tracemalloc (NumPy reports its array allocations to tracemalloc), and
+     reports its mean and maximum over the generations.
+  3. Writes the results to a CSV in ../output and prints a summary table.
+"""
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Library imports
+# ─────────────────────────────────────────────────────────────────────────────
+import csv
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+try:
+    from .game_of_life import life_step_numpy
+    from .life_stepper import LifeStepper
+except ImportError:  # executed from within the scripts directory
+    from game_of_life import life_step_numpy
+    from life_stepper import LifeStepper
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Ensure output directory exists
+out_dir = "../output"
+os.makedirs(out_dir, exist_ok=True)
+
+
+def time_per_generation(step, timesteps):
+    """
+    Measure the mean wall-clock time of one generation.
+
+    Args:
+        step: Zero-argument callable advancing the simulation by one generation.
+        timesteps: Number of generations to time.
+
+    Returns:
+        float: Mean seconds per generation.
+    """
+    step()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(timesteps):
+        step()
+    return (time.perf_counter() - t0) / timesteps
+
+
+def allocations_per_generation(step, timesteps):
+    """
+    Measure the peak memory allocated within each generation, using tracemalloc.
+
+    The peak is taken relative to the memory traced before the generation,
+    so it counts the temporaries alive at the same time, not every byte
+    allocated during the generation.
+
+    Args:
+        step: Zero-argument callable advancing the simulation by one generation.
+        timesteps: Number of generations to trace.
+
+    Returns:
+        tuple[int, int]: (mean of the per-generation peaks in bytes,
+                          largest per-generation peak in bytes)
+    """
+    step()  # warm-up outside the trace
+    tracemalloc.start()
+    total_peak = 0
+    max_peak = 0
+    for _ in range(timesteps):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        step()
+        _, gen_peak = tracemalloc.get_traced_memory()
+        total_peak += gen_peak - before
+        max_peak = max(max_peak, gen_peak - before)
+    tracemalloc.stop()
+    return total_peak // timesteps, max_peak
+
+
+def run_experiment():
+    """
+    Run the comparison for every grid size and write a CSV of results.
+    """
+    grid_sizes = [100, 250, 500, 1000, 2000]
+    timesteps = 20
+
+    csv_filename = os.path.join(out_dir, f"gol_stepper_allocations_ts{timesteps}.csv")
+    with open(csv_filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "method", "grid_size", "timesteps",
+            "time_per_gen_sec", "mean_peak_bytes_per_gen", "max_peak_bytes_per_gen"
+        ])
+
+        print(f"{'method':<16} {'size':>6} {'ms/gen':>10} {'mean peak MiB':>14} {'max peak MiB':>13}")
+        for size in grid_sizes:
+            grid = np.random.choice([0, 1], size=(size, size), p=[0.8, 0.2])
+
+            state = {"grid": grid}
+
+            def numpy_step():
+                state["grid"] = life_step_numpy(state["grid"])
+
+            stepper = LifeStepper(grid)
+
+            for method, step in (("life_step_numpy", numpy_step),
+                                 ("LifeStepper", stepper.step)):
+                t_gen = time_per_generation(step, timesteps)
+                mean_peak, max_peak = allocations_per_generation(step, timesteps)
+                writer.writerow([
+                    method, size, timesteps,
+                    f"{t_gen:.6f}", mean_peak, max_peak
+                ])
+                print(f"{method:<16} {size:>6} {t_gen * 1e3:>10.3f} "
+                      f"{mean_peak / 2**20:>14.2f} {max_peak / 2**20:>13.2f}")
+
+    print(f"Saved CSV: {csv_filename}")
+
+
+if __name__ == "__main__":
+    run_experiment()
@@ -0,0 +1,54 @@
+"""
+Hardware Queries
+
+CPU and GPU model names of this host, shared by the experiment runners, the
+results database (results_db.py) and the backend calibration
+(backend_calibration.py). Importing this module has no side effects and
+needs nothing beyond the standard library; the queries only run lscpu and
+nvidia-smi when called.
+
+Functions:
+- get_gpu_name: Query the GPU model via nvidia-smi.
+- get_cpu_name: Query the CPU model via lscpu.
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import subprocess
+
+
+def get_gpu_name():
+    """
+    Query the system GPU name via nvidia-smi.
+
+    Returns:
+        The first GPU’s name with spaces replaced by underscores, or
+        'Unknown_GPU' if the command fails.
+    """
+    try:
+        out = subprocess.check_output(
+            ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
+            stderr=subprocess.DEVNULL
+        ).decode().strip().splitlines()
+        return out[0]
+    except Exception:
+        return "Unknown_GPU"
+
+
+def get_cpu_name():
+    """
+    Query the CPU model name via lscpu (Linux).
+
+    Returns:
+        The CPU model string with spaces replaced by underscores, or
+        'Unknown_CPU' if detection fails.
+    """
+    try:
+        out = subprocess.check_output(["lscpu"], stderr=subprocess.DEVNULL).decode().splitlines()
+        for line in out:
+            if line.startswith("Model name:"):
+                return line.split(":", 1)[1].strip()
+    except Exception:
+        pass
+    return "Unknown_CPU"
@@ -0,0 +1,365 @@
+"""
+HashLife Engine for Long Game of Life Horizons
+
+This module implements Gosper's HashLife algorithm: the grid is stored as a
+quadtree of canonical (hash-consed) nodes, and the successor of every node is
+memoised, so repeated sub-patterns are only ever computed once. A level-L node
+(a 2^L × 2^L square) can be advanced 2^j generations (j ≤ L - 2) in a single
+memoised call, which makes settled and periodic states extremely cheap to
+advance over millions of generations.
+
+Toroidal grids are handled by tiling the N×M torus periodically across the
+plane, which evolves exactly like the torus:
+- Square power-of-two grids are tiled by reusing the torus node itself, so
+  the state never leaves the quadtree between jumps.
+- Other sizes are re-tiled from a dense array before each jump, with jumps
+  capped at roughly the grid size.
+
+The canonical-node cache is capped by `max_nodes`. When a jump leaves more
+nodes than that, all memoised results are dropped and only the nodes
+reachable from the current state are kept (a mark-and-rebuild collection).
+
+Main interface:
+- HashLife.from_array(grid) / HashLife.to_array(node): dense <-> quadtree
+- HashLife.advance(grid, generations): advance a dense toroidal grid
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import numpy as np
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Quadtree nodes
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _Node:
+    """
+    Canonical quadtree node of size 2^level × 2^level.
+
+    Level-0 nodes are single cells; higher levels hold four child quadrants.
+    Nodes are compared by identity, which is valid because every node is
+    created through HashLife.join and is therefore unique for its contents.
+    """
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population", "results")
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+        self.results = None
+
+
+_DEAD = _Node(0, None, None, None, None, 0)
+_ALIVE = _Node(0, None, None, None, None, 1)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) HashLife universe
+# ─────────────────────────────────────────────────────────────────────────────
+
+class HashLife:
+    """
+    Memoised quadtree Game of Life engine with a bounded node cache.
+
+    Example:
+        engine = HashLife(max_nodes=2_000_000)
+        final_grid = engine.advance(grid, 1_000_000)
+    """
+
+    def __init__(self, max_nodes: int = 2_000_000):
+        """
+        Args:
+            max_nodes (int): Maximum number of canonical nodes kept between jumps.
+        """
+        self.max_nodes = max_nodes
+        self.collections = 0
+        self._table = {}
+        self._empty = [_DEAD]
+
+    def __len__(self):
+        """Number of canonical nodes currently cached."""
+        return len(self._table)
+
+    # -----------------------------------------------------------------
+    # Node construction
+    # -----------------------------------------------------------------
+    def join(self, nw: _Node, ne: _Node, sw: _Node, se: _Node) -> _Node:
+        """
+        Return the canonical node with the given four quadrants.
+
+        Args:
+            nw, ne, sw, se (_Node): Quadrants of equal level.
+
+        Returns:
+            _Node: Canonical node one level above the quadrants.
+        """
+        key = (nw, ne, sw, se)
+        node = self._table.get(key)
+        if node is None:
+            node = _Node(nw.level + 1, nw, ne, sw, se,
+                         nw.population + ne.population + sw.population + se.population)
+            self._table[key] = node
+        return node
+
+    def empty(self, level: int) -> _Node:
+        """
+        Return the canonical all-dead node of the given level.
+        """
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    # -----------------------------------------------------------------
+    # Successor computation
+    # -----------------------------------------------------------------
+    def _life_4x4(self, node: _Node) -> _Node:
+        """
+        Advance the centre 2×2 of a level-2 node by one generation.
+        """
+        cells = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+        out = []
+        for i in (1, 2):
+            for j in (1, 2):
+                count = 0
+                for di in (-1, 0, 1):
+                    for dj in (-1, 0, 1):
+                        if di or dj:
+                            count += cells[i + di][j + dj].population
+                alive = cells[i][j].population
+                out.append(_ALIVE if count == 3 or (alive and count == 2) else _DEAD)
+        return self.join(*out)
+
+    def successor(self, node: _Node, j: int) -> _Node:
+        """
+        Return the centre of a node advanced 2^j generations.
+
+        Args:
+            node (_Node): Node of level L ≥ 2.
+            j (int): Log2 of the number of generations (capped at L - 2).
+
+        Returns:
+            _Node: Level L - 1 node covering the centre of `node`.
+        """
+        if node.population == 0:
+            return self.empty(node.level - 1)
+        j = min(j, node.level - 2)
+        if node.results is not None:
+            cached = node.results.get(j)
+            if cached is not None:
+                return cached
+        else:
+            node.results = {}
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            join = self.join
+            # Nine overlapping sub-squares, each advanced (partially) in time
+            c1 = self.successor(nw, j)
+            c2 = self.successor(join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = self.successor(ne, j)
+            c4 = self.successor(join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = self.successor(join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = self.successor(join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = self.successor(sw, j)
+            c8 = self.successor(join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = self.successor(se, j)
+
+            if j < node.level - 2:
+                # Only part of the time step is needed: take the centres
+                result = join(
+                    join(c1.se, c2.sw, c4.ne, c5.nw),
+                    join(c2.se, c3.sw, c5.ne, c6.nw),
+                    join(c4.se, c5.sw, c7.ne, c8.nw),
+                    join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                # Full step: advance the four combined quadrants a second time
+                result = join(
+                    self.successor(join(c1, c2, c4, c5), j),
+                    self.successor(join(c2, c3, c5, c6), j),
+                    self.successor(join(c4, c5, c7, c8), j),
+                    self.successor(join(c5, c6, c8, c9), j),
+                )
+
+        node.results[j] = result
+        return result
+
+    # -----------------------------------------------------------------
+    # Cache management
+    # -----------------------------------------------------------------
+    def collect(self, *roots: _Node) -> None:
+        """
+        Evict every cached node and memoised result not reachable from roots.
+
+        Args:
+            *roots (_Node): Nodes that must stay canonical (e.g. the current state).
+        """
+        for node in self._table.values():
+            node.results = None
+        self._table = {}
+        self._empty = [_DEAD]
+        stack = [r for r in roots if r.level > 0]
+        while stack:
+            node = stack.pop()
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in self._table:
+                continue
+            self._table[key] = node
+            if node.level > 1:
+                stack.extend((node.nw, node.ne, node.sw, node.se))
+        self.collections += 1
+
+    def _maybe_collect(self, *roots: _Node) -> None:
+        if len(self._table) > self.max_nodes:
+            self.collect(*roots)
+
+    # -----------------------------------------------------------------
+    # Dense <-> quadtree conversion
+    # -----------------------------------------------------------------
+    def from_array(self, grid: np.ndarray) -> _Node:
+        """
+        Build the quadtree for a square 2^L × 2^L array of 0s and 1s.
+
+        Nodes are built bottom-up: at each level the distinct groups of four
+        child ids are found with np.unique, so only unique nodes are joined
+        in Python.
+
+        Args:
+            grid (np.ndarray): Square array whose side is a power of two.
+
+        Returns:
+            _Node: Canonical node of level log2(side).
+        """
+        size = grid.shape[0]
+        if grid.shape != (size, size) or size & (size - 1):
+            raise ValueError("from_array expects a square grid with a power-of-two side")
+        cells = (np.asarray(grid) != 0)
+        if size == 1:
+            return _ALIVE if cells[0, 0] else _DEAD
+
+        # Level 1: 2×2 blocks encoded as 4-bit ids
+        ids = (cells[0::2, 0::2] * 8 + cells[0::2, 1::2] * 4 +
+               cells[1::2, 0::2] * 2 + cells[1::2, 1::2]).astype(np.int64)
+        leaves = (_DEAD, _ALIVE)
+        nodes = [self.join(leaves[(c >> 3) & 1], leaves[(c >> 2) & 1],
+                           leaves[(c >> 1) & 1], leaves[c & 1]) for c in range(16)]
+
+        while ids.shape[0] > 1:
+            quads = np.stack([ids[0::2, 0::2], ids[0::2, 1::2],
+                              ids[1::2, 0::2], ids[1::2, 1::2]], axis=-1)
+            unique, inverse = np.unique(quads.reshape(-1, 4), axis=0, return_inverse=True)
+            nodes = [self.join(nodes[a], nodes[b], nodes[c], nodes[d])
+                     for a, b, c, d in unique.tolist()]
+            ids = inverse.reshape(quads.shape[:2])
+        return nodes[int(ids[0, 0])]
+
+    def to_array(self, node: _Node) -> np.ndarray:
+        """
+        Expand a quadtree node into a dense uint8 array.
+
+        Args:
+            node (_Node): Node of any level.
+
+        Returns:
+            np.ndarray: 2^level × 2^level array of 0s and 1s.
+        """
+        size = 1 << node.level
+        out = np.zeros((size, size), dtype=np.uint8)
+        stack = [(node, 0, 0)]
+        while stack:
+            n, r, c = stack.pop()
+            if n.population == 0:
+                continue
+            if n.level == 0:
+                out[r, c] = 1
+                continue
+            half = 1 << (n.level - 1)
+            stack.append((n.nw, r, c))
+            stack.append((n.ne, r, c + half))
+            stack.append((n.sw, r + half, c))
+            stack.append((n.se, r + half, c + half))
+        return out
+
+    # -----------------------------------------------------------------
+    # Toroidal driver
+    # -----------------------------------------------------------------
+    def advance(self, grid: np.ndarray, generations: int) -> np.ndarray:
+        """
+        Advance a dense toroidal grid by any number of generations.
+
+        The number of generations is split into power-of-two jumps, each
+        performed by one memoised successor call.
+
+        Args:
+            grid (np.ndarray): 2D array of 0s and 1s (N × M, toroidal).
+            generations (int): Number of generations to advance.
+
+        Returns:
+            np.ndarray: uint8 array of shape (N, M) after `generations` steps.
+        """
+        n_rows, n_cols = grid.shape
+        if n_rows == n_cols and n_rows & (n_rows - 1) == 0:
+            torus = self.from_array(grid)
+            torus = self._advance_torus_node(torus, generations)
+            return self.to_array(torus)
+
+        grid = np.asarray(grid, dtype=np.uint8)
+        # Box of side 2^level: its centre (side 2^(level-1)) covers the torus
+        level = max(2, int(np.ceil(np.log2(max(n_rows, n_cols)))) + 1)
+        max_j = level - 2
+        remaining = generations
+        while remaining:
+            j = min(remaining.bit_length() - 1, max_j)
+            grid = self._jump_dense(grid, level, j)
+            remaining -= 1 << j
+        return grid
+
+    def _advance_torus_node(self, torus: _Node, generations: int) -> _Node:
+        """
+        Advance a power-of-two torus node without leaving the quadtree.
+        """
+        k = torus.level
+        remaining = generations
+        while remaining:
+            j = remaining.bit_length() - 1
+            # Tile the torus until the box can take a 2^j jump (level ≥ j + 2)
+            box = torus
+            while box.level < max(k + 2, j + 2):
+                box = self.join(box, box, box, box)
+            result = self.successor(box, j)
+            # The result starts at an offset that is a multiple of the period,
+            # so its north-west corner is exactly the advanced torus
+            while result.level > k:
+                result = result.nw
+            torus = result
+            remaining -= 1 << j
+            self._maybe_collect(torus)
+        return torus
+
+    def _jump_dense(self, grid: np.ndarray, level: int, j: int) -> np.ndarray:
+        """
+        Advance an arbitrary-size torus 2^j generations via a tiled box.
+        """
+        n_rows, n_cols = grid.shape
+        side = 1 << level
+        box = grid[np.ix_(np.arange(side) % n_rows, np.arange(side) % n_cols)]
+        result = self.successor(self.from_array(box), j)
+        centre = self.to_array(result)
+        offset = side >> 2
+        advanced = np.roll(centre[:n_rows, :n_cols],
+                           (offset % n_rows, offset % n_cols), axis=(0, 1))
+        self._maybe_collect()
+        return advanced
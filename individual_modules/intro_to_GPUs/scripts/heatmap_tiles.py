@@ -0,0 +1,333 @@
+"""
+Zoomable Tile Pyramid for Large Alive-count Heatmaps
+
+plot_heatmap (game_of_life_mem_opt.py) draws the whole N×N counts array with
+plt.imshow into a single PNG, which needs several copies of the array in
+matplotlib and still throws away almost all detail for large N. This module
+exports the counts as a tile pyramid instead:
+
+- the deepest level holds the counts at full resolution, cut into tile×tile
+  PNG tiles; every level above halves both sides with 2×2 max- or
+  mean-pooling, up to a level that fits in one tile
+- counts are streamed in bands of `tile` rows, so an np.memmap (e.g. a .npy
+  opened with mmap_mode="r") is never loaded whole; each level only buffers
+  one band of its own rows
+- values are mapped to the 'hot' colormap through a 256-entry palette, and
+  the palette tiles are encoded to PNG by a process pool
+- a self-contained index.html viewer (pan by dragging, zoom with the wheel)
+  is written next to the tiles
+
+Tiles are stored as <out_dir>/<z>/<x>_<y>.png, with z = 0 the coarsest level.
+
+Usage:
+    python heatmap_tiles.py counts.npy heatmap_tiles --pooling max --workers 8
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+POOLING_CHOICES = ("max", "mean")
+
+# Tiles queued per pool worker before the producer waits for the oldest
+TILES_IN_FLIGHT_PER_WORKER = 4
+
+
+def colormap_palette(cmap: str = "hot") -> list:
+    """
+    Flattened 256-entry RGB palette sampled from a matplotlib colormap.
+    """
+    import matplotlib
+    colours = matplotlib.colormaps[cmap](np.linspace(0, 1, 256))[:, :3]
+    return np.rint(colours * 255).astype(np.uint8).ravel().tolist()
+
+
+def _encode_tile(path: str, indices: np.ndarray, palette: list) -> None:
+    """Write one palette tile as PNG (runs in a pool worker)."""
+    im = Image.fromarray(indices)
+    im.putpalette(palette)
+    im.save(path, optimize=False)
+
+
+def pool2(values: np.ndarray, pooling: str = "max") -> np.ndarray:
+    """
+    Halve both sides of a 2D array with 2×2 max- or mean-pooling.
+
+    Odd edges are pooled over the cells that exist, so an (h, w) input gives
+    a (ceil(h / 2), ceil(w / 2)) result.
+    """
+    h, w = values.shape
+    padded = np.zeros((h + h % 2, w + w % 2), dtype=np.float32)
+    padded[:h, :w] = values
+    blocks = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2)
+    if pooling == "max":
+        # Counts are non-negative, so the zero padding never wins
+        return blocks.max(axis=(1, 3))
+    row_cells = np.minimum(2, h - 2 * np.arange(padded.shape[0] // 2))
+    col_cells = np.minimum(2, w - 2 * np.arange(padded.shape[1] // 2))
+    return blocks.sum(axis=(1, 3)) / np.outer(row_cells, col_cells)
+
+
+def stream_max(counts: np.ndarray, band_rows: int = 256) -> float:
+    """Maximum of `counts`, read in row bands (suitable for memmaps)."""
+    vmax = 0
+    for r0 in range(0, counts.shape[0], band_rows):
+        vmax = max(vmax, float(counts[r0:r0 + band_rows].max()))
+    return vmax
+
+
+class _PyramidLevel:
+    """
+    One pyramid level: buffers rows until a full tile row is available,
+    emits its tiles and feeds the pooled rows to the next coarser level.
+    """
+
+    def __init__(self, z: int, tile: int, pooling: str, emit, coarser=None):
+        self.z = z
+        self.tile = tile
+        self.pooling = pooling
+        self.emit = emit
+        self.coarser = coarser
+        self.rows = []
+        self.n_rows = 0
+        self.tile_row = 0
+
+    def feed(self, band: np.ndarray) -> None:
+        self.rows.append(band)
+        self.n_rows += band.shape[0]
+        while self.n_rows >= self.tile:
+            buffered = np.concatenate(self.rows) if len(self.rows) > 1 else self.rows[0]
+            self._emit_row(buffered[:self.tile])
+            rest = buffered[self.tile:]
+            self.rows = [rest] if rest.shape[0] else []
+            self.n_rows = rest.shape[0]
+
+    def flush(self) -> None:
+        if self.n_rows:
+            self._emit_row(np.concatenate(self.rows))
+            self.rows, self.n_rows = [], 0
+        if self.coarser is not None:
+            self.coarser.flush()
+
+    def _emit_row(self, band: np.ndarray) -> None:
+        for x, c0 in enumerate(range(0, band.shape[1], self.tile)):
+            self.emit(self.z, x, self.tile_row, band[:, c0:c0 + self.tile])
+        self.tile_row += 1
+        if self.coarser is not None:
+            self.coarser.feed(pool2(band, self.pooling))
+
+
+def export_tile_pyramid(counts: np.ndarray, out_dir: Path, tile: int = 256, pooling: str = "max",
+                        vmax: float = None, cmap: str = "hot", workers: int = None) -> dict:
+    """
+    Write a zoomable PNG tile pyramid of `counts` plus an HTML viewer.
+
+    Args:
+        counts (np.ndarray): 2D array of alive counts; may be an np.memmap.
+        out_dir (Path): Output directory (tiles, pyramid.json, index.html).
+        tile (int): Tile side in pixels.
+        pooling (str): "max" keeps isolated hot cells visible when zoomed
+            out; "mean" shows the average count.
+        vmax (float): Count mapped to the top of the colormap (defaults to
+            the maximum of counts, found in one extra streaming pass).
+        cmap (str): Matplotlib colormap name.
+        workers (int): Processes encoding tiles (defaults to os.cpu_count();
+            1 encodes in this process).
+
+    Returns:
+        dict: Pyramid metadata, as written to pyramid.json.
+    """
+    if pooling not in POOLING_CHOICES:
+        raise ValueError(f"pooling must be one of {POOLING_CHOICES}, got {pooling!r}")
+    out_dir = Path(out_dir)
+    height, width = counts.shape
+    levels = max(0, math.ceil(math.log2(max(height, width) / tile))) + 1
+    for z in range(levels):
+        (out_dir / str(z)).mkdir(parents=True, exist_ok=True)
+    if vmax is None:
+        vmax = stream_max(counts, tile)
+    scale = 255.0 / vmax if vmax > 0 else 0.0
+    palette = colormap_palette(cmap)
+    workers = workers or os.cpu_count() or 1
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    pending = []
+    n_tiles = 0
+
+    def emit(z, x, y, values):
+        nonlocal n_tiles
+        indices = np.rint(np.minimum(values * scale, 255)).astype(np.uint8)
+        path = str(out_dir / str(z) / f"{x}_{y}.png")
+        n_tiles += 1
+        if pool is None:
+            _encode_tile(path, indices, palette)
+            return
+        # Bound the tiles waiting in the pool, so memory stays flat
+        if len(pending) >= TILES_IN_FLIGHT_PER_WORKER * workers:
+            pending.pop(0).result()
+        pending.append(pool.submit(_encode_tile, path, indices, palette))
+
+    # Chain from the coarsest level (z = 0) to full resolution
+    level = None
+    for z in range(levels):
+        level = _PyramidLevel(z, tile, pooling, emit, coarser=level)
+
+    t0 = time.perf_counter()
+    try:
+        for r0 in range(0, height, tile):
+            level.feed(np.asarray(counts[r0:r0 + tile], dtype=np.float32))
+        level.flush()
+        for future in pending:
+            future.result()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    info = {"width": width, "height": height, "tile": tile, "levels": levels,
+            "pooling": pooling, "vmax": vmax, "cmap": cmap, "n_tiles": n_tiles,
+            "seconds": time.perf_counter() - t0}
+    with open(out_dir / "pyramid.json", "w") as f:
+        json.dump(info, f, indent=2)
+    write_viewer(out_dir, info)
+    return info
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Viewer
+# ─────────────────────────────────────────────────────────────────────────────
+
+VIEWER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Alive-count heatmap</title>
+<style>
+  html, body { margin: 0; height: 100%; overflow: hidden; background: #222; }
+  #view { position: absolute; inset: 0; cursor: grab; }
+  #view img { position: absolute; image-rendering: pixelated; user-select: none; }
+  #label { position: absolute; left: 8px; top: 8px; color: #eee; font: 13px sans-serif; }
+</style>
+</head>
+<body>
+<div id="view"></div>
+<div id="label"></div>
+<script>
+const info = __INFO__;
+const view = document.getElementById("view");
+const label = document.getElementById("label");
+let z = 0, zoom = 1, ox = 20, oy = 20, drag = null;
+const tiles = new Map();
+
+function levelSize(level) {
+  const f = 2 ** (info.levels - 1 - level);
+  return [Math.ceil(info.width / f), Math.ceil(info.height / f)];
+}
+
+function render() {
+  // Pick the level whose pixels are closest to screen pixels
+  z = Math.max(0, Math.min(info.levels - 1, Math.round(Math.log2(zoom)) + info.levels - 1));
+  const px = zoom * 2 ** (info.levels - 1 - z);   // screen pixels per level pixel
+  const [w, h] = levelSize(z);
+  const size = info.tile * px;
+  const x0 = Math.max(0, Math.floor(-ox / size)), y0 = Math.max(0, Math.floor(-oy / size));
+  const x1 = Math.min(Math.ceil(w / info.tile), Math.ceil((view.clientWidth - ox) / size));
+  const y1 = Math.min(Math.ceil(h / info.tile), Math.ceil((view.clientHeight - oy) / size));
+  const wanted = new Set();
+  for (let y = y0; y < y1; y++) {
+    for (let x = x0; x < x1; x++) {
+      const key = `${z}/${x}_${y}`;
+      wanted.add(key);
+      let img = tiles.get(key);
+      if (!img) {
+        img = new Image();
+        img.src = `${key}.png`;
+        img.draggable = false;
+        tiles.set(key, img);
+        view.appendChild(img);
+      }
+      img.style.left = `${ox + x * size}px`;
+      img.style.top = `${oy + y * size}px`;
+      img.style.width = `${Math.min(info.tile, w - x * info.tile) * px}px`;
+    }
+  }
+  for (const [key, img] of tiles) {
+    if (!wanted.has(key)) { img.remove(); tiles.delete(key); }
+  }
+  label.textContent = `${info.width}×${info.height} cells, level ${z}/${info.levels - 1}, ` +
+                      `${info.pooling}-pooled, max count ${info.vmax}`;
+}
+
+view.addEventListener("wheel", (e) => {
+  e.preventDefault();
+  const f = e.deltaY < 0 ? 1.25 : 0.8;
+  ox = e.clientX - (e.clientX - ox) * f;
+  oy = e.clientY - (e.clientY - oy) * f;
+  zoom *= f;
+  render();
+}, { passive: false });
+view.addEventListener("mousedown", (e) => { drag = [e.clientX - ox, e.clientY - oy]; });
+window.addEventListener("mouseup", () => { drag = null; });
+window.addEventListener("mousemove", (e) => {
+  if (drag) { ox = e.clientX - drag[0]; oy = e.clientY - drag[1]; render(); }
+});
+window.addEventListener("resize", render);
+
+// Start zoomed out so the whole grid fits the window
+zoom = Math.min((window.innerWidth - 40) / info.width, (window.innerHeight - 40) / info.height);
+render();
+</script>
+</body>
+</html>
+"""
+
+
+def write_viewer(out_dir: Path, info: dict) -> Path:
+    """
+    Write index.html, a dependency-free pan/zoom viewer for the pyramid.
+
+    Open it from the file system; tiles are loaded with relative paths.
+    """
+    path = Path(out_dir) / "index.html"
+    path.write_text(VIEWER_HTML.replace("__INFO__", json.dumps(info)))
+    return path
+
+
+def main():
+    """
+    Command-line entry: export the tile pyramid of a counts .npy file.
+
+    The file is opened with mmap_mode="r", so it is streamed rather than loaded.
+    """
+    p = argparse.ArgumentParser("Alive-count tile pyramid")
+    p.add_argument("counts",    type=Path, help="Counts array saved with np.save (.npy)")
+    p.add_argument("out_dir",   type=Path, help="Output directory for tiles and index.html")
+    p.add_argument("--tile",    type=int, default=256, help="Tile side in pixels")
+    p.add_argument("--pooling", choices=POOLING_CHOICES, default="max", help="Pooling between levels")
+    p.add_argument("--vmax",    type=float, default=None, help="Count at the top of the colormap")
+    p.add_argument("--cmap",    default="hot", help="Matplotlib colormap")
+    p.add_argument("--workers", type=int, default=None, help="Tile-encoding processes")
+    args = p.parse_args()
+
+    counts = np.load(args.counts, mmap_mode="r")
+    info = export_tile_pyramid(counts, args.out_dir, tile=args.tile, pooling=args.pooling,
+                               vmax=args.vmax, cmap=args.cmap, workers=args.workers)
+    print(f"[Tiles] {info['n_tiles']} tiles over {info['levels']} levels in {info['seconds']:.2f} s; "
+          f"open {args.out_dir / 'index.html'}")
+
+
+if __name__ == "__main__":
+    main()
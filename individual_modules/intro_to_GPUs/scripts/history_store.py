@@ -0,0 +1,303 @@
+"""
+Chunked On-disk History Store for the Game of Life
+
+Recording every generation of a large run as a list of dense grids quickly
+exhausts memory. This module streams generations to a directory instead:
+
+- each frame is bit-packed along its rows (8 cells per byte)
+- optionally, each frame is stored as the XOR against the previous frame of
+  the same chunk (settled regions become runs of zero bytes)
+- every `chunk_size` frames are compressed together with zlib or lz4 and
+  written as one file. By default a chunk holds up to 64 frames but no more
+  than CHUNK_BYTES of packed frames, so large grids use fewer frames per
+  chunk instead of a buffer of several gigabytes
+- metadata.json describes the shape, frame count and encoding, and is
+  rewritten after every chunk so a partial run can still be read
+
+HistoryWriter appends frames; HistoryStore gives lazy, random access by
+generation index and keeps at most one decoded chunk in memory. HistoryStore
+behaves like the history list (len, indexing, iteration), so animate_life can
+replay it directly.
+
+Layout of a store directory:
+
+    metadata.json
+    chunk_000000.bin
+    chunk_000001.bin
+    ...
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import json
+import os
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # lz4 is optional; zlib is always available
+    lz4_frame = None
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+METADATA_FILE = "metadata.json"
+COMPRESSIONS = ("zlib", "lz4", "none")
+
+# Default bounds on one chunk: frames, and bytes of packed frames
+MAX_CHUNK_FRAMES = 64
+CHUNK_BYTES = 64 * 1024 ** 2
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Encoding helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _compress(data: bytes, compression: str, level: int) -> bytes:
+    if compression == "zlib":
+        return zlib.compress(data, level)
+    if compression == "lz4":
+        return lz4_frame.compress(data, compression_level=level)
+    return data
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "zlib":
+        return zlib.decompress(data)
+    if compression == "lz4":
+        return lz4_frame.decompress(data)
+    return data
+
+
+def _check_compression(compression: str) -> None:
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"compression must be one of {COMPRESSIONS}, got {compression!r}")
+    if compression == "lz4" and lz4_frame is None:
+        raise ImportError("compression='lz4' requires the lz4 package (pip install lz4)")
+
+
+def _chunk_path(path: Path, index: int) -> Path:
+    return path / f"chunk_{index:06d}.bin"
+
+
+def chunk_frames(shape, chunk_bytes: int = CHUNK_BYTES) -> int:
+    """
+    Default frames per chunk for a grid shape.
+
+    Args:
+        shape (tuple[int, int]): Grid shape (N, M).
+        chunk_bytes (int): Upper bound on the packed frames of one chunk.
+
+    Returns:
+        int: Up to MAX_CHUNK_FRAMES frames, fewer when they would exceed
+        chunk_bytes, and at least one.
+    """
+    frame_bytes = int(shape[0]) * ((int(shape[1]) + 7) // 8)
+    return max(1, min(MAX_CHUNK_FRAMES, chunk_bytes // frame_bytes))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Writer
+# ─────────────────────────────────────────────────────────────────────────────
+
+class HistoryWriter:
+    """
+    Stream Game of Life generations into a chunked on-disk store.
+
+    Only the frames of the chunk being filled are held in memory, as packed
+    bytes, so memory use is independent of the number of generations.
+
+    Args:
+        path (Path): Directory of the store (created if needed; existing
+            chunk files are overwritten).
+        shape (tuple[int, int]): Grid shape (N, M).
+        chunk_size (int): Frames per compressed chunk (default: chunk_frames
+            of the shape).
+        delta (bool): Store frames as XOR against the previous frame.
+        compression (str): "zlib", "lz4" or "none".
+        level (int): Compression level passed to the compressor.
+    """
+
+    def __init__(self, path: Path, shape, chunk_size: int = None, delta: bool = True,
+                 compression: str = "zlib", level: int = 1):
+        _check_compression(compression)
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.shape = tuple(int(s) for s in shape)
+        self.chunk_size = chunk_size or chunk_frames(self.shape)
+        self.delta = delta
+        self.compression = compression
+        self.level = level
+
+        packed_cols = (self.shape[1] + 7) // 8
+        self._frames = np.empty((self.chunk_size, self.shape[0], packed_cols), dtype=np.uint8)
+        self._fill = 0
+        self._previous = None
+        self._n_frames = 0
+        self._n_chunks = 0
+        self._stored_bytes = 0
+        self._closed = False
+
+    def append(self, grid) -> None:
+        """
+        Add the next generation to the store.
+
+        Args:
+            grid (np.ndarray): 2D array of 0s and 1s with the store's shape.
+        """
+        if self._closed:
+            raise ValueError("cannot append to a closed HistoryWriter")
+        grid = np.asarray(grid)
+        if grid.shape != self.shape:
+            raise ValueError(f"expected a grid of shape {self.shape}, got {grid.shape}")
+        packed = np.packbits(grid != 0, axis=1, bitorder="little")
+        if self.delta and self._fill > 0:
+            # The first frame of a chunk is stored as is, so chunks decode independently
+            np.bitwise_xor(packed, self._previous, out=self._frames[self._fill])
+        else:
+            self._frames[self._fill] = packed
+        self._previous = packed
+        self._fill += 1
+        self._n_frames += 1
+        if self._fill == self.chunk_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._fill == 0:
+            return
+        data = _compress(self._frames[:self._fill].tobytes(), self.compression, self.level)
+        _chunk_path(self.path, self._n_chunks).write_bytes(data)
+        self._stored_bytes += len(data)
+        self._n_chunks += 1
+        self._fill = 0
+        self._write_metadata()
+
+    def _write_metadata(self) -> None:
+        meta = {
+            "shape": list(self.shape),
+            "n_frames": self._n_frames,
+            "chunk_size": self.chunk_size,
+            "delta": self.delta,
+            "compression": self.compression,
+            "bitorder": "little",
+            "stored_bytes": self._stored_bytes,
+        }
+        tmp = self.path / (METADATA_FILE + ".tmp")
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, self.path / METADATA_FILE)
+
+    def __len__(self) -> int:
+        return self._n_frames
+
+    def close(self) -> "HistoryStore":
+        """
+        Flush the last partial chunk and return a reader for the store.
+        """
+        if not self._closed:
+            self._flush()
+            self._write_metadata()
+            self._closed = True
+        return HistoryStore(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3) Reader (lazy random access)
+# ─────────────────────────────────────────────────────────────────────────────
+
+class HistoryStore:
+    """
+    Read-only, lazily decoded view of a store written by HistoryWriter.
+
+    Supports len(), integer indexing (negative indices included) and
+    iteration; each access returns a uint8 (N, M) grid. The most recently
+    decoded chunk is cached, so sequential reads decompress each chunk once.
+
+    Args:
+        path (Path): Directory of the store.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        meta = json.loads((self.path / METADATA_FILE).read_text())
+        self.shape = tuple(meta["shape"])
+        self.chunk_size = meta["chunk_size"]
+        self.delta = meta["delta"]
+        self.compression = meta["compression"]
+        self.stored_bytes = meta["stored_bytes"]
+        self._n_frames = meta["n_frames"]
+        _check_compression(self.compression)
+        self._packed_cols = (self.shape[1] + 7) // 8
+        self._cached_index = None
+        self._cached_frames = None
+
+    def __len__(self) -> int:
+        return self._n_frames
+
+    @property
+    def raw_bytes(self) -> int:
+        """Size the history would take as a list of uint8 grids."""
+        return self._n_frames * self.shape[0] * self.shape[1]
+
+    def _chunk(self, index: int) -> np.ndarray:
+        if index != self._cached_index:
+            data = _decompress(_chunk_path(self.path, index).read_bytes(), self.compression)
+            frames = np.frombuffer(data, dtype=np.uint8).reshape(-1, self.shape[0], self._packed_cols)
+            if self.delta:
+                frames = np.bitwise_xor.accumulate(frames, axis=0)
+            self._cached_index = index
+            self._cached_frames = frames
+        return self._cached_frames
+
+    def __getitem__(self, idx: int) -> np.ndarray:
+        if idx < 0:
+            idx += self._n_frames
+        if not 0 <= idx < self._n_frames:
+            raise IndexError(f"generation {idx} out of range for a history of {self._n_frames} frames")
+        packed = self._chunk(idx // self.chunk_size)[idx % self.chunk_size]
+        return np.unpackbits(packed, axis=1, count=self.shape[1], bitorder="little")
+
+    def __iter__(self):
+        for idx in range(self._n_frames):
+            yield self[idx]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 4) Helpers for the simulate_life_* functions
+# ─────────────────────────────────────────────────────────────────────────────
+
+def open_history(record_history: bool, shape, history_dir: Path = None, **store_options):
+    """
+    Create the history sink used by a simulate_life_* function.
+
+    Returns:
+        None if nothing is recorded, a HistoryWriter if history_dir is given,
+        otherwise an empty list. All sinks support .append(grid).
+    """
+    if not record_history:
+        return None
+    if history_dir is not None:
+        return HistoryWriter(history_dir, shape, **store_options)
+    return []
+
+
+def finish_history(history):
+    """
+    Close a history sink created by open_history.
+
+    Returns:
+        HistoryStore, list[np.ndarray] or None: What the simulation returns.
+    """
+    if isinstance(history, HistoryWriter):
+        return history.close()
+    return history
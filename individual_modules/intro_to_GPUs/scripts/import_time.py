@@ -0,0 +1,228 @@
+"""
+Import-Time Benchmark for the Entry Points
+
+Every `poetry run` entry point pays for importing its module before any work
+starts. This script imports each entry-point module in a fresh interpreter
+under `python -X importtime`, parses the timings written to stderr and
+prints a table:
+
+- total import time of the module (best of --repeats runs)
+- the slowest top-level packages it pulls in
+- any heavy library (CuPy, matplotlib, plotly, xarray) loaded at start-up,
+  which lazy_imports.py and the function-level imports are meant to avoid
+
+Startup regressions fail the run (exit status 1): a heavy library loaded by a
+module that must not import it, or, with --baseline, a total import time
+more than --tolerance slower than the saved one.
+
+Usage:
+    python import_time.py                           # all entry points
+    python import_time.py game_of_life --top 15
+    python import_time.py --json import_times.json  # save a baseline
+    python import_time.py --baseline import_times.json
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Libraries that are slow to import or need a GPU
+HEAVY_MODULES = ("cupy", "cupyx", "matplotlib", "plotly", "xarray")
+
+# Entry-point module -> heavy libraries it may load at import time
+ENTRY_POINTS = {
+    "game_of_life": (),
+    "game_of_life_jit": (),
+    "game_of_life_mem_opt": (),
+    "game_of_life_profiled": (),
+    "temperature_diffusion": (),
+    "support_scripts": (),
+}
+
+# "import time: self [us] | cumulative | imported package" lines
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Measuring
+# ─────────────────────────────────────────────────────────────────────────────
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parse the stderr of `python -X importtime`.
+
+    Args:
+        stderr (str): Text written by the interpreter.
+
+    Returns:
+        list[dict]: One row per imported module, in completion order, with
+        "module", "self_us", "cumulative_us" and "depth" (0 = imported by
+        the top-level statement).
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append({"module": module, "self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                         # the first level is indented by one space, each further level by two
+                         "depth": (len(indent) - 1) // 2})
+    return rows
+
+
+def measure(module: str, repeats: int = 5, python: str = sys.executable) -> dict:
+    """
+    Import `module` in `repeats` fresh interpreters and keep the fastest run.
+
+    Args:
+        module (str): Module name, importable from the scripts directory.
+        repeats (int): Interpreter launches; the minimum is least disturbed
+            by other load on the machine.
+        python (str): Interpreter to run.
+
+    Returns:
+        dict: "module", "total_ms" (cumulative time of the module itself),
+        "rows" (parsed rows of the fastest run) and "heavy" (heavy libraries
+        that were imported).
+
+    Raises:
+        RuntimeError: If the module fails to import.
+    """
+    best = None
+    for _ in range(repeats):
+        result = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                                cwd=SCRIPTS_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+        rows = parse_importtime(result.stderr)
+        total = next(row["cumulative_us"] for row in reversed(rows) if row["module"] == module)
+        if best is None or total < best["total_us"]:
+            best = {"total_us": total, "rows": rows}
+
+    loaded = {row["module"].split(".")[0] for row in best["rows"]}
+    return {
+        "module": module,
+        "total_ms": best["total_us"] / 1000,
+        "rows": best["rows"],
+        "heavy": sorted(loaded & set(HEAVY_MODULES)),
+    }
+
+
+def top_packages(rows: list, n: int = 10) -> list:
+    """
+    Return the n slowest top-level packages of a run.
+
+    A package's time is the cumulative time of its own row (e.g. "numpy"),
+    which includes its submodules; packages already imported by the
+    interpreter at start-up do not appear. The measured module itself is
+    one of the rows.
+
+    Returns:
+        list[tuple[str, float]]: (package, milliseconds), slowest first.
+    """
+    packages = [(row["module"], row["cumulative_us"] / 1000) for row in rows if "." not in row["module"]]
+    return sorted(packages, key=lambda item: item[1], reverse=True)[:n]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Reporting
+# ─────────────────────────────────────────────────────────────────────────────
+
+def check(result: dict, baseline: dict = None, tolerance: float = 0.25, min_delta_ms: float = 5.0) -> list:
+    """
+    List the start-up regressions of one measurement.
+
+    Args:
+        result (dict): Output of measure().
+        baseline (dict): Module -> total_ms from an earlier --json run.
+        tolerance (float): Allowed relative slowdown against the baseline.
+        min_delta_ms (float): Slowdowns smaller than this are ignored as noise.
+
+    Returns:
+        list[str]: Human-readable problems; empty if there are none.
+    """
+    problems = []
+    allowed = ENTRY_POINTS.get(result["module"], ())
+    unexpected = [name for name in result["heavy"] if name not in allowed]
+    if unexpected:
+        problems.append(f"{result['module']} imports {', '.join(unexpected)} at start-up")
+    if baseline and result["module"] in baseline:
+        before = baseline[result["module"]]
+        delta = result["total_ms"] - before
+        if delta > min_delta_ms and delta > tolerance * before:
+            problems.append(f"{result['module']} import time {before:.1f} ms -> {result['total_ms']:.1f} ms "
+                            f"(+{100 * delta / before:.0f}%)")
+    return problems
+
+
+def print_table(results: list, baseline: dict = None, top: int = 5) -> None:
+    """Print the total import time per module and its slowest packages."""
+    width = max(len(result["module"]) for result in results)
+    print(f"{'module':<{width}}  {'total ms':>9}  {'baseline':>9}  heavy imports")
+    for result in results:
+        before = (baseline or {}).get(result["module"])
+        before = "" if before is None else f"{before:.1f}"
+        print(f"{result['module']:<{width}}  {result['total_ms']:>9.1f}  {before:>9}  "
+              f"{', '.join(result['heavy']) or '-'}")
+    if top:
+        for result in results:
+            print(f"\n{result['module']}: slowest packages")
+            for package, ms in top_packages(result["rows"], top + 1):
+                if package == result["module"]:
+                    continue
+                print(f"  {package:<32} {ms:>8.1f} ms")
+
+
+def main():
+    """
+    CLI: measure the entry-point modules, print the table and exit with
+    status 1 on a start-up regression.
+    """
+    p = argparse.ArgumentParser(description="Measure entry-point import times with python -X importtime")
+    p.add_argument("modules", nargs="*", default=list(ENTRY_POINTS),
+                   help="Modules to measure (default: all entry points)")
+    p.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per module (best is kept)")
+    p.add_argument("--top", type=int, default=5, help="Slowest packages listed per module (0 to skip)")
+    p.add_argument("--json", type=Path, default=None, help="Write the totals (a baseline) to this file")
+    p.add_argument("--baseline", type=Path, default=None, help="Compare against totals saved with --json")
+    p.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown vs the baseline")
+    p.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore slowdowns smaller than this")
+    args = p.parse_args()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    results, problems = [], []
+    for module in args.modules:
+        try:
+            result = measure(module, args.repeats)
+        except RuntimeError as exc:
+            problems.append(str(exc))
+            continue
+        results.append(result)
+        problems.extend(check(result, baseline, args.tolerance, args.min_delta_ms))
+
+    if results:
+        print_table(results, baseline, args.top)
+    if args.json:
+        args.json.write_text(json.dumps({r["module"]: round(r["total_ms"], 3) for r in results}, indent=2))
+        print(f"\nSaved import times to {args.json}")
+    if problems:
+        print("\nStart-up regressions:")
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
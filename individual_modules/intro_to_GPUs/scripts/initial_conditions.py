@@ -0,0 +1,98 @@
+"""
+Seeded, Parallel Initial Grids for the Game of Life
+
+Every simulator starts from a random soup in which each cell is alive with
+probability p_alive. This module generates that soup once, the same way for
+all of them:
+
+- the grid is split into fixed bands of BAND_ROWS rows
+- one root SeedSequence(seed) is spawned into one child seed per band, and
+  each band is drawn from its own PCG64 generator
+- bands are filled by a thread pool (NumPy releases the GIL while drawing),
+  writing straight into the output array
+
+Because the bands and their seeds do not depend on the number of workers,
+the same seed gives the same grid for any `workers`. Grids can be returned
+as uint8 (one cell per byte) or bit-packed in the uint64 layout of
+game_of_life.pack_grid, in which case the full uint8 grid is never allocated.
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Rows per band; part of the seed -> grid mapping, so changing it changes grids
+BAND_ROWS = 64
+
+
+def _fill_band(seed, p_alive, rows, packed_rows=None):
+    """
+    Draw one band of cells into `rows` (uint8) or pack them into `packed_rows`.
+    """
+    rng = np.random.Generator(np.random.PCG64(seed))
+    draws = rng.random(rows.shape, dtype=np.float32)
+    np.less(draws, p_alive, out=rows, casting="unsafe")
+    if packed_rows is not None:
+        n_bytes = -(-rows.shape[1] // 8)
+        # Little-endian uint64 words: byte k of a row holds columns 8k .. 8k+7
+        packed_bytes = packed_rows.view(np.uint8)
+        packed_bytes[:, :n_bytes] = np.packbits(rows, axis=1, bitorder="little")
+        packed_bytes[:, n_bytes:] = 0
+
+
+def random_grid(N: int, M: int = None, p_alive: float = 0.2, seed=None, workers: int = None,
+                packed: bool = False, out: np.ndarray = None) -> np.ndarray:
+    """
+    Generate a random N×M grid of 0s and 1s.
+
+    Args:
+        N (int): Number of rows.
+        M (int): Number of columns (defaults to N).
+        p_alive (float): Probability that a cell starts alive.
+        seed (int or SeedSequence): Root seed; None draws fresh entropy.
+        workers (int): Threads filling bands (defaults to os.cpu_count()).
+            The result does not depend on it.
+        packed (bool): Return the bit-packed uint64 layout of pack_grid,
+            shape (N, ceil(M / 64)), instead of uint8 cells.
+        out (np.ndarray): Optional preallocated output of the right shape
+            and dtype.
+
+    Returns:
+        np.ndarray: uint8 grid of shape (N, M), or the packed uint64 grid.
+    """
+    M = N if M is None else M
+    workers = workers or os.cpu_count() or 1
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    starts = range(0, N, BAND_ROWS)
+    band_seeds = root.spawn(len(starts))
+
+    shape = (N, -(-M // 64)) if packed else (N, M)
+    dtype = np.uint64 if packed else np.uint8
+    if out is None:
+        out = np.zeros(shape, dtype=dtype)
+    elif out.shape != shape or out.dtype != dtype:
+        raise ValueError(f"out must have shape {shape} and dtype {np.dtype(dtype)}")
+
+    def fill(band):
+        r0 = starts[band]
+        r1 = min(r0 + BAND_ROWS, N)
+        if packed:
+            _fill_band(band_seeds[band], p_alive, np.empty((r1 - r0, M), dtype=np.uint8), out[r0:r1])
+        else:
+            _fill_band(band_seeds[band], p_alive, out[r0:r1])
+
+    if workers == 1 or len(starts) == 1:
+        for band in range(len(starts)):
+            fill(band)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(fill, range(len(starts))))
+    return out
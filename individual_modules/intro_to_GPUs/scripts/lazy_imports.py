@@ -0,0 +1,105 @@
+"""
+Lazy Backend Imports
+
+CuPy, matplotlib, plotly and xarray are slow to import, and CuPy cannot be
+imported at all on a CPU-only node. The simulation modules therefore import
+them inside the functions that use them, so `game_of_life_cpu` starts quickly
+and runs without CUDA. This module holds the pieces shared by those modules:
+
+- require_cupy(): import CuPy on first use of a GPU code path, with an error
+  that says what is missing instead of a traceback from deep inside CuPy
+- cupy_available(): whether the GPU backend can run on this machine
+- time_range(): NVTX range decorator like cupyx.profiler.time_range, bound
+  on the first call and a plain call when CuPy is not installed
+
+Usage:
+    cp = require_cupy()
+    grid_gpu = cp.asarray(grid)
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import functools
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+CUPY_HINT = ("install the CuPy wheel matching your CUDA version (e.g. pip install cupy-cuda12x) "
+             "or choose a CPU backend")
+
+# Result of the first require_cupy() check: the module, or the error to re-raise
+_cupy_state = {}
+
+
+def require_cupy():
+    """
+    Import CuPy for a GPU code path.
+
+    The check runs once per process: CuPy must import and see at least one
+    CUDA device.
+
+    Returns:
+        module: The cupy module.
+
+    Raises:
+        ImportError: If CuPy is not installed.
+        RuntimeError: If CuPy is installed but no CUDA device is usable.
+    """
+    if not _cupy_state:
+        try:
+            import cupy
+        except ImportError as exc:
+            _cupy_state["error"] = ImportError(f"The CuPy (GPU) backend needs CuPy: {CUPY_HINT}")
+            _cupy_state["cause"] = exc
+        else:
+            try:
+                n_devices = cupy.cuda.runtime.getDeviceCount()
+            except Exception as exc:  # CUDARuntimeError when there is no driver
+                n_devices = 0
+                _cupy_state["cause"] = exc
+            if n_devices:
+                _cupy_state["module"] = cupy
+            else:
+                _cupy_state["error"] = RuntimeError(f"CuPy is installed but found no CUDA device; {CUPY_HINT}")
+    if "module" in _cupy_state:
+        return _cupy_state["module"]
+    raise _cupy_state["error"] from _cupy_state.get("cause")
+
+
+def cupy_available() -> bool:
+    """Return True if require_cupy() would succeed."""
+    try:
+        require_cupy()
+    except (ImportError, RuntimeError):
+        return False
+    return True
+
+
+def time_range(message: str = None):
+    """
+    Decorator adding an NVTX range around each call, as cupyx.profiler.time_range.
+
+    cupyx is imported on the first call rather than at decoration time, so
+    decorated CPU functions stay importable without CuPy; without CuPy they
+    are called undecorated.
+
+    Args:
+        message (str): Range name; defaults to the function name.
+    """
+    def decorator(func):
+        bound = []
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not bound:
+                try:
+                    from cupyx.profiler import time_range as cupy_time_range
+                except ImportError:
+                    bound.append(func)
+                else:
+                    bound.append(cupy_time_range(message)(func))
+            return bound[0](*args, **kwargs)
+        return wrapper
+    return decorator
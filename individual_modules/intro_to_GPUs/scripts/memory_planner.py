@@ -0,0 +1,312 @@
+"""
+Memory-budget Planning for Game of Life Runs
+
+The run_life_* entry points used to decide "size > 100 means no history",
+and game_of_life_mem_opt.py only reports the peak RSS once the run is over.
+This module estimates the peak memory of a run before it starts, from the
+buffers each part of it allocates:
+
+- baseline: the process as it is when planning (interpreter, NumPy,
+  matplotlib and anything else already imported), read from ru_maxrss
+- grid: the backend's stepping buffers (e.g. LifeStepper keeps two padded
+  uint8 grids, a uint8 neighbour count and two boolean masks)
+- history: recorded generations, either a list of full grids in the
+  backend's dtype, or an on-disk HistoryStore (one bit-packed chunk)
+- frames: the animation. matplotlib's PillowWriter keeps every frame as an
+  RGB image until finish(), while DirectFrameWriter streams GIF frames
+- counts / queue / heatmap: the uint32 alive counts, the frame queue of
+  simulate_and_animate and the heatmap drawn from the counts
+
+Given a --max-memory budget, plan_life_run and plan_mem_opt_run walk through
+configurations from most to least capable and pick the first that fits
+(e.g. history in memory, then on disk; matplotlib frames, then direct
+frames; a PNG heatmap, then a tile pyramid; then a smaller display).
+report_actual prints the plan next to the measured ru_maxrss, so the
+constants below can be checked on new machines. A temporary history store
+created by the planner is removed by remove_temporary_history, which the
+entry points call in a `finally`.
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import re
+import resource
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+try:
+    from .history_store import chunk_frames
+except ImportError:  # executed from within the scripts directory
+    from history_store import chunk_frames
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+MiB = 1024 ** 2
+
+# Stepping working set in bytes per cell, including the initial grid
+GRID_BYTES_PER_CELL = {
+    "numpy": 6,       # LifeStepper: 2 padded uint8 + uint8 neighbours + 2 bool + initial uint8
+    "tiled": 3,       # TiledLifeStepper: 2 padded uint8 + initial uint8; scratch is per tile
+    "hashlife": 24,   # Quadtree leaves and the unpacked result; the node cache comes on top
+    "naive": 17,      # int64 grid and int64 result of life_step_naive + initial uint8
+    "bitpacked": 2,   # uint64 words (1/8) and ~10 word-sized temporaries + unpacking
+    "jit": 3,         # 2 uint8 buffers + initial uint8
+    "cupy": 5,        # Host side only: initial uint8 and int32 staging for the copy
+    "dense": 6,       # simulate_and_animate engines (game_of_life_mem_opt.py)
+    "fused": 3,       # FusedLifeStepper: 2 uint8 buffers + initial uint8
+}
+
+# Bytes per cell of one generation kept in an in-memory history
+HISTORY_ITEMSIZE = {
+    "numpy": 1, "tiled": 1, "hashlife": 1, "bitpacked": 1, "jit": 1,
+    "naive": 8,       # life_step_naive returns int64 grids
+    "cupy": 4,        # cp.asnumpy of the int32 device grid
+}
+
+# matplotlib imshow of a full-resolution grid: float64 copies made while resampling
+IMSHOW_BYTES_PER_CELL = 24
+
+# Figure, canvas and renderer of one matplotlib animation
+FIGURE_BYTES = 20 * 1024 ** 2
+
+# plot_heatmap of the full counts array: float and RGBA copies made by imshow
+HEATMAP_BYTES_PER_CELL = 64
+
+# Rows per band streamed by heatmap_tiles.export_tile_pyramid
+TILE_BAND_ROWS = 256
+
+# Chunks a HistoryStore holds at once (writer buffer, then the replay cache)
+HISTORY_STORE_CHUNKS = 2
+
+
+def parse_memory(text: str) -> int:
+    """
+    Parse a size such as "512M", "4G", "1.5GiB" or "2000000" into bytes.
+    """
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([KMGT]?)(i?B)?\s*", str(text), flags=re.IGNORECASE)
+    if match is None:
+        raise ValueError(f"cannot parse memory size {text!r}")
+    value, unit = float(match.group(1)), match.group(2).upper()
+    return int(value * 1024 ** " KMGT".index(unit or " "))
+
+
+def current_maxrss() -> int:
+    """Peak resident set size of this process so far, in bytes."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Estimates
+# ─────────────────────────────────────────────────────────────────────────────
+
+def estimate_life_run(backend: str, N: int, timesteps: int, history: str = "none",
+                      encoder: str = "matplotlib", dpi: int = 80, chunk_size: int = None) -> dict:
+    """
+    Estimate the memory of a simulate_life_* run plus animate_life.
+
+    Args:
+        backend (str): Key of GRID_BYTES_PER_CELL ("numpy", "naive", ...).
+        N (int): Grid size.
+        timesteps (int): Number of generations.
+        history (str): "memory" (list of grids), "disk" (HistoryStore) or "none".
+        encoder (str): "matplotlib" or "direct" (ignored without history).
+        dpi (int): animate_life resolution (6-inch frames).
+        chunk_size (int): HistoryStore generations per chunk (default: the
+            HistoryWriter default for an N x N grid).
+
+    Returns:
+        dict: Bytes per component ("baseline", "grid", "history", "frames").
+    """
+    cells = N * N
+    estimate = {"baseline": current_maxrss(), "grid": GRID_BYTES_PER_CELL[backend] * cells,
+                "history": 0, "frames": 0}
+    if history == "memory":
+        estimate["history"] = timesteps * cells * HISTORY_ITEMSIZE.get(backend, 1)
+    elif history == "disk":
+        chunk_size = chunk_size or chunk_frames((N, N))
+        estimate["history"] = HISTORY_STORE_CHUNKS * chunk_size * N * ((N + 7) // 8) + cells
+    if history != "none":
+        side = 6 * dpi
+        if encoder == "matplotlib":
+            # Every frame is kept as an RGB image until the writer finishes
+            estimate["frames"] = FIGURE_BYTES + IMSHOW_BYTES_PER_CELL * cells + timesteps * side * side * 3
+        else:
+            estimate["frames"] = 2 * side * side + cells
+    return estimate
+
+
+def estimate_mem_opt_run(N: int, timesteps: int, engine: str = "dense", encoder: str = "matplotlib",
+                         max_display: int = 1080, queue_size: int = 8,
+                         checkpoint_every: int = None, heatmap: str = "png") -> dict:
+    """
+    Estimate the memory of simulate_and_animate plus the heatmap (game_of_life_mem_opt.py).
+
+    Args:
+        heatmap (str): "png" (plot_heatmap) or "tiles" (heatmap_tiles pyramid).
+
+    Returns:
+        dict: Bytes per component ("baseline", "grid", "counts", "queue",
+        "frames", "heatmap").
+    """
+    cells = N * N
+    # Downsampled frame side, with the same stride as simulate_and_animate
+    step = 1 if not max_display or max_display >= N else max(1, N // max_display)
+    side = -(-N // step)
+    frame_cells = side * side
+    display_side = min(N, max_display) if max_display else N
+    # Frames one writer holds: the whole run, or one checkpoint segment
+    held = min(timesteps, checkpoint_every) if checkpoint_every else timesteps
+    estimate = {
+        "baseline": current_maxrss(),
+        "grid": GRID_BYTES_PER_CELL["fused" if engine == "fused" else "dense"] * cells,
+        "counts": 4 * cells,
+        "queue": (queue_size + 2) * frame_cells * (4 if engine == "fused" else 1),
+        "frames": 0,
+        "heatmap": 0,
+    }
+    if encoder == "matplotlib":
+        # The figure is max_display pixels square whatever the frame side:
+        # PillowWriter holds RGB copies of that raster (plus the RGBA canvas
+        # and grab buffers), imshow resamples the downsampled frame
+        pixels = max_display * max_display
+        estimate["frames"] = FIGURE_BYTES + (3 * held + 8) * pixels + IMSHOW_BYTES_PER_CELL * frame_cells
+    else:
+        # DirectFrameWriter scales the frame to at most max_display pixels
+        estimate["frames"] = 2 * display_side * display_side
+    if heatmap == "png":
+        estimate["heatmap"] = FIGURE_BYTES + HEATMAP_BYTES_PER_CELL * cells
+    else:
+        # One float32 band per pyramid level, each half as wide as the one below
+        estimate["heatmap"] = 2 * 4 * TILE_BAND_ROWS * 2 * N
+    return estimate
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Planning
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _plan(estimate: dict, budget: int, **config) -> dict:
+    plan = dict(config)
+    plan.update(estimate=estimate, peak=sum(estimate.values()), budget=budget)
+    plan["fits"] = budget is None or plan["peak"] <= budget
+    return plan
+
+
+def plan_life_run(backend: str, N: int, timesteps: int, max_memory: int = None, save_gif: bool = False,
+                  encoder: str = "matplotlib", history_dir: Path = None) -> dict:
+    """
+    Pick how a run_life_* entry point records its history.
+
+    Without a budget this keeps the old rule (history only for N <= 100 or
+    with history_dir). With one, the candidates are tried in order: history
+    in memory, then on disk (a temporary HistoryStore unless history_dir is
+    given), each first with the requested encoder and then with "direct";
+    if none fits, the GIF is skipped.
+
+    Returns:
+        dict: "record", "history" (mode), "history_dir", "encoder",
+        "temporary" (history_dir created by the planner), "estimate",
+        "peak", "budget" and "fits".
+    """
+    if max_memory is None or not save_gif:
+        record = save_gif and (N <= 100 or history_dir is not None)
+        history = "none" if not record else ("disk" if history_dir is not None else "memory")
+        return _plan(estimate_life_run(backend, N, timesteps, history, encoder), max_memory,
+                     record=record, history=history, history_dir=history_dir, encoder=encoder,
+                     temporary=False)
+
+    modes = ["disk"] if history_dir is not None else ["memory", "disk"]
+    encoders = [encoder] if encoder == "direct" else [encoder, "direct"]
+    for history in modes:
+        for candidate in encoders:
+            estimate = estimate_life_run(backend, N, timesteps, history, candidate)
+            plan = _plan(estimate, max_memory, record=True, history=history, history_dir=history_dir,
+                         encoder=candidate, temporary=False)
+            if plan["fits"]:
+                if history == "disk" and history_dir is None:
+                    plan["history_dir"] = Path(tempfile.mkdtemp(prefix="life_history_"))
+                    plan["temporary"] = True
+                return plan
+    return _plan(estimate_life_run(backend, N, timesteps, "none"), max_memory, record=False,
+                 history="none", history_dir=None, encoder=encoder, temporary=False)
+
+
+def plan_mem_opt_run(N: int, timesteps: int, max_memory: int = None, engine: str = "dense",
+                     encoder: str = "matplotlib", max_display: int = 1080, queue_size: int = 8,
+                     checkpoint_every: int = None, heatmap: str = "png", min_display: int = 270) -> dict:
+    """
+    Pick the encoder, frame queue, display size and heatmap output for simulate_and_animate.
+
+    Candidates, most capable first: the requested settings; direct frames
+    instead of matplotlib; a tile pyramid instead of the PNG heatmap; a
+    one-frame queue; then halving max_display down to min_display. The grid
+    and counts cannot shrink, so if even the last candidate does not fit, it
+    is returned with fits=False.
+
+    Returns:
+        dict: "encoder", "queue_size", "max_display", "heatmap", "estimate",
+        "peak", "budget" and "fits".
+    """
+    # matplotlib frames are drawn inline, so only the direct encoder has a queue
+    candidates = [(encoder, queue_size if encoder == "direct" else 0, max_display, heatmap)]
+    if encoder != "direct":
+        candidates.append(("direct", queue_size, max_display, heatmap))
+    if heatmap != "tiles":
+        candidates.append(("direct", queue_size, max_display, "tiles"))
+    if queue_size > 1:
+        candidates.append(("direct", 1, max_display, "tiles"))
+    display = max_display
+    while display // 2 >= min_display:
+        display //= 2
+        candidates.append(("direct", min(queue_size, 1), display, "tiles"))
+
+    for candidate_encoder, candidate_queue, candidate_display, candidate_heatmap in candidates:
+        estimate = estimate_mem_opt_run(N, timesteps, engine, candidate_encoder, candidate_display,
+                                        candidate_queue, checkpoint_every, candidate_heatmap)
+        plan = _plan(estimate, max_memory, encoder=candidate_encoder, queue_size=candidate_queue,
+                     max_display=candidate_display, heatmap=candidate_heatmap)
+        if plan["fits"]:
+            break
+    return plan
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3) Reporting
+# ─────────────────────────────────────────────────────────────────────────────
+
+def report_plan(label: str, plan: dict,
+                keys=("history", "encoder", "queue_size", "max_display", "heatmap")) -> None:
+    """
+    Print the chosen configuration and its estimated peak memory by component.
+    """
+    chosen = ", ".join(f"{key}={plan[key]}" for key in keys if key in plan)
+    budget = "no budget" if plan["budget"] is None else f"budget {plan['budget'] / MiB:.0f} MiB"
+    parts = ", ".join(f"{name} {size / MiB:.1f}" for name, size in plan["estimate"].items())
+    print(f"{label} Memory plan: {chosen}; peak ~{plan['peak'] / MiB:.0f} MiB ({budget})")
+    print(f"{label}   estimate in MiB: {parts}")
+    if not plan["fits"]:
+        print(f"{label}   warning: no configuration fits the budget")
+
+
+def report_actual(label: str, plan: dict) -> None:
+    """
+    Print planned vs measured peak memory.
+    """
+    actual = current_maxrss()
+    print(f"{label} Peak memory: planned {plan['peak'] / MiB:.0f} MiB, "
+          f"measured ru_maxrss {actual / MiB:.0f} MiB ({actual / plan['peak']:.2f}x)")
+
+
+def remove_temporary_history(plan: dict) -> None:
+    """
+    Remove the history store plan_life_run created, if any (call in a `finally`).
+    """
+    if plan.get("temporary") and plan.get("history_dir") is not None:
+        shutil.rmtree(plan["history_dir"], ignore_errors=True)
@@ -0,0 +1,418 @@
+"""
+Nsight Systems Stats Parser
+
+`nsys stats report.nsys-rep` summarises a profile as fixed-width text tables
+(see files/profiling/example_nsys_stats_output.txt). This script turns that
+text, or the CSV written by `nsys stats --format csv`, into records and
+compares two runs:
+
+- parse:  read a stats file and print the tables it contains, grouped as
+          CUDA API calls, GPU kernels, memcpy time, memcpy sizes and NVTX
+          ranges; --json writes the records
+- diff:   match the rows of two runs by name and print the change of the
+          total time (or, with --metric avg, the time per call); a row more
+          than --threshold percent and --min-delta-ns slower is a regression
+          and makes the command exit with status 1
+
+The parser only reads report files, so it runs on any machine, e.g.:
+
+    python nsys_stats.py parse ../files/profiling/example_nsys_stats_output.txt
+    python nsys_stats.py diff base_stats.txt new_stats.txt --threshold 10
+    python nsys_stats.py diff base_csv_dir/ new_csv_dir/ --category kernels
+
+CSV input may be one file holding every report (stdout of `nsys stats
+--format csv`), one file per report (`--output <prefix>` names them
+<prefix>_<report>.csv), or a directory of such files.
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import argparse
+import csv
+import io
+import json
+import re
+import sys
+from pathlib import Path
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+# nsys report name -> category; older nsys releases use the names without underscores
+REPORT_CATEGORIES = {
+    "cuda_api_sum": "cuda_api",
+    "cudaapisum": "cuda_api",
+    "cuda_gpu_kern_sum": "kernels",
+    "gpukernsum": "kernels",
+    "cuda_gpu_mem_time_sum": "memcpy_time",
+    "gpumemtimesum": "memcpy_time",
+    "cuda_gpu_mem_size_sum": "memcpy_size",
+    "gpumemsizesum": "memcpy_size",
+    "nvtx_sum": "nvtx",
+    "nvtxsum": "nvtx",
+    "nvtx_pushpop_sum": "nvtx",
+    "nvtxppsum": "nvtx",
+}
+
+CATEGORIES = ("cuda_api", "kernels", "memcpy_time", "memcpy_size", "nvtx")
+
+# Column header -> record key; other headers are lower-cased with "_" for spaces
+COLUMN_KEYS = {
+    "Time (%)": "time_pct",
+    "Time(%)": "time_pct",
+    "Total Time (ns)": "total_ns",
+    "Total Time": "total_ns",
+    "Num Calls": "count",
+    "Instances": "count",
+    "Count": "count",
+    "Avg (ns)": "avg_ns",
+    "Average": "avg_ns",
+    "Med (ns)": "med_ns",
+    "Min (ns)": "min_ns",
+    "Minimum": "min_ns",
+    "Max (ns)": "max_ns",
+    "Maximum": "max_ns",
+    "StdDev (ns)": "stddev_ns",
+    "Total (MB)": "total_mb",
+    "Avg (MB)": "avg_mb",
+    "Med (MB)": "med_mb",
+    "Min (MB)": "min_mb",
+    "Max (MB)": "max_mb",
+    "StdDev (MB)": "stddev_mb",
+    "Name": "name",
+    "Range": "name",
+    "Operation": "name",
+    "Style": "style",
+}
+
+# --metric -> record key compared by `diff`, per unit of the category
+METRICS = {
+    "total": {"ns": "total_ns", "mb": "total_mb"},
+    "avg": {"ns": "avg_ns", "mb": "avg_mb"},
+}
+
+_PROCESSING = re.compile(r"^Processing \[.*\] with \[.*?([\w-]+)\.py\]")
+_TITLE = re.compile(r"^\s*\*\* (.+) \((\w+)\):\s*$")
+_DASHES = re.compile(r"-+")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Parsing
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _column_key(header: str) -> str:
+    header = header.strip()
+    return COLUMN_KEYS.get(header) or re.sub(r"\W+", "_", header.lower()).strip("_")
+
+
+def _value(text: str):
+    """Convert a table cell to int or float where it is a number."""
+    text = text.strip()
+    number = text.replace(",", "")
+    try:
+        return int(number)
+    except ValueError:
+        pass
+    try:
+        return float(number)
+    except ValueError:
+        return text
+
+
+def _record(headers: list, cells: list) -> dict:
+    return {_column_key(h): _value(c) for h, c in zip(headers, cells)}
+
+
+def _parse_fixed_width(lines: list) -> list:
+    """
+    Parse one text table: a header line, a line of dashes and the data rows.
+
+    The dash runs give the column boundaries; the last column runs to the end
+    of the line, since long names may overflow it.
+    """
+    spans = [m.span() for m in _DASHES.finditer(lines[1])]
+    bounds = [(start, spans[i + 1][0] if i + 1 < len(spans) else None) for i, (start, _) in enumerate(spans)]
+    headers = [lines[0][start:end].strip() for start, end in bounds]
+    records = []
+    for line in lines[2:]:
+        if not line.strip():
+            break
+        records.append(_record(headers, [line[start:end] for start, end in bounds]))
+    return records
+
+
+def _parse_csv_table(lines: list) -> list:
+    rows = list(csv.reader(io.StringIO("\n".join(lines))))
+    rows = [row for row in rows if row]
+    if not rows:
+        return []
+    headers = rows[0]
+    return [_record(headers, row) for row in rows[1:] if len(row) == len(headers)]
+
+
+def _parse_section(lines: list) -> list:
+    """Parse the table of one report section, text or CSV."""
+    for i in range(len(lines) - 1):
+        if lines[i + 1].strip() and set(lines[i + 1].strip()) <= {"-", " "} and lines[i].strip():
+            return _parse_fixed_width(lines[i:])
+    table = [line for line in lines if line.strip() and not line.lstrip().startswith("**")]
+    if table and "," in table[0]:
+        return _parse_csv_table(table)
+    return []
+
+
+def parse_stats_text(text: str, report: str = None) -> dict:
+    """
+    Parse the output of `nsys stats` (text or CSV format).
+
+    Sections start at the "Processing [...] with [.../<report>.py]" line nsys
+    prints per report; reports without data ("SKIPPED: ...") are left out.
+
+    Args:
+        text (str): Contents of the stats file.
+        report (str): Report name for text holding a single table without a
+            "Processing" line, e.g. one `--output` CSV file.
+
+    Returns:
+        dict: report name (e.g. "cuda_gpu_kern_sum") -> list of records, one
+        dict per table row with keys such as "name", "total_ns", "count",
+        "avg_ns" or "total_mb".
+    """
+    sections, current, lines = {}, report, []
+
+    def flush():
+        if current is not None and lines:
+            records = _parse_section(lines)
+            if records:
+                sections[current] = records
+
+    for line in text.splitlines():
+        match = _PROCESSING.match(line)
+        if match:
+            flush()
+            current, lines = match.group(1), []
+            continue
+        title = _TITLE.match(line)
+        if title:
+            current = current or title.group(2)
+            continue
+        if line.startswith("SKIPPED:"):
+            lines = []
+            continue
+        lines.append(line)
+    flush()
+    return sections
+
+
+def _report_from_filename(path: Path) -> str:
+    """Report name of an `nsys stats --output` file, e.g. run_cuda_gpu_kern_sum.csv."""
+    for name in sorted(REPORT_CATEGORIES, key=len, reverse=True):
+        if path.stem == name or path.stem.endswith("_" + name):
+            return name
+    return None
+
+
+def load_stats(path) -> dict:
+    """
+    Read a stats file, or every .csv/.txt file in a directory.
+
+    Returns:
+        dict: report name -> list of records, as parse_stats_text().
+    """
+    path = Path(path)
+    files = sorted(p for p in path.iterdir() if p.suffix in (".csv", ".txt")) if path.is_dir() else [path]
+    reports = {}
+    for file in files:
+        reports.update(parse_stats_text(file.read_text(errors="replace"), _report_from_filename(file)))
+    return reports
+
+
+def by_category(reports: dict) -> dict:
+    """
+    Group the parsed reports into the categories compared by `diff`.
+
+    Rows whose (possibly truncated) names collide are numbered "name #2", ...
+
+    Returns:
+        dict: category ("cuda_api", "kernels", "memcpy_time", "memcpy_size",
+        "nvtx") -> {name: record}.
+    """
+    grouped = {}
+    for report, records in reports.items():
+        category = REPORT_CATEGORIES.get(report)
+        if category is None:
+            continue
+        rows = grouped.setdefault(category, {})
+        for record in records:
+            name = str(record.get("name", ""))
+            key, n = name, 1
+            while key in rows:
+                n += 1
+                key = f"{name} #{n}"
+            rows[key] = record
+    return grouped
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Comparing two runs
+# ─────────────────────────────────────────────────────────────────────────────
+
+def diff_stats(base: dict, new: dict, threshold: float = 10.0, min_delta_ns: float = 1e5,
+               metric: str = "total", categories=CATEGORIES) -> list:
+    """
+    Compare two runs row by row.
+
+    Args:
+        base (dict): by_category() of the reference run.
+        new (dict): by_category() of the run being checked.
+        threshold (float): Percentage change beyond which a row counts as a
+            regression (slower) or an improvement (faster).
+        min_delta_ns (float): Time changes smaller than this are ignored as
+            noise; it does not apply to the memcpy sizes.
+        metric (str): "total" (total time or size) or "avg" (per call).
+        categories: Categories to compare.
+
+    Returns:
+        list[dict]: One row per name with "category", "name", "metric",
+        "base", "new", "delta", "delta_pct" and "status" ("regression",
+        "improved", "same", "added" or "removed"), largest change first
+        within each category.
+    """
+    table = []
+    for category in categories:
+        base_rows, new_rows = base.get(category, {}), new.get(category, {})
+        key = METRICS[metric]["mb" if category == "memcpy_size" else "ns"]
+        min_delta = 0 if category == "memcpy_size" else min_delta_ns
+        rows = []
+        for name in list(base_rows) + [n for n in new_rows if n not in base_rows]:
+            before = base_rows.get(name, {}).get(key)
+            after = new_rows.get(name, {}).get(key)
+            if before is None or after is None:
+                status = "removed" if after is None else "added"
+                delta = delta_pct = None
+            else:
+                delta = after - before
+                delta_pct = 100 * delta / before if before else (0.0 if not delta else float("inf"))
+                status = "same"
+                if abs(delta) >= min_delta and abs(delta_pct) > threshold:
+                    status = "regression" if delta > 0 else "improved"
+            rows.append({"category": category, "name": name, "metric": key, "base": before, "new": after,
+                         "delta": delta, "delta_pct": delta_pct, "status": status})
+        rows.sort(key=lambda row: -(abs(row["delta"]) if row["delta"] is not None
+                                    else max(row["base"] or 0, row["new"] or 0)))
+        table.extend(rows)
+    return table
+
+
+def regressions(table: list) -> list:
+    """Return the rows of a diff_stats() table flagged as regressions."""
+    return [row for row in table if row["status"] == "regression"]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3) Reporting
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _short(name: str, width: int) -> str:
+    return name if len(name) <= width else name[:width - 1] + "…"
+
+
+def _number(value) -> str:
+    if value is None:
+        return "-"
+    return f"{value:,.3f}" if isinstance(value, float) else f"{value:,}"
+
+
+def print_records(grouped: dict, width: int = 60) -> None:
+    """Print the parsed rows per category: name, count and the main totals."""
+    for category in CATEGORIES:
+        rows = grouped.get(category)
+        if not rows:
+            continue
+        unit = "mb" if category == "memcpy_size" else "ns"
+        print(f"\n[{category}]")
+        print(f"{'name':<{width}} {'count':>9} {'total ' + unit:>18} {'avg ' + unit:>16} {'time %':>7}")
+        for name, record in rows.items():
+            print(f"{_short(name, width):<{width}} {_number(record.get('count')):>9} "
+                  f"{_number(record.get('total_' + unit)):>18} {_number(record.get('avg_' + unit)):>16} "
+                  f"{_number(record.get('time_pct')):>7}")
+
+
+def print_diff(table: list, width: int = 60, show_same: bool = True) -> None:
+    """Print a diff_stats() table per category."""
+    category = None
+    for row in table:
+        if row["status"] == "same" and not show_same:
+            continue
+        if row["category"] != category:
+            category = row["category"]
+            print(f"\n[{category}] {row['metric']}")
+            print(f"{'name':<{width}} {'base':>18} {'new':>18} {'delta':>18} {'change':>8}  status")
+        change = "-" if row["delta_pct"] is None else f"{row['delta_pct']:+.1f}%"
+        print(f"{_short(row['name'], width):<{width}} {_number(row['base']):>18} {_number(row['new']):>18} "
+              f"{_number(row['delta']):>18} {change:>8}  {row['status']}")
+
+
+def write_diff_csv(table: list, path) -> None:
+    """Write a diff_stats() table as CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["category", "name", "metric", "base", "new", "delta",
+                                               "delta_pct", "status"])
+        writer.writeheader()
+        writer.writerows(table)
+
+
+def main():
+    """
+    CLI: `parse FILE` prints the records of one run, `diff BASE NEW` compares
+    two runs and exits with status 1 if any row regressed.
+    """
+    p = argparse.ArgumentParser(description="Parse and compare `nsys stats` reports")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    parse_p = sub.add_parser("parse", help="Print the records of one stats file")
+    parse_p.add_argument("stats", type=Path, help="nsys stats output (text, CSV or a directory of CSV files)")
+    parse_p.add_argument("--json", type=Path, default=None, help="Write the records grouped by category")
+
+    diff_p = sub.add_parser("diff", help="Compare two runs")
+    diff_p.add_argument("base", type=Path, help="Stats of the reference run")
+    diff_p.add_argument("new", type=Path, help="Stats of the run being checked")
+    diff_p.add_argument("--threshold", type=float, default=10.0, help="Percent change counted as a regression")
+    diff_p.add_argument("--min-delta-ns", type=float, default=1e5, help="Ignore time changes smaller than this")
+    diff_p.add_argument("--metric", choices=sorted(METRICS), default="total",
+                        help="Compare total time/size or the average per call")
+    diff_p.add_argument("--category", choices=CATEGORIES, nargs="+", default=list(CATEGORIES),
+                        help="Categories to compare")
+    diff_p.add_argument("--changed-only", action="store_true", help="Hide rows within the threshold")
+    diff_p.add_argument("--csv", type=Path, default=None, help="Write the diff table to this CSV file")
+    args = p.parse_args()
+
+    if args.command == "parse":
+        grouped = by_category(load_stats(args.stats))
+        if not grouped:
+            p.error(f"no CUDA API, kernel, memcpy or NVTX tables found in {args.stats}")
+        print_records(grouped)
+        if args.json:
+            args.json.write_text(json.dumps(grouped, indent=2))
+            print(f"\nSaved records to {args.json}")
+        return
+
+    base, new = by_category(load_stats(args.base)), by_category(load_stats(args.new))
+    table = diff_stats(base, new, args.threshold, args.min_delta_ns, args.metric, args.category)
+    print_diff(table, show_same=not args.changed_only)
+    if args.csv:
+        write_diff_csv(table, args.csv)
+        print(f"\nSaved diff to {args.csv}")
+    slower = regressions(table)
+    if slower:
+        print(f"\n{len(slower)} regression(s) beyond {args.threshold:g}%:")
+        for row in slower:
+            print(f"  - [{row['category']}] {row['name']}: {row['delta_pct']:+.1f}%")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:g}%")
+
+
+if __name__ == "__main__":
+    main()
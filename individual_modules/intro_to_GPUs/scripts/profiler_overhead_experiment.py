@@ -0,0 +1,133 @@
+"""
+Profiler Overhead Benchmark
+
+Compares how much each profiling mode of game_of_life_profiled.py slows a
+run down:
+
+  - none:          the simulation on its own
+  - cprofile:      cProfile around the run (--profile-cpu)
+  - sample@HZ:     the sampling profiler of stack_sampler.py (--profile-sample HZ)
+
+Each workload runs in-process (so interpreter start-up is not measured)
+with a warmup run first, then --repeats timed runs per mode. The overhead is
+the slowdown of the mean time relative to "none". Results are written to
+../output/profiler_overhead.csv and printed as a table.
+
+Workloads: the naive and NumPy Game of Life backends, and with --diffusion
+the pure-Python temperature diffusion (needs the NetCDF data set).
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import argparse
+import cProfile
+import csv
+import os
+import time
+
+import numpy as np
+
+try:
+    from .game_of_life_profiled import simulate_life_naive, simulate_life_numpy
+    from .stack_sampler import StackSampler
+except ImportError:  # executed from within the scripts directory
+    from game_of_life_profiled import simulate_life_naive, simulate_life_numpy
+    from stack_sampler import StackSampler
+
+# -------------------------------------------------------------------
+# Constants
+# -------------------------------------------------------------------
+
+OUT_DIR = "../output"
+
+
+def _diffusion_workload(timesteps: int):
+    try:
+        from .temperature_diffusion import load_data, temperature_diffusion_purepython
+    except ImportError:
+        from temperature_diffusion import load_data, temperature_diffusion_purepython
+    data = load_data()
+    return lambda: temperature_diffusion_purepython(data, timesteps)
+
+
+def time_mode(workload, mode: str, hz: float = None, repeats: int = 3) -> dict:
+    """
+    Time a workload under one profiling mode.
+
+    Args:
+        workload: Callable running the simulation once.
+        mode (str): "none", "cprofile" or "sample".
+        hz (float): Sample rate for mode "sample".
+        repeats (int): Timed runs.
+
+    Returns:
+        dict: "times" (seconds per run) and "samples" (mean samples per run
+        for mode "sample", else 0).
+    """
+    times, samples = [], []
+    for _ in range(repeats):
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            t0 = time.perf_counter()
+            profiler.enable()
+            workload()
+            profiler.disable()
+        elif mode == "sample":
+            sampler = StackSampler(hz)
+            t0 = time.perf_counter()
+            with sampler:
+                workload()
+            samples.append(sampler.samples)
+        else:
+            t0 = time.perf_counter()
+            workload()
+        times.append(time.perf_counter() - t0)
+    return {"times": times, "samples": float(np.mean(samples)) if samples else 0}
+
+
+def main():
+    """
+    Run every workload under every mode, write the CSV and print the table.
+    """
+    p = argparse.ArgumentParser(description="Compare --profile-cpu and --profile-sample overhead")
+    p.add_argument("--size", type=int, default=64, help="Game of Life grid size")
+    p.add_argument("--timesteps", type=int, default=20, help="Game of Life generations")
+    p.add_argument("--hz", type=float, nargs="+", default=[100, 1000], help="Sample rates to compare")
+    p.add_argument("--repeats", type=int, default=3, help="Timed runs per mode")
+    p.add_argument("--diffusion", type=int, default=None, metavar="TIMESTEPS",
+                   help="Also profile the pure-Python diffusion for this many timesteps")
+    args = p.parse_args()
+
+    workloads = {
+        "Naive (CPU)": lambda: simulate_life_naive(args.size, args.timesteps, seed=0),
+        "NumPy (CPU)": lambda: simulate_life_numpy(args.size, args.timesteps, seed=0),
+    }
+    if args.diffusion:
+        workloads["Diffusion Pure Python"] = _diffusion_workload(args.diffusion)
+    modes = [("none", None), ("cprofile", None)] + [("sample", hz) for hz in args.hz]
+
+    os.makedirs(OUT_DIR, exist_ok=True)
+    csv_file = os.path.join(OUT_DIR, "profiler_overhead.csv")
+    with open(csv_file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["workload", "mode", "hz", "mean_time_sec", "std_dev_sec", "overhead_pct", "samples"])
+        print(f"{'workload':<22} {'mode':<12} {'mean s':>9} {'std s':>8} {'overhead':>9} {'samples':>8}")
+        for name, workload in workloads.items():
+            workload()  # warmup: imports, caches, allocator
+            baseline = None
+            for mode, hz in modes:
+                result = time_mode(workload, mode, hz, args.repeats)
+                mean_t, std_t = np.mean(result["times"]), np.std(result["times"])
+                baseline = baseline or mean_t
+                overhead = 100 * (mean_t / baseline - 1)
+                label = f"sample@{hz:g}" if mode == "sample" else mode
+                writer.writerow([name, mode, "" if hz is None else hz, f"{mean_t:.6f}", f"{std_t:.6f}",
+                                 f"{overhead:.2f}", f"{result['samples']:.0f}"])
+                print(f"{name:<22} {label:<12} {mean_t:>9.4f} {std_t:>8.4f} {overhead:>8.1f}% "
+                      f"{result['samples']:>8.0f}")
+    print(f"CSV saved to {csv_file}")
+
+
+if __name__ == "__main__":
+    main()
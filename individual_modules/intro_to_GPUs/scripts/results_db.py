@@ -0,0 +1,515 @@
+"""
+Benchmark Results Database
+
+The experiment scripts write one CSV per run with the hardware, methods and
+timesteps encoded in the filename (gol_timings_<gpu>_<cpu>_<methods>_ts<N>.csv),
+and the plotting script used to glob and concatenate all of them. This
+module keeps every measurement in a local SQLite file instead:
+
+- hardware:  one row per host, keyed by a fingerprint of the CPU and GPU
+             names (hardware.py), the core count and the memory. CSV files
+             record only the names; an imported file joins the one stored
+             host with those names, or a names-only row if there is none
+             or several
+- runs:      one row per experiment run or imported CSV, with the code
+             revision (`git describe`) and the source file
+- results:   one row per (run, method, grid size, timesteps) with the number
+             of timed repeats, mean, standard deviation and, where known,
+             median, minimum and the separate phases
+- samples:   every timed repeat behind a result (warmup outliers excluded),
+             when the run recorded them
+
+game_of_life_experiment.py records into the database after each run, and
+game_of_life_create_plots.py queries the slices it plots. From the command
+line:
+
+    python results_db.py import ../files/game_of_life_data/gol_timings_*.csv
+    python results_db.py list
+    python results_db.py compare --base v1.2 --new HEAD --alpha 0.05
+
+`compare` runs a one-sided Welch t-test per configuration on the mean run
+time and exits with status 1 if any configuration is significantly slower
+(p < --alpha) by more than --threshold percent.
+
+The database path defaults to ../output/results.sqlite and can be set with
+the GOL_RESULTS_DB environment variable or --db.
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    from .hardware import get_cpu_name, get_gpu_name
+except ImportError:  # executed from within the scripts directory
+    from hardware import get_cpu_name, get_gpu_name
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_DB = Path(os.environ.get("GOL_RESULTS_DB", "../output/results.sqlite"))
+
+# Repeats assumed for CSV files written before the harness recorded them
+LEGACY_REPEATS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hardware (
+    id          INTEGER PRIMARY KEY,
+    fingerprint TEXT UNIQUE NOT NULL,
+    cpu         TEXT NOT NULL,
+    gpu         TEXT NOT NULL,
+    cpus        INTEGER,
+    memory_gb   REAL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    hardware_id INTEGER NOT NULL REFERENCES hardware(id),
+    revision    TEXT NOT NULL,
+    source      TEXT,
+    source_hash TEXT UNIQUE,
+    created     TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id                INTEGER PRIMARY KEY,
+    run_id            INTEGER NOT NULL REFERENCES runs(id),
+    method            TEXT NOT NULL,
+    grid_size         INTEGER NOT NULL,
+    timesteps         INTEGER NOT NULL,
+    n_samples         INTEGER NOT NULL,
+    mean_time_sec     REAL NOT NULL,
+    std_dev_sec       REAL,
+    median_time_sec   REAL,
+    min_time_sec      REAL,
+    step_time_sec     REAL,
+    init_time_sec     REAL,
+    teardown_time_sec REAL,
+    compile_time_sec  REAL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    result_id   INTEGER NOT NULL REFERENCES results(id),
+    repeat      INTEGER NOT NULL,
+    time_sec    REAL NOT NULL,
+    step_sec    REAL
+);
+CREATE INDEX IF NOT EXISTS results_config ON results (method, grid_size, timesteps);
+"""
+
+# Columns returned by query_results, in the gol_timings CSV order
+QUERY_COLUMNS = [
+    "gpu", "cpu", "method", "grid_size", "timesteps", "mean_time_sec", "std_dev_sec",
+    "median_time_sec", "min_time_sec", "n_samples", "revision", "fingerprint", "run_id",
+]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Hardware fingerprint and code revision
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _memory_gb():
+    try:
+        return round(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 2 ** 30, 1)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def fingerprint_of(cpu: str, gpu: str, cpus: int = None, memory_gb: float = None) -> dict:
+    """
+    Build a hardware record with its fingerprint.
+
+    Names are stored with underscores for spaces, as in the CSV files. The
+    fingerprint is a short hash of the model names and, when known, the
+    core count and memory, so hosts with the same CPU model but different
+    sizes are kept apart. Without them it is a names-only fingerprint (see
+    import_csv).
+
+    Returns:
+        dict: "fingerprint", "cpu", "gpu", "cpus" and "memory_gb".
+    """
+    cpu, gpu = cpu.replace(" ", "_"), gpu.replace(" ", "_")
+    sizes = [] if cpus is None and memory_gb is None else [cpus, memory_gb]
+    key = json.dumps([cpu, gpu] + sizes)
+    return {"fingerprint": hashlib.sha1(key.encode()).hexdigest()[:12],
+            "cpu": cpu, "gpu": gpu, "cpus": cpus, "memory_gb": memory_gb}
+
+
+def host_fingerprint() -> dict:
+    """Hardware record of this host (model names, logical cores, memory)."""
+    return fingerprint_of(get_cpu_name(), get_gpu_name(), os.cpu_count(), _memory_gb())
+
+
+def code_revision(cwd: Path = SCRIPTS_DIR) -> str:
+    """
+    Return `git describe --always --dirty` of the scripts, or "unknown".
+    """
+    try:
+        return subprocess.check_output(["git", "describe", "--always", "--dirty"], cwd=cwd,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Storing results
+# ─────────────────────────────────────────────────────────────────────────────
+
+def connect(path=DEFAULT_DB) -> sqlite3.Connection:
+    """Open (and if needed create) the results database."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _hardware_id(connection, hardware: dict) -> int:
+    # Known core counts and memory fill in or replace what was stored before
+    connection.execute(
+        "INSERT INTO hardware (fingerprint, cpu, gpu, cpus, memory_gb) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (fingerprint) DO UPDATE SET cpus = COALESCE(excluded.cpus, cpus), "
+        "memory_gb = COALESCE(excluded.memory_gb, memory_gb)",
+        (hardware["fingerprint"], hardware["cpu"], hardware["gpu"], hardware["cpus"], hardware["memory_gb"]))
+    return connection.execute("SELECT id FROM hardware WHERE fingerprint = ?",
+                              (hardware["fingerprint"],)).fetchone()["id"]
+
+
+def _float(value):
+    return None if value in (None, "") else float(value)
+
+
+def record_run(connection, rows: list, hardware: dict, revision: str, records: list = None,
+               source: str = None, source_hash: str = None) -> int:
+    """
+    Store one run: its summary rows and, if given, every timed repeat.
+
+    Args:
+        connection: Open database from connect().
+        rows (list[dict]): Summary rows with the gol_timings columns
+            (benchmark_harness.summarise() or a CSV file).
+        hardware (dict): fingerprint_of() / host_fingerprint() record.
+        revision (str): Code revision that produced the run.
+        records (list[dict]): Per-repeat records of benchmark_harness, stored
+            as samples of the matching summary row.
+        source (str): File the run was written to or imported from.
+        source_hash (str): Content hash of an imported file; a file already
+            imported is skipped.
+
+    Returns:
+        int: The run id, or None if the source was already imported.
+    """
+    if source_hash and connection.execute("SELECT 1 FROM runs WHERE source_hash = ?", (source_hash,)).fetchone():
+        return None
+    with connection:
+        run_id = connection.execute(
+            "INSERT INTO runs (hardware_id, revision, source, source_hash, created) VALUES (?, ?, ?, ?, ?)",
+            (_hardware_id(connection, hardware), revision, source, source_hash,
+             datetime.now(timezone.utc).isoformat(timespec="seconds"))).lastrowid
+        for row in rows:
+            config = (row["method"], int(row["grid_size"]), int(row["timesteps"]))
+            result_id = connection.execute(
+                "INSERT INTO results (run_id, method, grid_size, timesteps, n_samples, mean_time_sec, std_dev_sec, "
+                "median_time_sec, min_time_sec, step_time_sec, init_time_sec, teardown_time_sec, compile_time_sec) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, *config, int(row.get("n_samples") or row.get("repeats") or LEGACY_REPEATS),
+                 float(row["mean_time_sec"]), _float(row.get("std_dev_sec")), _float(row.get("median_time_sec")),
+                 _float(row.get("min_time_sec")), _float(row.get("step_time_sec")),
+                 _float(row.get("init_time_sec")), _float(row.get("teardown_time_sec")),
+                 _float(row.get("compile_time_sec")))).lastrowid
+            samples = [r for r in records or ()
+                       if (r["method"], r["grid_size"], r["timesteps"]) == config and not r.get("discarded")]
+            connection.executemany(
+                "INSERT INTO samples (result_id, repeat, time_sec, step_sec) VALUES (?, ?, ?, ?)",
+                [(result_id, r["repeat"], (r["init_ns"] + r["step_ns"] + r["teardown_ns"]) / 1e9, r["step_ns"] / 1e9)
+                 for r in samples])
+    return run_id
+
+
+def csv_source_hash(path, cpu: str, gpu: str) -> str:
+    """
+    Identity of the rows of one host in a gol_timings CSV file.
+
+    record_run skips a run whose hash is already stored, so a file can be
+    imported any number of times; the experiment records its runs with the
+    same hash, so importing its own CSV later adds nothing.
+    """
+    return hashlib.sha1(Path(path).read_bytes() + f"{cpu}|{gpu}".encode()).hexdigest()
+
+
+def _match_by_names(connection, cpu: str, gpu: str) -> dict:
+    """
+    Hardware record for rows that only name their CPU and GPU.
+
+    The one fully fingerprinted host stored with these names if there is
+    exactly one, otherwise a names-only record, kept apart from every
+    fully fingerprinted host so results are never compared across hosts.
+    The core count of a names-only record is read from the CPU name
+    ("..._64-Core_Processor") but is not part of its fingerprint.
+    """
+    hardware = fingerprint_of(cpu, gpu)
+    hosts = connection.execute("SELECT fingerprint, cpu, gpu, cpus, memory_gb FROM hardware "
+                               "WHERE cpu = ? AND gpu = ? AND fingerprint != ?",
+                               (hardware["cpu"], hardware["gpu"], hardware["fingerprint"])).fetchall()
+    if len(hosts) == 1:
+        return dict(hosts[0])
+    match = re.search(r"(\d+)-Core", hardware["cpu"])
+    hardware["cpus"] = int(match.group(1)) if match else None
+    return hardware
+
+
+def import_csv(connection, path, revision: str = "unknown", cpus: int = None, memory_gb: float = None) -> int:
+    """
+    Import a gol_timings CSV file.
+
+    Each (gpu, cpu) pair in the file becomes one run. The file records only
+    the model names: with cpus or memory_gb given, the rows get the full
+    fingerprint of those values; otherwise they are matched by names only
+    (see _match_by_names).
+
+    Returns:
+        int: Number of result rows imported (0 if the file was imported before).
+    """
+    path = Path(path)
+    by_host = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            by_host.setdefault((row["cpu"], row["gpu"]), []).append(row)
+    imported = 0
+    for (cpu, gpu), rows in by_host.items():
+        if cpus is None and memory_gb is None:
+            hardware = _match_by_names(connection, cpu, gpu)
+        else:
+            hardware = fingerprint_of(cpu, gpu, cpus, memory_gb)
+        if record_run(connection, rows, hardware, revision, source=path.name,
+                      source_hash=csv_source_hash(path, cpu, gpu)) is not None:
+            imported += len(rows)
+    return imported
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 3) Queries
+# ─────────────────────────────────────────────────────────────────────────────
+
+def query_results(connection, methods=None, timesteps=None, grid_sizes=None, revision: str = None,
+                  fingerprints=None, latest: bool = True) -> list:
+    """
+    Select result rows, by default the latest run of every configuration.
+
+    Args:
+        connection: Open database.
+        methods, timesteps, grid_sizes, fingerprints: Optional lists to
+            restrict the slice to.
+        revision (str): Only runs of this code revision.
+        latest (bool): Keep only the newest run per hardware, method, grid
+            size and timesteps (older measurements stay in the database).
+
+    Returns:
+        list[dict]: Rows keyed by QUERY_COLUMNS.
+    """
+    where, params = [], []
+    for column, values in (("r.method", methods), ("r.timesteps", timesteps),
+                           ("r.grid_size", grid_sizes), ("h.fingerprint", fingerprints)):
+        if values:
+            where.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    if revision:
+        where.append("runs.revision = ?")
+        params.append(revision)
+    sql = ("SELECT h.gpu, h.cpu, r.method, r.grid_size, r.timesteps, r.mean_time_sec, r.std_dev_sec, "
+           "r.median_time_sec, r.min_time_sec, r.n_samples, runs.revision, h.fingerprint, r.run_id "
+           "FROM results r JOIN runs ON runs.id = r.run_id JOIN hardware h ON h.id = runs.hardware_id")
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY h.fingerprint, r.method, r.grid_size, r.timesteps, r.run_id DESC"
+    rows, seen = [], set()
+    for row in connection.execute(sql, params):
+        key = (row["fingerprint"], row["method"], row["grid_size"], row["timesteps"])
+        if latest and key in seen:
+            continue
+        seen.add(key)
+        rows.append(dict(row))
+    return rows
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 4) Comparing revisions
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularised incomplete beta function I_x(a, b) (continued fraction, Numerical Recipes)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _betainc(b, a, 1.0 - x)
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)) / a
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > 1e-300 else 1e-300)
+    f = d
+    for m in range(1, 200):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > 1e-300 else 1e-300)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > 1e-300 else 1e-300
+            f *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return front * f
+
+
+def welch_t_test(mean_a: float, std_a: float, n_a: int, mean_b: float, std_b: float, n_b: int) -> tuple:
+    """
+    One-sided Welch t-test that b is slower (larger) than a.
+
+    Args:
+        mean_a, std_a, n_a: Mean, sample standard deviation and count of a.
+        mean_b, std_b, n_b: The same for b.
+
+    Returns:
+        tuple[float, float, float]: (t statistic, degrees of freedom, p-value).
+        With zero variance in both groups p is 0 if b is slower, else 1.
+    """
+    var_a, var_b = std_a ** 2 / n_a, std_b ** 2 / n_b
+    if var_a + var_b == 0:
+        return (math.inf if mean_b > mean_a else -math.inf), math.inf, (0.0 if mean_b > mean_a else 1.0)
+    t = (mean_b - mean_a) / math.sqrt(var_a + var_b)
+    # Welch-Satterthwaite degrees of freedom; a group of one sample adds no term
+    denominator = sum(var ** 2 / (n - 1) for var, n in ((var_a, n_a), (var_b, n_b)) if n > 1)
+    df = (var_a + var_b) ** 2 / denominator if denominator else math.inf
+    # P(T > t) for Student's t with df degrees of freedom
+    if math.isinf(df):
+        tail = 0.5 * math.erfc(abs(t) / math.sqrt(2))
+    else:
+        tail = 0.5 * _betainc(df / 2, 0.5, df / (df + t * t))
+    return t, df, (tail if t > 0 else 1.0 - tail)
+
+
+def _sample_std(row) -> float:
+    # summarise() and the legacy CSVs store the population standard deviation
+    n, std = row["n_samples"], row["std_dev_sec"] or 0.0
+    return std * math.sqrt(n / (n - 1)) if n > 1 else std
+
+
+def compare(connection, base: str, new: str, alpha: float = 0.05, threshold: float = 5.0,
+            fingerprints=None) -> list:
+    """
+    Compare the latest results of two code revisions configuration by configuration.
+
+    Args:
+        connection: Open database.
+        base (str): Reference revision.
+        new (str): Revision being checked.
+        alpha (float): Significance level of the one-sided Welch t-test.
+        threshold (float): Smallest slowdown in percent that is reported.
+        fingerprints: Optional hardware fingerprints to restrict to.
+
+    Returns:
+        list[dict]: One row per configuration measured in both revisions with
+        "fingerprint", "method", "grid_size", "timesteps", "base_sec",
+        "new_sec", "change_pct", "p_value" and "slower" (significant and
+        beyond the threshold).
+    """
+    key = lambda row: (row["fingerprint"], row["method"], row["grid_size"], row["timesteps"])
+    before = {key(row): row for row in query_results(connection, revision=base, fingerprints=fingerprints)}
+    table = []
+    for row in query_results(connection, revision=new, fingerprints=fingerprints):
+        old = before.get(key(row))
+        if old is None:
+            continue
+        _, _, p = welch_t_test(old["mean_time_sec"], _sample_std(old), old["n_samples"],
+                               row["mean_time_sec"], _sample_std(row), row["n_samples"])
+        change = 100 * (row["mean_time_sec"] / old["mean_time_sec"] - 1)
+        table.append({"fingerprint": row["fingerprint"], "cpu": row["cpu"], "gpu": row["gpu"],
+                      "method": row["method"], "grid_size": row["grid_size"], "timesteps": row["timesteps"],
+                      "base_sec": old["mean_time_sec"], "new_sec": row["mean_time_sec"],
+                      "change_pct": change, "p_value": p, "slower": p < alpha and change > threshold})
+    return table
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 5) CLI
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _print_runs(connection) -> None:
+    print(f"{'run':>4}  {'fingerprint':<12}  {'revision':<16}  {'results':>7}  {'created':<25}  hardware / source")
+    for row in connection.execute(
+            "SELECT runs.id, h.fingerprint, h.cpu, h.gpu, h.cpus, h.memory_gb, runs.revision, runs.source, "
+            "runs.created, COUNT(r.id) AS results FROM runs JOIN hardware h ON h.id = runs.hardware_id "
+            "LEFT JOIN results r ON r.run_id = runs.id GROUP BY runs.id ORDER BY runs.id"):
+        memory = "" if row["memory_gb"] is None else f", {row['memory_gb']:g} GB"
+        print(f"{row['id']:>4}  {row['fingerprint']:<12}  {row['revision']:<16}  {row['results']:>7}  "
+              f"{row['created']:<25}  {row['cpu']} + {row['gpu']} ({row['cpus'] or '?'} cores{memory}) "
+              f"/ {row['source'] or '-'}")
+
+
+def main():
+    """
+    CLI: `import` gol_timings CSV files, `list` the stored runs, `compare`
+    two revisions (exit status 1 on a significant slowdown).
+    """
+    p = argparse.ArgumentParser(description="Benchmark results database")
+    p.add_argument("--db", type=Path, default=DEFAULT_DB, help="SQLite database file")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    import_p = sub.add_parser("import", help="Import gol_timings CSV files")
+    import_p.add_argument("csv_files", type=Path, nargs="+")
+    import_p.add_argument("--revision", default="unknown", help="Code revision that produced the files")
+    import_p.add_argument("--cpus", type=int, default=None,
+                          help="Logical cores of the host (default: match the host by CPU and GPU name)")
+    import_p.add_argument("--memory-gb", type=float, default=None, help="Host memory, if known")
+
+    sub.add_parser("list", help="List the stored runs")
+
+    compare_p = sub.add_parser("compare", help="Flag significant slowdowns between two revisions")
+    compare_p.add_argument("--base", required=True, help="Reference revision")
+    compare_p.add_argument("--new", default=None, help="Revision to check (default: the current one)")
+    compare_p.add_argument("--alpha", type=float, default=0.05, help="Significance level")
+    compare_p.add_argument("--threshold", type=float, default=5.0, help="Ignore slowdowns below this percent")
+    compare_p.add_argument("--hardware", nargs="+", default=None, help="Restrict to these fingerprints")
+    args = p.parse_args()
+
+    connection = connect(args.db)
+    if args.command == "import":
+        for path in args.csv_files:
+            n = import_csv(connection, path, args.revision, args.cpus, args.memory_gb)
+            print(f"[Results] {path.name}: {n} results imported" if n else f"[Results] {path.name}: already imported")
+    elif args.command == "list":
+        _print_runs(connection)
+    else:
+        new = args.new or code_revision()
+        table = compare(connection, args.base, new, args.alpha, args.threshold, args.hardware)
+        if not table:
+            p.error(f"no configuration was measured in both {args.base} and {new}")
+        print(f"{'fingerprint':<12}  {'method':<18} {'size':>6} {'steps':>6} {'base s':>10} {'new s':>10} "
+              f"{'change':>8} {'p':>7}")
+        for row in table:
+            flag = "  SLOWER" if row["slower"] else ""
+            print(f"{row['fingerprint']:<12}  {row['method']:<18} {row['grid_size']:>6} {row['timesteps']:>6} "
+                  f"{row['base_sec']:>10.4f} {row['new_sec']:>10.4f} {row['change_pct']:>+7.1f}% "
+                  f"{row['p_value']:>7.3f}{flag}")
+        slower = [row for row in table if row["slower"]]
+        if slower:
+            print(f"\n{len(slower)} configuration(s) significantly slower in {new} than {args.base} "
+                  f"(p < {args.alpha:g}, > {args.threshold:g}%)")
+            sys.exit(1)
+        print(f"\nNo significant slowdowns in {new} against {args.base}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Span-Timer Instrumentation
+
+A lightweight alternative to game_of_life_profiled.py: cProfile slows the
+naive backend down many times over and NVTX ranges need NVIDIA tooling.
+Here the hot functions are wrapped in spans that record a start time and a
+duration (time.perf_counter_ns) into a preallocated ring buffer:
+
+- @traced() decorates a function, `with span("name"):` times a block
+- switched on by the GOL_TRACE environment variable, read at import time;
+  when it is unset @traced() returns the function unchanged and span()
+  returns a shared no-op context manager, so the cost is close to zero
+- the ring buffer keeps the most recent GOL_TRACE_CAPACITY spans (default
+  1,048,576), so long production runs use constant memory
+- at exit the spans are written as Chrome trace JSON (open it in
+  chrome://tracing or https://ui.perfetto.dev) to the file named by
+  GOL_TRACE ("1" means gol_trace.json), and a latency histogram per span
+  name is printed to stderr; worker processes write <name>.<pid>.json
+
+Usage:
+    GOL_TRACE=run.json poetry run game_of_life_cpu --size 500
+
+    @traced()
+    def life_step_numpy(grid): ...
+
+    with span("diffusion_step"):
+        ...
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import atexit
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+TRACE_ENV = "GOL_TRACE"
+CAPACITY_ENV = "GOL_TRACE_CAPACITY"
+DEFAULT_TRACE_FILE = "gol_trace.json"
+DEFAULT_CAPACITY = 1 << 20
+
+# Histogram buckets are powers of two of nanoseconds, from 256 ns to ~69 s
+HIST_MIN_EXP = 8
+HIST_MAX_EXP = 36
+
+
+class SpanRecorder:
+    """
+    Ring buffer of (name, thread, start, duration) spans.
+
+    Storage is four preallocated NumPy arrays, so recording a span is a
+    counter increment and four item stores; once `capacity` spans have been
+    recorded the oldest are overwritten.
+
+    Args:
+        capacity (int): Number of spans kept.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.start_ns = np.zeros(capacity, dtype=np.int64)
+        self.duration_ns = np.zeros(capacity, dtype=np.int64)
+        self.name_id = np.zeros(capacity, dtype=np.int32)
+        self.thread_id = np.zeros(capacity, dtype=np.uint64)
+        self.names = []
+        self._name_ids = {}
+        self._lock = threading.Lock()
+        self._counter = itertools.count()  # next() is atomic under the GIL
+        self.recorded = 0
+        self.origin_ns = time.perf_counter_ns()
+
+    def name_index(self, name: str) -> int:
+        """Intern a span name and return its id."""
+        index = self._name_ids.get(name)
+        if index is None:
+            with self._lock:
+                index = self._name_ids.get(name)
+                if index is None:
+                    index = len(self.names)
+                    self.names.append(name)
+                    self._name_ids[name] = index
+        return index
+
+    def record(self, name_id: int, start_ns: int, end_ns: int) -> None:
+        """Store one span, overwriting the oldest if the buffer is full."""
+        n = next(self._counter)
+        i = n % self.capacity
+        self.start_ns[i] = start_ns
+        self.duration_ns[i] = end_ns - start_ns
+        self.name_id[i] = name_id
+        self.thread_id[i] = threading.get_ident()
+        self.recorded = n + 1
+
+    def spans(self) -> tuple:
+        """
+        Return the spans still in the buffer, oldest first.
+
+        Returns:
+            tuple: (name_id, thread_id, start_ns, duration_ns) arrays.
+        """
+        n = self.recorded
+        if n <= self.capacity:
+            order = np.arange(n)
+        else:
+            order = np.roll(np.arange(self.capacity), -(n % self.capacity))
+        return self.name_id[order], self.thread_id[order], self.start_ns[order], self.duration_ns[order]
+
+
+class _Span:
+    """Context manager recording one span into a SpanRecorder."""
+
+    __slots__ = ("recorder", "name_id", "start")
+
+    def __init__(self, recorder: SpanRecorder, name_id: int):
+        self.recorder = recorder
+        self.name_id = name_id
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.name_id, self.start, time.perf_counter_ns())
+        return False
+
+
+class _NullSpan:
+    """Shared context manager used while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _recorder_from_env():
+    if not os.environ.get(TRACE_ENV):
+        return None
+    return SpanRecorder(int(os.environ.get(CAPACITY_ENV, DEFAULT_CAPACITY)))
+
+
+# The process-wide recorder, or None when GOL_TRACE is unset
+RECORDER = _recorder_from_env()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 1) Instrumentation API
+# ─────────────────────────────────────────────────────────────────────────────
+
+def span(name: str):
+    """
+    Context manager timing the enclosed block as a span called `name`.
+
+    Returns a shared no-op context manager when tracing is off.
+    """
+    if RECORDER is None:
+        return _NULL_SPAN
+    return _Span(RECORDER, RECORDER.name_index(name))
+
+
+def traced(name: str = None):
+    """
+    Decorator recording every call of the function as a span.
+
+    When tracing is off the function is returned unchanged, so there is no
+    cost at all. Numba dispatchers can be decorated as long as they are only
+    called from Python.
+
+    Args:
+        name (str): Span name; defaults to the function's __name__.
+    """
+    def decorator(func):
+        if RECORDER is None:
+            return func
+        recorder = RECORDER
+        name_id = recorder.name_index(name or func.__name__)
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.record(name_id, start, clock())
+        return wrapper
+    return decorator
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# 2) Export
+# ─────────────────────────────────────────────────────────────────────────────
+
+def write_chrome_trace(path, recorder: SpanRecorder = None) -> int:
+    """
+    Write the buffered spans as Chrome trace JSON ("X" complete events).
+
+    The file opens in chrome://tracing and in the Perfetto UI.
+
+    Returns:
+        int: Number of spans written.
+    """
+    recorder = recorder or RECORDER
+    name_id, thread_id, start_ns, duration_ns = recorder.spans()
+    threads = {tid: i for i, tid in enumerate(dict.fromkeys(thread_id.tolist()))}
+    pid = os.getpid()
+    events = [
+        {"name": recorder.names[n], "ph": "X", "pid": pid, "tid": threads[t],
+         "ts": (s - recorder.origin_ns) / 1000, "dur": d / 1000}
+        for n, t, s, d in zip(name_id.tolist(), thread_id.tolist(), start_ns.tolist(), duration_ns.tolist())
+    ]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ns",
+                   "otherData": {"recorded": recorder.recorded, "capacity": recorder.capacity}}, f)
+    return len(events)
+
+
+def latency_histograms(recorder: SpanRecorder = None) -> dict:
+    """
+    Summarise the buffered spans per name.
+
+    Returns:
+        dict: name -> {"count", "total_ms", "mean_us", "p50_us", "p90_us",
+        "p99_us", "max_us", "buckets"}, where buckets maps the lower edge of
+        each power-of-two nanosecond bucket to its count.
+    """
+    recorder = recorder or RECORDER
+    name_id, _, _, duration_ns = recorder.spans()
+    edges = 2 ** np.arange(HIST_MIN_EXP, HIST_MAX_EXP + 1, dtype=np.int64)
+    summary = {}
+    for index, name in enumerate(recorder.names):
+        durations = duration_ns[name_id == index]
+        if durations.size == 0:
+            continue
+        p50, p90, p99 = np.percentile(durations, [50, 90, 99]) / 1000
+        counts = np.bincount(np.searchsorted(edges, durations, side="right"), minlength=edges.size + 1)
+        lower = np.concatenate(([0], edges))
+        summary[name] = {
+            "count": int(durations.size),
+            "total_ms": float(durations.sum()) / 1e6,
+            "mean_us": float(durations.mean()) / 1000,
+            "p50_us": float(p50), "p90_us": float(p90), "p99_us": float(p99),
+            "max_us": float(durations.max()) / 1000,
+            "buckets": {int(edge): int(count) for edge, count in zip(lower, counts) if count},
+        }
+    return summary
+
+
+def _format_ns(ns: int) -> str:
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3g} {unit}"
+    return f"{ns} ns"
+
+
+def print_histograms(histograms: dict, file=sys.stderr, width: int = 40) -> None:
+    """Print the latency summary table and a bar chart per span name."""
+    print(f"{'span':<32} {'count':>9} {'total ms':>11} {'mean us':>12} {'p50 us':>12} "
+          f"{'p99 us':>12} {'max us':>12}", file=file)
+    for name, h in sorted(histograms.items(), key=lambda kv: -kv[1]["total_ms"]):
+        print(f"{name:<32} {h['count']:>9} {h['total_ms']:>11.2f} {h['mean_us']:>12.2f} "
+              f"{h['p50_us']:>12.2f} {h['p99_us']:>12.2f} {h['max_us']:>12.2f}", file=file)
+    for name, h in histograms.items():
+        print(f"\n{name}", file=file)
+        peak = max(h["buckets"].values())
+        for edge, count in h["buckets"].items():
+            bar = "#" * max(1, round(width * count / peak))
+            print(f"  >= {_format_ns(edge):>8} {count:>9} {bar}", file=file)
+
+
+def _write_at_exit():
+    if RECORDER is None or RECORDER.recorded == 0:
+        return
+    path = os.environ[TRACE_ENV]
+    if path.lower() in ("1", "true", "yes"):
+        path = DEFAULT_TRACE_FILE
+    import multiprocessing
+    if multiprocessing.parent_process() is not None:
+        # Worker processes (process pools, isolated benchmarks) get their own file
+        root, ext = os.path.splitext(path)
+        path = f"{root}.{os.getpid()}{ext}"
+    n = write_chrome_trace(path)
+    dropped = RECORDER.recorded - n
+    note = f" ({dropped} older spans overwritten; raise {CAPACITY_ENV})" if dropped else ""
+    print(f"\n[Trace] {n} spans written to {path}{note}", file=sys.stderr)
+    print_histograms(latency_histograms(), file=sys.stderr)
+
+
+atexit.register(_write_at_exit)
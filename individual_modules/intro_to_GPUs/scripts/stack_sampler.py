@@ -0,0 +1,235 @@
+"""
+In-Process Sampling Profiler
+
+cProfile traces every Python call, so it slows down most exactly the
+Python-heavy code we want to measure (life_step_naive,
+temperature_diffusion_purepython). A sampling profiler instead looks at
+the stacks a fixed number of times per second:
+
+- signal.setitimer(ITIMER_PROF) delivers SIGPROF every 1/HZ seconds of CPU
+  time (ITIMER_REAL and SIGALRM with clock="wall")
+- the handler reads every thread's stack with sys._current_frames() and
+  counts the collapsed stack (root first) in a dict keyed by code objects,
+  so a sample costs a dictionary update per thread
+- the overhead is bounded by HZ times the cost of one sample; the time
+  spent in the handler is measured and reported
+
+Results are written as folded stacks ("frame;frame;frame count" per line,
+ready for flamegraph.pl, speedscope or inferno) and printed as a top-N
+table of self time (samples with the function on top of the stack) and
+total time (samples with the function anywhere on the stack).
+
+The entry points in game_of_life_profiled.py take `--profile-sample HZ`.
+Signals are POSIX only and are handled by the main thread, so the sampler
+must be started from the main thread.
+
+Usage:
+    with StackSampler(hz=200) as sampler:
+        simulate_life_naive(100, 50)
+    sampler.write_folded("naive.folded")
+    sampler.print_top(20)
+"""
+
+# -------------------------------------------------------------------
+# Library imports
+# -------------------------------------------------------------------
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Constants
+# ─────────────────────────────────────────────────────────────────────────────
+
+# clock -> (interval timer, signal it delivers)
+CLOCKS = {
+    "cpu": ("ITIMER_PROF", "SIGPROF"),
+    "wall": ("ITIMER_REAL", "SIGALRM"),
+}
+
+
+def _frame_label(code) -> str:
+    """Frame name used in the folded output, e.g. life_step_naive (game_of_life.py:120)."""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Signal-driven stack sampler.
+
+    Args:
+        hz (float): Samples per second of the chosen clock. The kernel may
+            deliver fewer (interval timers tick at its timer frequency,
+            often 250 Hz), so the table reports the samples actually taken.
+        clock (str): "cpu" (process CPU time, SIGPROF) or "wall" (SIGALRM).
+        all_threads (bool): Sample every thread, not only the main thread.
+            Each stack is rooted at its thread name.
+    """
+
+    def __init__(self, hz: float = 100.0, clock: str = "cpu", all_threads: bool = True):
+        if clock not in CLOCKS:
+            raise ValueError(f"clock must be one of {sorted(CLOCKS)}")
+        timer, sig = CLOCKS[clock]
+        if not hasattr(signal, timer):
+            raise RuntimeError("the sampling profiler needs POSIX interval timers (signal.setitimer)")
+        self.hz = hz
+        self.timer = getattr(signal, timer)
+        self.signal = getattr(signal, sig)
+        self.all_threads = all_threads
+        self.stacks = Counter()      # (thread name, code, code, ...) root first -> samples
+        self.samples = 0
+        self.handler_ns = 0
+        self.elapsed = 0.0
+        self._previous = None
+
+    # ── sampling ────────────────────────────────────────────────────────────
+
+    def _collapse(self, frame, thread_name: str) -> tuple:
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        codes.append(thread_name)
+        return tuple(reversed(codes))
+
+    def _sample(self, signum, frame):
+        start = time.perf_counter_ns()
+        self.samples += 1
+        # The handler runs on the main thread; `frame` is where it was interrupted
+        self.stacks[self._collapse(frame, "MainThread")] += 1
+        if self.all_threads:
+            main = threading.main_thread().ident
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, thread_frame in sys._current_frames().items():
+                if ident != main:
+                    self.stacks[self._collapse(thread_frame, names.get(ident, f"Thread-{ident}"))] += 1
+        self.handler_ns += time.perf_counter_ns() - start
+
+    def start(self) -> "StackSampler":
+        """Install the signal handler and start the interval timer."""
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("StackSampler must be started from the main thread")
+        self._previous = signal.signal(self.signal, self._sample)
+        interval = 1.0 / self.hz
+        signal.setitimer(self.timer, interval, interval)
+        self._t0 = time.perf_counter()
+        return self
+
+    def stop(self) -> None:
+        """Stop the timer and restore the previous signal handler."""
+        signal.setitimer(self.timer, 0, 0)
+        signal.signal(self.signal, self._previous)
+        self.elapsed += time.perf_counter() - self._t0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    # ── results ─────────────────────────────────────────────────────────────
+
+    def folded(self) -> list:
+        """
+        Return the collapsed stacks as folded lines, most frequent first.
+
+        Returns:
+            list[str]: "thread;outer;...;inner count" lines.
+        """
+        lines = []
+        for stack, count in self.stacks.most_common():
+            labels = [stack[0]] + [_frame_label(code) for code in stack[1:]]
+            lines.append(";".join(label.replace(";", ":") for label in labels) + f" {count}")
+        return lines
+
+    def write_folded(self, path) -> None:
+        """Write the folded stacks for flamegraph tools."""
+        with open(path, "w") as f:
+            f.write("\n".join(self.folded()) + "\n")
+
+    def top(self, n: int = 20) -> list:
+        """
+        Return the n functions with the most self samples.
+
+        Returns:
+            list[tuple[str, int, int]]: (function, self samples, total samples).
+        """
+        self_counts, total_counts = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            codes = stack[1:]
+            if codes:
+                self_counts[codes[-1]] += count
+            for code in set(codes):
+                total_counts[code] += count
+        return [(_frame_label(code), count, total_counts[code]) for code, count in self_counts.most_common(n)]
+
+    def print_top(self, n: int = 20, file=sys.stdout) -> None:
+        """Print the self-time table and the sampler's own overhead."""
+        stacks = sum(self.stacks.values()) or 1
+        print(f"[Sample] {self.samples} samples at {self.hz:g} Hz over {self.elapsed:.2f} s; "
+              f"handler time {self.handler_ns / 1e6:.1f} ms "
+              f"({100 * self.handler_ns / 1e9 / max(self.elapsed, 1e-9):.2f}% overhead)", file=file)
+        print(f"{'self %':>7} {'total %':>8} {'self':>7}  function", file=file)
+        for label, self_count, total_count in self.top(n):
+            print(f"{100 * self_count / stacks:>7.1f} {100 * total_count / stacks:>8.1f} {self_count:>7}  {label}",
+                  file=file)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLI helpers for the entry points
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _NoSampler:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _SampleAndReport:
+    """Run a StackSampler for the block, then write the folded file and print the table."""
+
+    def __init__(self, sampler: StackSampler, output, top: int):
+        self.sampler = sampler
+        self.output = output
+        self.top = top
+
+    def __enter__(self):
+        return self.sampler.start()
+
+    def __exit__(self, *exc):
+        self.sampler.stop()
+        self.sampler.write_folded(self.output)
+        self.sampler.print_top(self.top)
+        print(f"[Sample] Folded stacks saved to {self.output}")
+        return False
+
+
+def add_sampling_arguments(parser) -> None:
+    """Add --profile-sample HZ, --profile-clock, --profile-output and --profile-top to a parser."""
+    parser.add_argument("--profile-sample", type=float, default=None, metavar="HZ",
+                        help="Sample the stacks HZ times per second (low-overhead alternative to --profile-cpu)")
+    parser.add_argument("--profile-clock", choices=sorted(CLOCKS), default="cpu",
+                        help="Clock driving --profile-sample: CPU time or wall time")
+    parser.add_argument("--profile-output", default=None,
+                        help="Folded-stacks file for --profile-sample")
+    parser.add_argument("--profile-top", type=int, default=20, help="Rows of the --profile-sample table")
+
+
+def sampling_from_args(args, default_output: str):
+    """
+    Context manager profiling the block as requested by add_sampling_arguments.
+
+    A no-op unless --profile-sample was given; then the folded stacks are
+    written to --profile-output (default `default_output`) and the top-N
+    table is printed when the block ends.
+    """
+    if args.profile_sample is None:
+        return _NoSampler()
+    sampler = StackSampler(args.profile_sample, args.profile_clock)
+    return _SampleAndReport(sampler, args.profile_output or default_output, args.profile_top)
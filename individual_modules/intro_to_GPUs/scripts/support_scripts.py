@@ -20,18 +20,18 @@ Entry points (via CLI):
 # Library imports
 # -------------------------------------------------------------------
 
-from ast import Str
-from matplotlib import animation
-import xarray as xr
+# xarray, matplotlib, plotly and CuPy are imported inside the functions that
+# use them, so each entry point only pays for (and needs) its own libraries
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 from pathlib import Path
-import plotly.graph_objects as go
 import argparse
 import subprocess
 import os
-import cupy
+
+try:
+    from .lazy_imports import require_cupy
+except ImportError:  # executed from within the scripts directory
+    from lazy_imports import require_cupy
 
 # -------------------------------------------------------------------
 # Constants
@@ -48,6 +48,11 @@ def cuda_check():
 
     Uses CuPy's runtime API to query device count.
     """
+    try:
+        cupy = require_cupy()
+    except (ImportError, RuntimeError) as exc:
+        print(f"Number of CUDA devices: 0 ({exc})")
+        return
     num_devices = cupy.cuda.runtime.getDeviceCount()
     print(f"Number of CUDA devices: {num_devices}")
 
@@ -98,6 +103,8 @@ def calculate_summary(data_file):
         - Mean, max, min, std of the temperature
         - Full dataset dimension and coordinate details
     """
+    import xarray as xr
+
     # Load the NetCDF file from the data directory
     file_path = DATA_DIR / data_file
     data = xr.open_dataset(file_path)
@@ -147,6 +154,9 @@ def visualisation_static():
     )
     args = parser.parse_args()
 
+    import xarray as xr
+    import matplotlib.pyplot as plt
+
     # Now call your existing logic, passing args.data_file
     file_path = DATA_DIR / args.data_file
     data = xr.open_dataset(file_path)
@@ -179,6 +189,9 @@ def plot_slice(target_depth=0, animation_speed=100, data_file=ORIGINAL_DATA_FILE
     Saves:
         An HTML file with a Plotly animated heatmap in OUTPUT_DIR.
     """
+    import xarray as xr
+    import plotly.graph_objects as go
+
     # Load the NetCDF file
     file_path = DATA_DIR / data_file
     data = xr.open_dataset(file_path)
@@ -319,6 +332,9 @@ def plot_cube(num_depths=3, num_time_steps=3, data_file=ORIGINAL_DATA_FILE):
     Saves:
         An HTML file with a Plotly 3D animated cube in OUTPUT_DIR.
     """
+    import xarray as xr
+    import plotly.graph_objects as go
+
     # Load the NetCDF file
     file_path = DATA_DIR / data_file
     data = xr.open_dataset(file_path)
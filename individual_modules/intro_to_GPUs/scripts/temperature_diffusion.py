@@ -9,10 +9,20 @@ This module implements a simple 3D temperature diffusion model using three backe
 Functions:
 - load_data: Load ocean temperature data from a NetCDF file.
 - save_to_netcdf: Save computed temperature fields back to NetCDF.
+- diffusion_step_*: One diffusion timestep of each backend (traced, see
+  span_timer.py).
+- prepare_* / diffuse_*: Build a backend's fields from the dataset, and the
+  compute kernel that only runs the timesteps (what benchmark_harness.py
+  times); temperature_diffusion_* wrap them with the NetCDF output.
 - temperature_diffusion_numpy: Run diffusion with NumPy arrays.
 - temperature_diffusion_cupy: Run diffusion on GPU via CuPy.
 - temperature_diffusion_purepython: Naive pure-Python implementation.
 - run_diffusion_*: Entry points for CLI execution.
+- run_diffusion: Entry point for any backend; --backend auto picks one from
+  backend_calibration.py.
+
+xarray and CuPy are imported on first use (see lazy_imports.py), so the CPU
+models run on machines without CUDA.
 """
 
 
@@ -20,17 +30,23 @@ Functions:
 # Library imports
 # -------------------------------------------------------------------
 
-import xarray as xr
 from pathlib import Path
 import argparse
 import time
-import xarray as xr
 import numpy as np
-import cupy as cp
 from tqdm import tqdm 
 import math
 import copy
 
+try:
+    from .lazy_imports import require_cupy
+    from .span_timer import traced
+    from .stack_sampler import add_sampling_arguments, sampling_from_args
+except ImportError:  # executed from within the scripts directory
+    from lazy_imports import require_cupy
+    from span_timer import traced
+    from stack_sampler import add_sampling_arguments, sampling_from_args
+
 # -------------------------------------------------------------------
 # Constants
 # -------------------------------------------------------------------
@@ -63,6 +79,8 @@ def load_data():
     Returns:
         xr.Dataset: An xarray Dataset containing the loaded data.
     """
+    import xarray as xr
+
     file_path = DATA_DIR / DATA_FILE
     return xr.open_dataset(file_path)
 
@@ -81,6 +99,8 @@ def save_to_netcdf(data, new_temperature, output_file_path, num_timesteps):
         output_file_path (Path or str): Path to write the new NetCDF file.
         num_timesteps (int): Number of timesteps to include in the output.
     """
+    import xarray as xr
+
     # Adjust new_temperature to have only num_timesteps or fewer
     new_temperature = new_temperature[:num_timesteps]  # Only include the desired number of timesteps
 
@@ -103,13 +123,111 @@ def save_to_netcdf(data, new_temperature, output_file_path, num_timesteps):
 # Diffusion model implementations
 # -------------------------------------------------------------------
 
+@traced("numpy_diffusion_step")
+def diffusion_step_numpy(temperature, mask, new_temperature, diffusion_coeff):
+    """
+    Apply one diffusion timestep with NumPy, writing into new_temperature.
+
+    Args:
+        temperature (np.ndarray): Current temperatures.
+        mask (np.ndarray): True for ocean points, False for land (NaN).
+        new_temperature (np.ndarray): Output buffer, same shape as temperature.
+        diffusion_coeff (float): Diffusion coefficient.
+    """
+    # Apply diffusion calculation with mask-based boundary handling
+    temp_copy = temperature[1:-1, 1:-1, 1:-1]  # Core section without boundaries
+    neighbor_sum = np.zeros_like(temp_copy)
+    neighbor_count = np.zeros_like(temp_copy)
+
+    # Sum available neighbors and count them only for valid ocean points
+    if mask[:-2, 1:-1, 1:-1].any():  # Front
+        neighbor_sum += np.where(mask[:-2, 1:-1, 1:-1], temperature[:-2, 1:-1, 1:-1], 0)
+        neighbor_count += mask[:-2, 1:-1, 1:-1]
+
+    if mask[2:, 1:-1, 1:-1].any():  # Back
+        neighbor_sum += np.where(mask[2:, 1:-1, 1:-1], temperature[2:, 1:-1, 1:-1], 0)
+        neighbor_count += mask[2:, 1:-1, 1:-1]
+
+    if mask[1:-1, :-2, 1:-1].any():  # Left
+        neighbor_sum += np.where(mask[1:-1, :-2, 1:-1], temperature[1:-1, :-2, 1:-1], 0)
+        neighbor_count += mask[1:-1, :-2, 1:-1]
+
+    if mask[1:-1, 2:, 1:-1].any():  # Right
+        neighbor_sum += np.where(mask[1:-1, 2:, 1:-1], temperature[1:-1, 2:, 1:-1], 0)
+        neighbor_count += mask[1:-1, 2:, 1:-1]
+
+    if mask[1:-1, 1:-1, :-2].any():  # Bottom
+        neighbor_sum += np.where(mask[1:-1, 1:-1, :-2], temperature[1:-1, 1:-1, :-2], 0)
+        neighbor_count += mask[1:-1, 1:-1, :-2]
+
+    if mask[1:-1, 1:-1, 2:].any():  # Top
+        neighbor_sum += np.where(mask[1:-1, 1:-1, 2:], temperature[1:-1, 1:-1, 2:], 0)
+        neighbor_count += mask[1:-1, 1:-1, 2:]
+
+    # Apply diffusion to valid points only, avoiding NaN regions
+    new_temperature[1:-1, 1:-1, 1:-1] = np.where(
+        mask[1:-1, 1:-1, 1:-1],
+        temp_copy + diffusion_coeff * (neighbor_sum - 6 * temp_copy) / np.maximum(neighbor_count, 1),
+        temperature[1:-1, 1:-1, 1:-1]
+    )
+
+
+def prepare_numpy(data, num_timesteps):
+    """
+    Build the fields of temperature_diffusion_numpy from a dataset.
+
+    The first time slice of 'thetao' is tiled num_timesteps times, as the
+    model has always done.
+
+    Returns:
+        tuple: (temperature, mask, new_temperature) NumPy arrays for diffuse_numpy.
+    """
+    temperature = np.asarray(data['thetao'].values)  # Convert to a NumPy array
+    temperature = temperature[0:1, :, :, :]
+    temperature = np.tile(temperature, (num_timesteps, 1, 1, 1))
+
+    mask = ~np.isnan(temperature)  # Mask: True for ocean points, False for NaN regions (land)
+    new_temperature = np.copy(temperature)
+    return temperature, mask, new_temperature
+
+
+@traced()
+def diffuse_numpy(temperature, mask, new_temperature, num_timesteps, diffusion_coeff=0.1, progress=None):
+    """
+    Compute kernel of temperature_diffusion_numpy: the timesteps only.
+
+    No data is loaded, copied or saved and nothing is printed, so the
+    benchmarks (benchmark_harness.py) time steady-state stepping.
+
+    Args:
+        temperature, mask, new_temperature: Fields from prepare_numpy; the
+            result is written to new_temperature.
+        num_timesteps (int): Number of timesteps to simulate.
+        diffusion_coeff (float, optional): Diffusion coefficient. Defaults to 0.1.
+        progress (str, optional): tqdm description; None shows no progress bar.
+
+    Returns:
+        list[float]: Wall time of each timestep in seconds.
+    """
+    timestep_durations = []
+    steps = range(num_timesteps) if progress is None else tqdm(range(num_timesteps), desc=progress)
+    for t in steps:
+        start_time = time.time()
+        diffusion_step_numpy(temperature, mask, new_temperature, diffusion_coeff)
+        timestep_durations.append(time.time() - start_time)
+        temperature = new_temperature
+    return timestep_durations
+
+
 # Temperature diffusion function using NumPy with masking for boundaries
+@traced()
 def temperature_diffusion_numpy(data, num_timesteps, diffusion_coeff=0.1):
     """
     Simulate temperature diffusion over time using NumPy arrays.
 
     A simple 3D diffusion stencil is applied across the ocean grid,
-    with NaN regions (land) masked out.
+    with NaN regions (land) masked out. Wraps prepare_numpy and the
+    diffuse_numpy kernel with the NetCDF output and timing report.
 
     Args:
         data (xr.Dataset): Input dataset containing the 'thetao' variable.
@@ -120,62 +238,16 @@ def temperature_diffusion_numpy(data, num_timesteps, diffusion_coeff=0.1):
         - Saves the resulting temperature field to a NetCDF file (OUTPUT_FILE_NUMPY).
         - Prints timing statistics to stdout.
     """
-    temperature = np.asarray(data['thetao'].values)  # Convert to a NumPy array
-    temperature = temperature[0:1, :, :, :]
-    temperature = np.tile(temperature, (num_timesteps, 1, 1, 1))
-    
-    mask = ~np.isnan(temperature)  # Mask: True for ocean points, False for NaN regions (land)
-    new_temperature = np.copy(temperature)
-    timestep_durations = []
+    temperature, mask, new_temperature = prepare_numpy(data, num_timesteps)
 
     # Extract the first timestamp and create a new time coordinate for the predicted timesteps
     original_time = data['time'].values
     time_coord = np.array([original_time[0] + np.timedelta64(i, 'D') for i in range(num_timesteps)])
 
     # Run the diffusion model
-    for t in tqdm(range(num_timesteps), desc="NumPy Diffusion Progress"):
-        start_time = time.time()
-
-        # Apply diffusion calculation with mask-based boundary handling
-        temp_copy = temperature[1:-1, 1:-1, 1:-1]  # Core section without boundaries
-        neighbor_sum = np.zeros_like(temp_copy)
-        neighbor_count = np.zeros_like(temp_copy)
-
-        # Sum available neighbors and count them only for valid ocean points
-        if mask[:-2, 1:-1, 1:-1].any():  # Front
-            neighbor_sum += np.where(mask[:-2, 1:-1, 1:-1], temperature[:-2, 1:-1, 1:-1], 0)
-            neighbor_count += mask[:-2, 1:-1, 1:-1]
-
-        if mask[2:, 1:-1, 1:-1].any():  # Back
-            neighbor_sum += np.where(mask[2:, 1:-1, 1:-1], temperature[2:, 1:-1, 1:-1], 0)
-            neighbor_count += mask[2:, 1:-1, 1:-1]
-
-        if mask[1:-1, :-2, 1:-1].any():  # Left
-            neighbor_sum += np.where(mask[1:-1, :-2, 1:-1], temperature[1:-1, :-2, 1:-1], 0)
-            neighbor_count += mask[1:-1, :-2, 1:-1]
+    timestep_durations = diffuse_numpy(temperature, mask, new_temperature, num_timesteps, diffusion_coeff,
+                                       progress="NumPy Diffusion Progress")
 
-        if mask[1:-1, 2:, 1:-1].any():  # Right
-            neighbor_sum += np.where(mask[1:-1, 2:, 1:-1], temperature[1:-1, 2:, 1:-1], 0)
-            neighbor_count += mask[1:-1, 2:, 1:-1]
-
-        if mask[1:-1, 1:-1, :-2].any():  # Bottom
-            neighbor_sum += np.where(mask[1:-1, 1:-1, :-2], temperature[1:-1, 1:-1, :-2], 0)
-            neighbor_count += mask[1:-1, 1:-1, :-2]
-
-        if mask[1:-1, 1:-1, 2:].any():  # Top
-            neighbor_sum += np.where(mask[1:-1, 1:-1, 2:], temperature[1:-1, 1:-1, 2:], 0)
-            neighbor_count += mask[1:-1, 1:-1, 2:]
-
-        # Apply diffusion to valid points only, avoiding NaN regions
-        new_temperature[1:-1, 1:-1, 1:-1] = np.where(
-            mask[1:-1, 1:-1, 1:-1],
-            temp_copy + diffusion_coeff * (neighbor_sum - 6 * temp_copy) / np.maximum(neighbor_count, 1),
-            temperature[1:-1, 1:-1, 1:-1]
-        )
-
-        timestep_durations.append(time.time() - start_time)
-        temperature = new_temperature
-        
     # Convert to final temperature and save
     final_temperature = new_temperature
     
@@ -202,13 +274,102 @@ def run_diffusion_numpy():
     # Pass parsed arguments to visualisation_slice
     temperature_diffusion_numpy(data=load_data(), num_timesteps=args.num_timesteps)
 
+
+@traced("cupy_diffusion_step")
+def diffusion_step_cupy(temperature, mask, new_temperature, diffusion_coeff):
+    """
+    Apply one diffusion timestep on the GPU, writing into new_temperature.
+
+    Same stencil as diffusion_step_numpy on CuPy arrays; returns once the
+    GPU has finished, so the step can be timed.
+    """
+    cp = require_cupy()
+
+    # Apply diffusion calculation with mask-based boundary handling
+    temp_copy = temperature[1:-1, 1:-1, 1:-1]  # Core section without boundaries
+    neighbor_sum = cp.zeros_like(temp_copy)
+    neighbor_count = cp.zeros_like(temp_copy)
+
+    # Sum available neighbors and count them only for valid ocean points
+    if mask[:-2, 1:-1, 1:-1].any():  # Front
+        neighbor_sum += cp.where(mask[:-2, 1:-1, 1:-1], temperature[:-2, 1:-1, 1:-1], 0)
+        neighbor_count += mask[:-2, 1:-1, 1:-1]
+
+    if mask[2:, 1:-1, 1:-1].any():  # Back
+        neighbor_sum += cp.where(mask[2:, 1:-1, 1:-1], temperature[2:, 1:-1, 1:-1], 0)
+        neighbor_count += mask[2:, 1:-1, 1:-1]
+
+    if mask[1:-1, :-2, 1:-1].any():  # Left
+        neighbor_sum += cp.where(mask[1:-1, :-2, 1:-1], temperature[1:-1, :-2, 1:-1], 0)
+        neighbor_count += mask[1:-1, :-2, 1:-1]
+
+    if mask[1:-1, 2:, 1:-1].any():  # Right
+        neighbor_sum += cp.where(mask[1:-1, 2:, 1:-1], temperature[1:-1, 2:, 1:-1], 0)
+        neighbor_count += mask[1:-1, 2:, 1:-1]
+
+    if mask[1:-1, 1:-1, :-2].any():  # Bottom
+        neighbor_sum += cp.where(mask[1:-1, 1:-1, :-2], temperature[1:-1, 1:-1, :-2], 0)
+        neighbor_count += mask[1:-1, 1:-1, :-2]
+
+    if mask[1:-1, 1:-1, 2:].any():  # Top
+        neighbor_sum += cp.where(mask[1:-1, 1:-1, 2:], temperature[1:-1, 1:-1, 2:], 0)
+        neighbor_count += mask[1:-1, 1:-1, 2:]
+
+    # Apply diffusion to valid points only, avoiding NaN regions
+    new_temperature[1:-1, 1:-1, 1:-1] = cp.where(
+        mask[1:-1, 1:-1, 1:-1],
+        temp_copy + diffusion_coeff * (neighbor_sum - 6 * temp_copy) / cp.maximum(neighbor_count, 1),
+        temperature[1:-1, 1:-1, 1:-1]
+    )
+
+    cp.cuda.Stream.null.synchronize()  # Wait for the GPU computation to complete
+
+
+def prepare_cupy(data, num_timesteps):
+    """
+    Build the fields of temperature_diffusion_cupy on the GPU (see prepare_numpy).
+
+    Returns:
+        tuple: (temperature, mask, new_temperature) CuPy arrays for diffuse_cupy.
+    """
+    cp = require_cupy()
+    temperature = cp.asarray(data['thetao'].values)  # Convert to a CuPy array
+    temperature = temperature[0:1, :, :, :]
+    temperature = np.tile(temperature, (num_timesteps, 1, 1, 1))
+
+    mask = ~cp.isnan(temperature)  # Mask: True for ocean points, False for NaN regions (land)
+    new_temperature = cp.copy(temperature)
+    cp.cuda.Stream.null.synchronize()
+    return temperature, mask, new_temperature
+
+
+@traced()
+def diffuse_cupy(temperature, mask, new_temperature, num_timesteps, diffusion_coeff=0.5, progress=None):
+    """
+    Compute kernel of temperature_diffusion_cupy: the timesteps only (see diffuse_numpy).
+
+    Returns:
+        list[float]: Wall time of each timestep in seconds, GPU work included.
+    """
+    timestep_durations = []
+    steps = range(num_timesteps) if progress is None else tqdm(range(num_timesteps), desc=progress)
+    for t in steps:
+        start_time = time.time()
+        diffusion_step_cupy(temperature, mask, new_temperature, diffusion_coeff)
+        timestep_durations.append(time.time() - start_time)
+        temperature = new_temperature
+    return timestep_durations
+
+
 # # Temperature diffusion function using CuPy with masking for boundaries
+@traced()
 def temperature_diffusion_cupy(data, num_timesteps, diffusion_coeff=0.5):
     """
     Simulate temperature diffusion over time using CuPy (GPU acceleration).
 
     Similar stencil as the NumPy version, but runs on the GPU.
-    Data is converted back to NumPy before saving.
+    Data is converted back to NumPy before saving. Wraps prepare_cupy and
+    the diffuse_cupy kernel with the NetCDF output and timing report.
 
     Args:
         data (xr.Dataset): Input dataset containing 'thetao'.
@@ -219,62 +380,16 @@ def temperature_diffusion_cupy(data, num_timesteps, diffusion_coeff=0.5):
         - Saves the resulting field to a NetCDF file (OUTPUT_FILE_CUPY).
         - Prints timing statistics.
     """
-    temperature = cp.asarray(data['thetao'].values)  # Convert to a CuPy array
-    temperature = temperature[0:1, :, :, :]
-    temperature = np.tile(temperature, (num_timesteps, 1, 1, 1))
-
-    mask = ~cp.isnan(temperature)  # Mask: True for ocean points, False for NaN regions (land)
-    new_temperature = cp.copy(temperature)
-    timestep_durations = []
+    cp = require_cupy()
+    temperature, mask, new_temperature = prepare_cupy(data, num_timesteps)
 
     # Extract the first timestamp and create a new time coordinate for the predicted timesteps
     original_time = data['time'].values
     time_coord = np.array([original_time[0] + np.timedelta64(i, 'D') for i in range(num_timesteps)])
 
     # Run the diffusion model
-    for t in tqdm(range(num_timesteps), desc="CuPy Diffusion Progress"):
-        start_time = time.time()
-
-        # Apply diffusion calculation with mask-based boundary handling
-        temp_copy = temperature[1:-1, 1:-1, 1:-1]  # Core section without boundaries
-        neighbor_sum = cp.zeros_like(temp_copy)
-        neighbor_count = cp.zeros_like(temp_copy)
-
-        # Sum available neighbors and count them only for valid ocean points
-        if mask[:-2, 1:-1, 1:-1].any():  # Front
-            neighbor_sum += cp.where(mask[:-2, 1:-1, 1:-1], temperature[:-2, 1:-1, 1:-1], 0)
-            neighbor_count += mask[:-2, 1:-1, 1:-1]
-
-        if mask[2:, 1:-1, 1:-1].any():  # Back
-            neighbor_sum += cp.where(mask[2:, 1:-1, 1:-1], temperature[2:, 1:-1, 1:-1], 0)
-            neighbor_count += mask[2:, 1:-1, 1:-1]
-
-        if mask[1:-1, :-2, 1:-1].any():  # Left
-            neighbor_sum += cp.where(mask[1:-1, :-2, 1:-1], temperature[1:-1, :-2, 1:-1], 0)
-            neighbor_count += mask[1:-1, :-2, 1:-1]
-
-        if mask[1:-1, 2:, 1:-1].any():  # Right
-            neighbor_sum += cp.where(mask[1:-1, 2:, 1:-1], temperature[1:-1, 2:, 1:-1], 0)
-            neighbor_count += mask[1:-1, 2:, 1:-1]
-
-        if mask[1:-1, 1:-1, :-2].any():  # Bottom
-            neighbor_sum += cp.where(mask[1:-1, 1:-1, :-2], temperature[1:-1, 1:-1, :-2], 0)
-            neighbor_count += mask[1:-1, 1:-1, :-2]
-
-        if mask[1:-1, 1:-1, 2:].any():  # Top
-            neighbor_sum += cp.where(mask[1:-1, 1:-1, 2:], temperature[1:-1, 1:-1, 2:], 0)
-            neighbor_count += mask[1:-1, 1:-1, 2:]
-
-        # Apply diffusion to valid points only, avoiding NaN regions
-        new_temperature[1:-1, 1:-1, 1:-1] = cp.where(
-            mask[1:-1, 1:-1, 1:-1],
-            temp_copy + diffusion_coeff * (neighbor_sum - 6 * temp_copy) / cp.maximum(neighbor_count, 1),
-            temperature[1:-1, 1:-1, 1:-1]
-        )
-
-        cp.cuda.Stream.null.synchronize()  # Wait for the GPU computation to complete
-        timestep_durations.append(time.time() - start_time)
-        temperature = new_temperature
+    timestep_durations = diffuse_cupy(temperature, mask, new_temperature, num_timesteps, diffusion_coeff,
+                                      progress="CuPy Diffusion Progress")
 
         
     # Convert back to NumPy and save
@@ -298,26 +413,58 @@ def run_diffusion_cupy():
     parser.add_argument("--num_timesteps", type=int, default=300, help="Number of Timesteps to run for")
 
     args = parser.parse_args()
+    try:
+        require_cupy()
+    except (ImportError, RuntimeError) as exc:
+        parser.error(str(exc))
 
     # Pass parsed arguments to visualisation_slice
     temperature_diffusion_cupy(data=load_data(), num_timesteps=args.num_timesteps)
 
 
-def temperature_diffusion_purepython(data, num_timesteps, diffusion_coeff=0.1):
+@traced("purepython_diffusion_step")
+def diffusion_step_purepython(temperature, mask, new_temperature, diffusion_coeff):
     """
-    Simulate temperature diffusion using pure Python nested loops and lists.
-
-    This implementation is the simplest (and slowest), building Python lists
-    and manually iterating over every grid cell.
+    Apply one diffusion timestep to nested lists, writing into new_temperature.
 
     Args:
-        data (xr.Dataset): Dataset containing 'thetao'.
-        num_timesteps (int): Number of timesteps to simulate.
-        diffusion_coeff (float, optional): Diffusion coefficient. Defaults to 0.1.
+        temperature (list): Current temperatures as [depth][lat][lon] lists.
+        mask (list): Matching nested lists, True for ocean points.
+        new_temperature (list): Output lists, same shape as temperature.
+        diffusion_coeff (float): Diffusion coefficient.
+    """
+    depth, lat, lon = len(temperature), len(temperature[0]), len(temperature[0][0])
+    for d in range(1, depth-1):
+        for i in range(1, lat-1):
+            for j in range(1, lon-1):
+                if mask[d][i][j]:
+                    center = temperature[d][i][j]
+                    total = 0.0
+                    count = 0
+                    # 6 neighbors
+                    for dd, ii, jj in (
+                        (d-1,i,j), (d+1,i,j),
+                        (d,i-1,j), (d,i+1,j),
+                        (d,i,j-1), (d,i,j+1)
+                    ):
+                        if mask[dd][ii][jj]:
+                            total += temperature[dd][ii][jj]
+                            count += 1
+                    # apply diffusion
+                    if count > 0:
+                        delta = diffusion_coeff * (total - count*center) / count
+                    else:
+                        delta = 0.0
+                    new_temperature[d][i][j] = center + delta
+
+
+def prepare_purepython(data, num_timesteps):
+    """
+    Build the nested-list fields of temperature_diffusion_purepython.
 
-    Side effects:
-        - Saves the resulting field to a NetCDF file (OUTPUT_FILE_PUREPYTHON).
-        - Prints timing statistics.
+    Returns:
+        tuple: (temperature, mask, new_temperature) lists indexed
+        [t][depth][lat][lon] for diffuse_purepython.
     """
     # Pull raw array and get dims
     raw = data['thetao'].values              # shape (time, depth, lat, lon)
@@ -334,17 +481,6 @@ def temperature_diffusion_purepython(data, num_timesteps, diffusion_coeff=0.1):
                            for i in range(lat) ])
         temperature.append(plane)
 
-    # Summary stats (very slow!)
-    flat = []
-    for t in range(num_timesteps):
-        for d in range(depth):
-            for i in range(lat):
-                for j in range(lon):
-                    v = temperature[t][d][i][j]
-                    if not math.isnan(v):
-                        flat.append(v)
-    flat_sorted = sorted(flat)
-
     # Precompute mask of valid ocean points
     mask = [[[ [ not math.isnan(temperature[t][d][i][j])
                  for j in range(lon) ]
@@ -354,36 +490,62 @@ def temperature_diffusion_purepython(data, num_timesteps, diffusion_coeff=0.1):
 
     # Prepare output buffer
     new_temperature = copy.deepcopy(temperature)
-    timestep_durations = []
+    return temperature, mask, new_temperature
 
-    # Diffusion loop
+
+@traced()
+def diffuse_purepython(temperature, mask, new_temperature, num_timesteps, diffusion_coeff=0.1):
+    """
+    Compute kernel of temperature_diffusion_purepython: the timesteps only (see diffuse_numpy).
+
+    Returns:
+        list[float]: Wall time of each timestep in seconds.
+    """
+    timestep_durations = []
     for t in range(num_timesteps):
         start = time.time()
-        for d in range(1, depth-1):
-            for i in range(1, lat-1):
-                for j in range(1, lon-1):
-                    if mask[t][d][i][j]:
-                        center = temperature[t][d][i][j]
-                        total = 0.0
-                        count = 0
-                        # 6 neighbors
-                        for dd, ii, jj in (
-                            (d-1,i,j), (d+1,i,j),
-                            (d,i-1,j), (d,i+1,j),
-                            (d,i,j-1), (d,i,j+1)
-                        ):
-                            if mask[t][dd][ii][jj]:
-                                total += temperature[t][dd][ii][jj]
-                                count += 1
-                        # apply diffusion
-                        if count > 0:
-                            delta = diffusion_coeff * (total - count*center) / count
-                        else:
-                            delta = 0.0
-                        new_temperature[t][d][i][j] = center + delta
+        diffusion_step_purepython(temperature[t], mask[t], new_temperature[t], diffusion_coeff)
         timestep_durations.append(time.time() - start)
         # copy new → temperature for next step
         temperature[t] = copy.deepcopy(new_temperature[t])
+    return timestep_durations
+
+
+@traced()
+def temperature_diffusion_purepython(data, num_timesteps, diffusion_coeff=0.1):
+    """
+    Simulate temperature diffusion using pure Python nested loops and lists.
+
+    This implementation is the simplest (and slowest), building Python lists
+    and manually iterating over every grid cell. Wraps prepare_purepython
+    and the diffuse_purepython kernel with the NetCDF output and timing
+    report.
+
+    Args:
+        data (xr.Dataset): Dataset containing 'thetao'.
+        num_timesteps (int): Number of timesteps to simulate.
+        diffusion_coeff (float, optional): Diffusion coefficient. Defaults to 0.1.
+
+    Side effects:
+        - Saves the resulting field to a NetCDF file (OUTPUT_FILE_PUREPYTHON).
+        - Prints timing statistics.
+    """
+    temperature, mask, new_temperature = prepare_purepython(data, num_timesteps)
+    depth, lat, lon = len(temperature[0]), len(temperature[0][0]), len(temperature[0][0][0])
+
+    # Summary stats (very slow!)
+    flat = []
+    for t in range(num_timesteps):
+        for d in range(depth):
+            for i in range(lat):
+                for j in range(lon):
+                    v = temperature[t][d][i][j]
+                    if not math.isnan(v):
+                        flat.append(v)
+    flat_sorted = sorted(flat)
+
+    # Diffusion loop
+    timestep_durations = diffuse_purepython(temperature, mask, new_temperature, num_timesteps, diffusion_coeff)
 
     # Convert to NumPy array for saving
     final = np.array(new_temperature)
@@ -402,8 +564,53 @@ def run_diffusion_purepython():
     Entry point for running the pure Python diffusion model via command line.
 
     Parses --num_timesteps and invokes temperature_diffusion_purepython().
+    With --profile-sample HZ the run is profiled by the sampling profiler
+    (see stack_sampler.py).
     """
     parser = argparse.ArgumentParser(description="Run 3D Diffusion Model in pure Python")
     parser.add_argument("--num_timesteps", type=int, default=300, help="Number of Timesteps")
+    add_sampling_arguments(parser)
     args = parser.parse_args()
-    temperature_diffusion_purepython(data=load_data(), num_timesteps=args.num_timesteps)
+    data = load_data()
+    with sampling_from_args(args, "temperature_diffusion_purepython.folded"):
+        temperature_diffusion_purepython(data=data, num_timesteps=args.num_timesteps)
+
+
+def run_diffusion():
+    """
+    Entry point running the diffusion model on the backend chosen with --backend.
+
+    `--backend auto` (the default) runs the backend with the shortest
+    predicted time for --num_timesteps, from the curves cached for this
+    host by `backend_calibration.py --problem diffusion`; a host that has
+    not been calibrated uses NumPy.
+    """
+    try:
+        from .backend_calibration import DIFFUSION_BACKENDS, choose_backend, report_choice
+    except ImportError:  # executed from within the scripts directory
+        from backend_calibration import DIFFUSION_BACKENDS, choose_backend, report_choice
+
+    parser = argparse.ArgumentParser(description="Run 3D Diffusion Model")
+    parser.add_argument("--backend", choices=["auto", *DIFFUSION_BACKENDS], default="auto",
+                        help="Backend, or auto to choose from this host's calibration")
+    parser.add_argument("--num_timesteps", type=int, default=300, help="Number of Timesteps to run for")
+    args = parser.parse_args()
+
+    data = load_data()
+    backend = args.backend
+    if backend == "auto":
+        cells = int(np.prod(data["thetao"].shape[1:]))
+        backend, predictions = choose_backend("diffusion", cells, args.num_timesteps)
+        report_choice("[Auto]", backend, predictions)
+    elif backend == "cupy":
+        try:
+            require_cupy()
+        except (ImportError, RuntimeError) as exc:
+            parser.error(str(exc))
+
+    models = {
+        "numpy": temperature_diffusion_numpy,
+        "cupy": temperature_diffusion_cupy,
+        "purepython": temperature_diffusion_purepython,
+    }
+    models[backend](data=data, num_timesteps=args.num_timesteps)
@@ -6,26 +6,36 @@ This script benchmarks three implementations of a 3D temperature diffusion model
 - NumPy (CPU)
 - CuPy (GPU)
 
-It records timing results over multiple timesteps and repeats, saves them to CSV,
-and generates an error‐bar plot comparing performance across methods.
+It times each backend in-process (see benchmark_harness.py) over multiple
+timesteps, repeating each configuration until the 95% confidence interval
+of the median is within --ci-target of it or the --budget is spent, saves
+the results (median, IQR, minimum, throughput and the number of samples
+kept and discarded, alongside mean and standard deviation) to CSV and
+JSON, and generates an error‐bar plot comparing performance across methods.
 
 Functions:
 - get_gpu_name: Query the GPU model via nvidia‐smi.
 - get_cpu_name: Read the CPU model string from /proc/cpuinfo.
 - plot_timings: Read the CSV of results and produce an error‐bar plot.
+- main: Run the benchmarks and write the results.
 """
 
 # -------------------------------------------------------------------
 # Library imports
 # -------------------------------------------------------------------
 
+import argparse
 import subprocess
-import time
 import numpy as np
 import os
 import csv
 import matplotlib.pyplot as plt
 
+try:
+    from .benchmark_harness import run_case, sample_stats, write_json
+except ImportError:  # executed from within the scripts directory
+    from benchmark_harness import run_case, sample_stats, write_json
+
 # -------------------------------------------------------------------
 # Constants
 # -------------------------------------------------------------------
@@ -112,56 +122,90 @@ def plot_timings(csv_filename):
     plt.close()
     print(f"Plot saved to {png}")
 
-if __name__ == "__main__":
+def main():
     """
     Main execution block:
 
     1. Detect hardware (GPU, CPU).
-    2. Define which diffusion scripts to run.
-    3. Loop over methods, timesteps, and repeats:
-       - Run each script via subprocess.
-       - Measure elapsed time.
-       - Record results to CSV.
-    4. After all runs, generate an error‐bar plot.
+    2. Define which diffusion backends to run.
+    3. Loop over methods and timesteps, timing each in-process with
+       benchmark_harness (warmup runs first; data loading, the model run
+       and closing the dataset are timed separately). With --isolate each
+       configuration runs in a fresh worker process.
+    4. Record results to CSV (and every timed run to JSON), then generate an
+       error‐bar plot.
     """
+    parser = argparse.ArgumentParser(description="Benchmark the temperature diffusion backends")
+    parser.add_argument("--repeats", type=int, default=5, help="Minimum timed repetitions per configuration")
+    parser.add_argument("--ci-target", type=float, default=0.05,
+                        help="Stop once the 95%% CI of the median is this fraction of it wide (0: fixed --repeats)")
+    parser.add_argument("--budget", type=float, default=120.0, help="Time budget per configuration in seconds")
+    parser.add_argument("--max-repeats", type=int, default=100, help="Upper bound on timed repetitions")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed warmup repetitions")
+    parser.add_argument("--isolate", action="store_true", help="Fresh worker process per configuration")
+    args = parser.parse_args()
 
     gpu_name = get_gpu_name()
     cpu_name = get_cpu_name()
 
-    # map display names → console_script names
+    # map display names → benchmark_harness case names
     methods = {
-        "Pure Python": "diffusion_pure_python",
-        "NumPy (CPU)": "diffusion_numpy",
-        "CuPy (GPU)": "diffusion_cupy",
+        "Pure Python": "Diffusion Pure Python",
+        "NumPy (CPU)": "Diffusion NumPy (CPU)",
+        "CuPy (GPU)": "Diffusion CuPy (GPU)",
     }
 
     #timesteps_list = [10, 25, 50, 100]
     timesteps_list = [3]
-    repeats = 3
 
     csv_file = os.path.join(OUT_DIR, "temperature_diffusion_timings.csv")
+    all_records = []
     with open(csv_file, "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow([
             "gpu_name", "cpu_name",
             "method", "num_timesteps",
-            "mean_time_sec", "std_dev_sec"
+            "mean_time_sec", "std_dev_sec",
+            "load_time_sec", "model_time_sec", "close_time_sec",
+            "median_time_sec", "iqr_sec", "min_time_sec", "cell_updates_per_sec",
+            "n_samples", "n_discarded"
         ])
 
-        for method, script in methods.items():
+        for method, case in methods.items():
             for ts in timesteps_list:
-                times = []
-                for _ in range(repeats):
-                    start = time.time()
-                    subprocess.check_call([script, f"--num_timesteps={ts}"])
-                    times.append(time.time() - start)
+                records = run_case(case, 0, ts, repeats=args.repeats, warmup=args.warmup,
+                                   isolate=args.isolate, ci_target=args.ci_target or None,
+                                   budget_sec=args.budget, max_repeats=args.max_repeats)
+                all_records.extend(records)
+                stats = sample_stats(records)
+                kept = [r for r in records if not r["discarded"]]
+                phase = {key: np.mean([r[key] for r in kept]) / 1e9
+                         for key in ("init_ns", "step_ns", "teardown_ns")}
                 writer.writerow([
                     gpu_name, cpu_name,
                     method, ts,
-                    f"{np.mean(times):.6f}",
-                    f"{np.std(times):.6f}"
+                    f"{stats['mean']:.6f}",
+                    f"{stats['std']:.6f}",
+                    f"{phase['init_ns']:.6f}",
+                    f"{phase['step_ns']:.6f}",
+                    f"{phase['teardown_ns']:.6f}",
+                    f"{stats['median']:.6f}",
+                    f"{stats['iqr']:.6f}",
+                    f"{stats['min']:.6f}",
+                    f"{stats['cell_updates_per_sec']:.4g}",
+                    stats["n_samples"], stats["n_discarded"]
                 ])
-                print(f"{method}, ts={ts}: mean {np.mean(times):.4f}s, std {np.std(times):.4f}s")
+                print(f"{method}, ts={ts}: median {stats['median']:.4f}s, IQR {stats['iqr']:.4f}s, "
+                      f"min {stats['min']:.4f}s, {stats['cell_updates_per_sec']:.3g} cells/s "
+                      f"(load {phase['init_ns']:.4f}s, model {phase['step_ns']:.4f}s; "
+                      f"{stats['n_samples']} samples, {stats['n_discarded']} discarded)")
 
+    json_file = os.path.join(OUT_DIR, "temperature_diffusion_timings.json")
+    write_json(json_file, all_records, gpu=gpu_name, cpu=cpu_name)
     print(f"CSV timings saved to {csv_file}")
+    print(f"JSON timings saved to {json_file}")
     plot_timings(csv_file)
+
+
+if __name__ == "__main__":
+    main()